@@ -17,7 +17,10 @@ from pydantic import BaseModel, Field
 from nanobot.core.hierarchical_swarm import HierarchicalSwarm
 from nanobot.core.orchestrator import NanobotSwarm
 from nanobot.core.claude_runner import ClaudeTeamRunner
-from nanobot.core.roles import L1Role, L2Role
+from nanobot.core.agent_claude import close_anthropic_client
+from nanobot.core.agent_v3 import close_shared_vllm_clients
+from nanobot.core.roles import L1Role
+from nanobot.core.sub_swarm import PIPELINES
 from nanobot.state.swarm_state import SwarmStateManager
 from nanobot.state.task_journal import TaskJournal
 from nanobot.state.connection import close_pool
@@ -231,6 +234,10 @@ async def lifespan(app: FastAPI):
     if vector_store:
         vector_store.save()
     graph_builder.stop()
+    await hierarchical_swarm.aclose()
+    await flat_swarm.aclose()
+    await close_shared_vllm_clients()
+    await close_anthropic_client()
     await ms_graph.close()
     await close_pool()
     log.info("gateway_shutdown")
@@ -396,35 +403,9 @@ async def list_agents(_: str = Depends(verify_api_key)):
 @app.get("/swarm/topology")
 async def get_topology(_: str = Depends(verify_api_key)):
     """Return the full swarm role hierarchy."""
-    pipelines = {
-        L1Role.CODER: [
-            [L2Role.CODE_PLANNER],
-            [L2Role.CODE_WRITER],
-            [L2Role.CODE_TESTER, L2Role.CODE_REVIEWER],
-        ],
-        L1Role.RESEARCHER: [
-            [L2Role.WEB_SEARCHER],
-            [L2Role.SYNTHESIZER, L2Role.FACT_VERIFIER],
-        ],
-        L1Role.ANALYST: [
-            [L2Role.REASONER],
-            [L2Role.CRITIQUER],
-            [L2Role.SUMMARIZER],
-        ],
-        L1Role.VALIDATOR: [
-            [L2Role.CORRECTNESS, L2Role.COMPLETENESS],
-            [L2Role.SCORER],
-        ],
-        L1Role.EXECUTOR: [
-            [L2Role.ACTION_PLANNER],
-            [L2Role.ACTION_RUNNER],
-        ],
-        L1Role.ARCHITECT: [],
-    }
-
     topology = {}
     for l1 in L1Role:
-        pipeline = pipelines.get(l1, [])
+        pipeline = PIPELINES.get(l1, ())
         topology[l1.value] = {
             "stages": len(pipeline),
             "pipeline": [[r.value for r in stage] for stage in pipeline],
@@ -5,7 +5,10 @@ Exposes the knowledge vault, graph builder, background scheduler,
 and agent teams as REST endpoints under /v1/knowledge/ and /v1/scheduler/.
 """
 
+import asyncio
 import json
+import time
+import uuid
 import structlog
 from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel, Field
@@ -136,11 +139,69 @@ async def graph_builder_status(_: str = Depends(verify_openclaw_key)):
     return graph_builder.get_status()
 
 
-@router.post("/knowledge/graph-builder/rebuild")
+# Rebuild jobs run in the background; finished jobs are kept for polling
+# for REBUILD_JOB_TTL seconds, then dropped.
+REBUILD_JOB_TTL = 3600
+_rebuild_jobs: dict[str, dict] = {}
+
+
+def _on_rebuild_done(job_id: str, task: asyncio.Task) -> None:
+    job = _rebuild_jobs.get(job_id)
+    if job is not None:
+        job["finished_at"] = time.time()
+    if not task.cancelled() and task.exception() is not None:
+        log.error("graph_rebuild_failed", job_id=job_id, error=str(task.exception()))
+    else:
+        log.info("graph_rebuild_done", job_id=job_id)
+    asyncio.get_running_loop().call_later(
+        REBUILD_JOB_TTL, _rebuild_jobs.pop, job_id, None
+    )
+
+
+def _rebuild_job_status(job_id: str, job: dict) -> dict:
+    task: asyncio.Task = job["task"]
+    status = {"job_id": job_id, "started_at": job["started_at"]}
+    if not task.done():
+        status["status"] = "running"
+    elif task.cancelled():
+        status["status"] = "cancelled"
+    elif task.exception() is not None:
+        status["status"] = "failed"
+        status["error"] = str(task.exception())
+    else:
+        status["status"] = "done"
+        status["index"] = task.result()
+    if job.get("finished_at"):
+        status["finished_at"] = job["finished_at"]
+    return status
+
+
+@router.post("/knowledge/graph-builder/rebuild", status_code=202)
 async def rebuild_graph(_: str = Depends(verify_openclaw_key)):
-    """Force a full knowledge graph rebuild."""
-    index = await graph_builder.force_rebuild()
-    return {"rebuilt": True, "index": index}
+    """Start a full knowledge graph rebuild in the background.
+
+    Returns a job id to poll via GET /knowledge/graph-builder/jobs/{job_id}.
+    If a rebuild is already running, that job is returned instead.
+    """
+    for job_id, job in _rebuild_jobs.items():
+        if not job["task"].done():
+            return _rebuild_job_status(job_id, job)
+
+    job_id = uuid.uuid4().hex
+    task = asyncio.create_task(graph_builder.force_rebuild())
+    _rebuild_jobs[job_id] = {"task": task, "started_at": time.time()}
+    task.add_done_callback(lambda t: _on_rebuild_done(job_id, t))
+    log.info("graph_rebuild_started", job_id=job_id)
+    return {"job_id": job_id, "status": "pending"}
+
+
+@router.get("/knowledge/graph-builder/jobs/{job_id}")
+async def rebuild_job_status(job_id: str, _: str = Depends(verify_openclaw_key)):
+    """Get the status (and, once done, the index) of a rebuild job."""
+    job = _rebuild_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(404, f"Rebuild job not found: {job_id}")
+    return _rebuild_job_status(job_id, job)
 
 
 # ── Vector Search Endpoints ──────────────────────────────────────────────
@@ -436,7 +497,7 @@ async def msgraph_ingest_emails(count: int = 10, _: str = Depends(verify_opencla
 
     for email in emails:
         msg_id = email.get("id", "")
-        full = await ms_graph.get_email_body(msg_id)
+        full = await ms_graph.get_email_body(msg_id, max_chars=3000)
         if not full:
             continue
 
@@ -444,7 +505,7 @@ async def msgraph_ingest_emails(count: int = 10, _: str = Depends(verify_opencla
             f"Email from {email.get('from', 'unknown')} ({email.get('from_email', '')})\n"
             f"Subject: {email.get('subject', '')}\n"
             f"Date: {email.get('received', '')}\n\n"
-            f"{full.get('body', '')[:3000]}"
+            f"{full.get('body', '')}"
         )
 
         created = await graph_builder._extract_and_store(text, "email", f"msgraph:{msg_id[:20]}")
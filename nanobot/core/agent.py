@@ -5,19 +5,60 @@ reports results to orchestrator.
 """
 
 import asyncio
+import hashlib
+import json
 import os
 import uuid
 import time
 import structlog
 import httpx
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
+import openai
 from openai import AsyncOpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
 log = structlog.get_logger()
 
+# Only transport failures, throttling and server errors are worth retrying;
+# a 4xx (bad request, auth, context length) fails the same way every time.
+_RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+)
+
+# Identical near-deterministic LLM calls (temperature at or below this) that
+# are in flight at the same time share one request: key -> future of
+# (output, tokens).
+COALESCE_MAX_TEMPERATURE = 0.1
+_INFLIGHT: dict[bytes, asyncio.Future] = {}
+
+
+class _OwnerCancelled(Exception):
+    """Set on a shared LLM future when the caller making the request is cancelled."""
+
+# Ids are drawn from one urandom read per 256 ids instead of a syscall each.
+_UUID_BATCH = 256
+_UUID_POOL: deque[bytes] = deque()
+
+
+def _next_id() -> str:
+    """Return a random (v4-equivalent) id as 32 hex chars, no dashes."""
+    if not _UUID_POOL:
+        chunk = os.urandom(16 * _UUID_BATCH)
+        _UUID_POOL.extend(chunk[i:i + 16] for i in range(0, len(chunk), 16))
+    return uuid.UUID(bytes=_UUID_POOL.popleft(), version=4).hex
+
 
 class AgentRole(str, Enum):
     # L0
@@ -72,9 +113,9 @@ class AgentConfig:
     timeout_seconds: float = 300.0
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentTask:
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     content: str = ""
     context: dict[str, Any] = field(default_factory=dict)
     parent_task_id: Optional[str] = None
@@ -82,7 +123,7 @@ class AgentTask:
     created_at: float = field(default_factory=time.time)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     task_id: str
     agent_id: str
@@ -104,7 +145,7 @@ class Nanobot:
         vllm_base_url: str = "http://localhost:8000/v1",
         api_key: str = "nq-nanobot",
     ):
-        self.id = str(uuid.uuid4())
+        self.id = _next_id()
         self.config = config
         self.status = AgentStatus.IDLE
         self.conversation_history: list[dict] = []
@@ -130,6 +171,13 @@ class Nanobot:
             ),
         )
 
+        self._retrier = AsyncRetrying(
+            stop=stop_after_attempt(max(1, config.max_retries)),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+            reraise=True,
+        )
+
         log.info("nanobot_init", id=self.id, role=config.role, name=config.name)
 
     def _build_messages(self, task: AgentTask) -> list[dict]:
@@ -139,26 +187,92 @@ class Nanobot:
         messages.append({"role": "user", "content": task.content})
         return messages
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True,
-    )
+    def _inflight_key(self, messages: list[dict]) -> bytes:
+        payload = json.dumps(
+            [
+                str(self.client.base_url),
+                os.getenv("SWARM_MODEL", "nanobot-reasoner"),
+                self.config.max_tokens,
+                self.config.temperature,
+                self.config.top_p,
+                messages,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
     async def _call_llm(self, messages: list[dict]) -> tuple[str, int]:
-        """Call LLM with streaming to keep connections alive for cloud models."""
-        content_parts: list[str] = []
-        total_tokens = 0
+        """Call the LLM, coalescing identical concurrent low-temperature calls.
+
+        At the swarm's near-deterministic temperatures a fan-out of the same
+        prompt gives the same answer, so later callers await the first
+        caller's request. Their results report 0 tokens since the owner
+        already accounts for them. If the owner is cancelled, a waiter
+        re-issues the call instead of failing with it.
+        """
+        if self.config.temperature > COALESCE_MAX_TEMPERATURE:
+            return await self._call_llm_retrying(messages)
+
+        key = self._inflight_key(messages)
+        while (pending := _INFLIGHT.get(key)) is not None:
+            try:
+                output, _ = await asyncio.shield(pending)
+            except _OwnerCancelled:
+                continue
+            log.debug("nanobot_llm_coalesced", agent_id=self.id)
+            return output, 0
+
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[key] = future
+        try:
+            result = await self._call_llm_retrying(messages)
+        except asyncio.CancelledError:
+            future.set_exception(_OwnerCancelled())
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            _INFLIGHT.pop(key, None)
+
+    async def _call_llm_retrying(self, messages: list[dict]) -> tuple[str, int]:
+        """Call the LLM, retrying transient failures up to config.max_retries."""
+        # copy() shares the configured policy but gives each call its own
+        # attempt state, so concurrent executes on one agent don't interfere.
+        async for attempt in self._retrier.copy():
+            with attempt:
+                return await self._call_llm_once(messages)
+
+    async def _call_llm_once(self, messages: list[dict]) -> tuple[str, int]:
+        """Call LLM with streaming to keep connections alive for cloud models.
 
+        Set NANOBOT_STREAM=0 for backends without streaming support; the
+        same request is then made as a single non-streamed completion.
+        """
         kwargs = dict(
             model=os.getenv("SWARM_MODEL", "nanobot-reasoner"),
             messages=messages,
             max_tokens=self.config.max_tokens,
             temperature=self.config.temperature,
             top_p=self.config.top_p,
-            stream=True,
-            stream_options={"include_usage": True},
         )
 
+        if os.getenv("NANOBOT_STREAM", "1") == "0":
+            response = await self.client.chat.completions.create(**kwargs)
+            output = response.choices[0].message.content or ""
+            return output, response.usage.total_tokens if response.usage else 0
+
+        buf = bytearray()
+        total_tokens = 0
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
         try:
             stream = await self.client.chat.completions.create(**kwargs)
         except Exception:
@@ -169,10 +283,10 @@ class Nanobot:
         async for chunk in stream:
             if chunk.usage:
                 total_tokens = chunk.usage.total_tokens
-            if chunk.choices and chunk.choices[0].delta.content:
-                content_parts.append(chunk.choices[0].delta.content)
+            if chunk.choices and (delta := chunk.choices[0].delta.content):
+                buf.extend(delta.encode())
 
-        return "".join(content_parts), total_tokens
+        return buf.decode(), total_tokens
 
     async def execute(self, task: AgentTask) -> AgentResult:
         start_time = time.time()
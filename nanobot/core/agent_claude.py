@@ -9,19 +9,22 @@ Supports:
 - Swarm registry integration
 """
 
+import asyncio
+import functools
+import json
 import os
 import time
-import uuid
 import structlog
+import httpx
 from anthropic import AsyncAnthropic
 
-from nanobot.core.agent import AgentConfig, AgentTask, AgentResult, AgentStatus
+from nanobot.core.agent import AgentConfig, AgentTask, AgentResult, AgentStatus, _next_id
 from nanobot.tools.base import ToolRegistry
 from nanobot.tools.anthropic_router import AnthropicRouter
 from nanobot.core.agent_v2 import build_default_registry
 from nanobot.state.memory_store import AgentMemoryStore
 from nanobot.state.task_journal import TaskJournal
-from nanobot.state.swarm_state import SwarmStateManager
+from nanobot.state.swarm_state import SwarmStateManager, result_cache_key
 
 log = structlog.get_logger()
 
@@ -30,32 +33,64 @@ swarm_state = SwarmStateManager()
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
 
+# TTL in seconds for tool-free answers in the shared result cache (0 disables)
+RESPONSE_CACHE_TTL = int(os.getenv("CLAUDE_RESPONSE_CACHE_TTL", "300"))
 
+
+@functools.lru_cache(maxsize=1)
 def _build_anthropic_client() -> AsyncAnthropic:
-    """Build Anthropic async client with proper timeout config."""
+    """
+    Shared Anthropic async client with proper timeout config.
+
+    Cached so every agent multiplexes over one HTTP/2 connection pool
+    instead of each opening its own connections to the API.
+    """
     return AsyncAnthropic(
         api_key=ANTHROPIC_API_KEY,
         timeout=600.0,
         max_retries=0,  # We handle retries in the router
+        http_client=httpx.AsyncClient(
+            timeout=httpx.Timeout(600.0, connect=30.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            http2=True,
+        ),
     )
 
 
+async def close_anthropic_client() -> None:
+    """Close the shared Anthropic client if one was built (call once at shutdown)."""
+    if _build_anthropic_client.cache_info().currsize:
+        client = _build_anthropic_client()
+        _build_anthropic_client.cache_clear()
+        await client.close()
+        log.info("anthropic_client_closed")
+
+
 class NanobotClaude:
     """
     Claude-backed nanobot with full tool use, Redis memory, and task journaling.
     Uses AnthropicRouter for the agentic loop instead of vLLM ToolRouter.
     """
 
+    __slots__ = (
+        "id", "config", "session_id", "use_history", "status", "client",
+        "router", "memory", "journal", "log", "_bg_tasks", "_bg_tail",
+    )
+
     def __init__(
         self,
         config: AgentConfig,
         session_id: str,
         tool_registry: ToolRegistry | None = None,
         anthropic_client: AsyncAnthropic | None = None,
+        use_history: bool = True,
     ):
-        self.id = str(uuid.uuid4())
+        self.id = _next_id()
         self.config = config
         self.session_id = session_id
+        # Pooled workers that run unrelated tasks back to back set this to
+        # False so one task's turns don't leak into the next task's prompt.
+        self.use_history = use_history
         self.status = AgentStatus.IDLE
 
         self.client = anthropic_client or _build_anthropic_client()
@@ -63,6 +98,31 @@ class NanobotClaude:
         self.router = AnthropicRouter(self.client, registry)
         self.memory = AgentMemoryStore(self.id, config.role.value)
         self.journal = TaskJournal(session_id)
+        self.log = log.bind(id=self.id, role=config.role.value)
+
+        # Redis bookkeeping (status, journal, memory) runs off the critical
+        # path; writes are chained so they land in order, and shutdown()
+        # waits for them.
+        self._bg_tasks: set[asyncio.Task] = set()
+        self._bg_tail: asyncio.Task | None = None
+
+    def _in_background(self, coro) -> None:
+        prev = self._bg_tail
+
+        async def run():
+            if prev is not None:
+                await asyncio.wait([prev])
+            await coro
+
+        task = asyncio.create_task(run())
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_done)
+        self._bg_tail = task
+
+    def _on_bg_done(self, task: asyncio.Task) -> None:
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.log.warning("nanobot_claude_bookkeeping_failed", error=str(task.exception()))
 
     async def initialize(self) -> None:
         await swarm_state.register_agent(
@@ -71,103 +131,142 @@ class NanobotClaude:
             name=self.config.name,
             session_id=self.session_id,
         )
-        log.info("nanobot_claude_registered", id=self.id, role=self.config.role)
+        self.log.info("nanobot_claude_registered")
 
-    async def _build_messages(self, task: AgentTask) -> tuple[str, list[dict]]:
+    async def _build_messages(self, task: AgentTask) -> tuple[str | list[dict], list[dict]]:
         """
         Build system prompt and messages for Claude.
-        Returns (system_prompt, messages) since Anthropic takes system separately.
+        Returns (system, messages) since Anthropic takes system separately.
+
+        The system block is the static role prompt only, marked for prompt
+        caching; per-call memory goes into the task message so it doesn't
+        invalidate the cached prefix.
         """
-        memory_ctx = await self.memory.build_memory_context()
-        system_prompt = memory_ctx + self.config.system_prompt
+        memory_ctx, history = await self.memory.fetch_prompt_bundle(
+            task.content, last_n=10 if self.use_history else 0
+        )
+        system: str | list[dict] = ""
+        if self.config.system_prompt:
+            system = [{
+                "type": "text",
+                "text": self.config.system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }]
 
         messages = []
 
         # Inject conversation history
-        history = await self.memory.get_conversation_history(last_n=10)
         for h in history:
             if h.get("role") in ("user", "assistant"):
                 messages.append({"role": h["role"], "content": h["content"]})
 
-        # Inject dependency results as context
-        if task.context.get("dep_results"):
-            dep_text = "\n\n".join([
-                f"[Dependency {k}]: {v}"
-                for k, v in task.context["dep_results"].items()
-            ])
+        # Dependency results ride in the task message itself rather than as
+        # a separate user turn plus a canned assistant acknowledgement.
+        task_text = task.content
+        dep_items = task.context.get("dep_results")
+        if dep_items:
+            dep_text = "\n\n".join(f"[Dependency {k}]: {v}" for k, v in dep_items.items())
+            task_text = f"Context from completed dependencies:\n{dep_text}\n\n{task.content}"
+
+        # Main task, preceded by this agent's memory as its own block
+        if memory_ctx:
             messages.append({
                 "role": "user",
-                "content": f"Context from completed dependencies:\n{dep_text}",
+                "content": [
+                    {"type": "text", "text": memory_ctx},
+                    {"type": "text", "text": task_text},
+                ],
             })
-            messages.append({
-                "role": "assistant",
-                "content": "Understood. I'll use this context in my response.",
-            })
-
-        # Main task
-        messages.append({"role": "user", "content": task.content})
-
-        return system_prompt, messages
+        else:
+            messages.append({"role": "user", "content": task_text})
+
+        return system, messages
+
+    def _response_cache_key(self, task: AgentTask, system, messages: list[dict]) -> str | None:
+        """Shared result-cache key for this exact prompt; None if the task is time-sensitive."""
+        return result_cache_key(
+            self.config.role.value,
+            task.content,
+            ANTHROPIC_MODEL,
+            json.dumps(
+                [
+                    self.config.max_tokens,
+                    self.config.temperature,
+                    [t.name for t in self.router.registry.all_tools()],
+                    system,
+                    messages,
+                ],
+                sort_keys=True,
+                default=str,
+            ),
+        )
 
     async def execute(self, task: AgentTask) -> AgentResult:
         start = time.time()
         self.status = AgentStatus.THINKING
-        await swarm_state.update_agent_status(self.id, "thinking")
-
-        await self.journal.record_task_start(
+        # The previous turn's history write must land before history is read
+        prior_writes = self._bg_tail if self.use_history else None
+        self._in_background(swarm_state.update_agent_status(self.id, "thinking"))
+        self._in_background(self.journal.record_task_start(
             task_id=task.id,
             agent_id=self.id,
             agent_role=self.config.role.value,
             content=task.content,
             parent_task_id=task.parent_task_id,
-        )
+        ))
 
         try:
-            system_prompt, messages = await self._build_messages(task)
+            if prior_writes is not None:
+                await asyncio.wait([prior_writes])
+            system, messages = await self._build_messages(task)
             self.status = AgentStatus.EXECUTING
-            await swarm_state.update_agent_status(self.id, "executing")
-
-            final_text, updated_messages, total_tokens = await self.router.run_with_tools(
-                messages=messages,
-                model=ANTHROPIC_MODEL,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                system=system_prompt,
-            )
+            self._in_background(swarm_state.update_agent_status(self.id, "executing"))
+
+            # Identical prompt answered recently: reuse it. Only tool-free
+            # answers are cached, so a hit never skips a side effect.
+            cache_key = self._response_cache_key(task, system, messages) if RESPONSE_CACHE_TTL else None
+            cached = await swarm_state.get_cached_result(cache_key) if cache_key else None
+            if cached is not None:
+                final_text, total_tokens, tool_calls_made = cached["output"], 0, []
+                self.log.info("nanobot_claude_cache_hit")
+            else:
+                final_text, _, total_tokens, tool_calls_made = await self.router.run_with_tools(
+                    messages=messages,
+                    model=ANTHROPIC_MODEL,
+                    max_tokens=self.config.max_tokens,
+                    temperature=self.config.temperature,
+                    system=system,
+                )
+                if cache_key and not tool_calls_made and final_text:
+                    self._in_background(swarm_state.put_cached_result(
+                        cache_key, {"output": final_text}, ttl=RESPONSE_CACHE_TTL,
+                    ))
 
             duration = time.time() - start
 
-            await self.memory.push_conversation_turn("user", task.content)
-            await self.memory.push_conversation_turn("assistant", final_text)
-
-            # Count tool calls from the conversation
-            tool_calls_made = []
-            for m in updated_messages:
-                if m.get("role") == "user" and isinstance(m.get("content"), list):
-                    for block in m["content"]:
-                        if isinstance(block, dict) and block.get("type") == "tool_result":
-                            tool_calls_made.append(block.get("tool_use_id", ""))
-
-            await self.journal.record_task_complete(
+            self._in_background(self.memory.push_conversation_turns([
+                ("user", task.content),
+                ("assistant", final_text),
+            ]))
+            self._in_background(self.journal.record_task_complete(
                 task_id=task.id,
                 output=final_text,
                 success=True,
                 tokens_used=total_tokens,
                 duration_seconds=duration,
                 tool_calls=tool_calls_made,
-            )
-
-            await swarm_state.update_agent_status(
+            ))
+            self._in_background(swarm_state.update_agent_status(
                 self.id, "idle", tokens_delta=total_tokens
-            )
+            ))
 
             self.status = AgentStatus.DONE
-            log.info(
+            self.log.info(
                 "nanobot_claude_done",
-                id=self.id,
-                duration=f"{duration:.2f}s",
+                duration=duration,
                 tokens=total_tokens,
                 model=ANTHROPIC_MODEL,
+                memory_pack=self.memory.last_pack_version,
             )
 
             return AgentResult(
@@ -183,14 +282,14 @@ class NanobotClaude:
         except Exception as e:
             duration = time.time() - start
             self.status = AgentStatus.FAILED
-            await swarm_state.update_agent_status(self.id, "failed")
-            await self.journal.record_task_complete(
+            self._in_background(swarm_state.update_agent_status(self.id, "failed"))
+            self._in_background(self.journal.record_task_complete(
                 task_id=task.id,
                 output="",
                 success=False,
                 duration_seconds=duration,
-            )
-            log.error("nanobot_claude_failed", id=self.id, error=str(e))
+            ))
+            self.log.error("nanobot_claude_failed", error=str(e))
             return AgentResult(
                 task_id=task.id,
                 agent_id=self.id,
@@ -204,7 +303,13 @@ class NanobotClaude:
     async def store_long_term_fact(self, key: str, value: str) -> None:
         await self.memory.store_fact(key, value)
 
+    async def flush(self) -> None:
+        """Wait for pending background bookkeeping writes."""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+
     async def shutdown(self) -> None:
+        await self.flush()
         await swarm_state.deregister_agent(self.id)
         self.status = AgentStatus.IDLE
 
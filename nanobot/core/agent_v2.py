@@ -3,12 +3,12 @@ Nanobot v2 — tool-use enabled agent.
 Drop-in replacement for agent.py with full agentic loop support.
 """
 
+import functools
 import time
-import uuid
 import structlog
 from openai import AsyncOpenAI
 
-from nanobot.core.agent import AgentConfig, AgentTask, AgentResult, AgentStatus, AgentRole
+from nanobot.core.agent import AgentConfig, AgentTask, AgentResult, AgentStatus, AgentRole, _next_id
 from nanobot.tools.base import ToolRegistry
 from nanobot.tools.router import ToolRouter
 from nanobot.tools.web_search import WebSearchTool
@@ -21,7 +21,8 @@ from nanobot.tools.msgraph_tools import register_msgraph_tools
 log = structlog.get_logger()
 
 
-def build_default_registry() -> ToolRegistry:
+@functools.lru_cache(maxsize=1)
+def _default_tools() -> ToolRegistry:
     registry = ToolRegistry()
     registry.register(WebSearchTool())
     registry.register(CodeRunnerTool())
@@ -32,9 +33,22 @@ def build_default_registry() -> ToolRegistry:
     return registry
 
 
+def build_default_registry() -> ToolRegistry:
+    """
+    Registry with the default tool set.
+
+    Tools are stateless, so they are constructed once per process; each
+    caller gets its own registry over them, so registering extra tools
+    (as the gateway does for the Claude runner) doesn't leak elsewhere.
+    """
+    return _default_tools().copy()
+
+
 class NanobotV2:
     """Tool-use enabled nanobot with full agentic loop."""
 
+    __slots__ = ("id", "config", "status", "conversation_history", "client", "router")
+
     def __init__(
         self,
         config: AgentConfig,
@@ -42,7 +56,7 @@ class NanobotV2:
         api_key: str = "nq-nanobot",
         tool_registry: ToolRegistry | None = None,
     ):
-        self.id = str(uuid.uuid4())
+        self.id = _next_id()
         self.config = config
         self.status = AgentStatus.IDLE
         self.conversation_history: list[dict] = []
@@ -80,7 +94,7 @@ class NanobotV2:
             messages = self._build_messages(task)
             self.status = AgentStatus.EXECUTING
 
-            final_text, updated_messages, total_tokens = await self.router.run_with_tools(
+            final_text, updated_messages, total_tokens, _ = await self.router.run_with_tools(
                 messages=messages,
                 max_tokens=self.config.max_tokens,
                 temperature=self.config.temperature,
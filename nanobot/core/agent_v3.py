@@ -4,12 +4,11 @@ Tool use (v2) + persistent memory + task journaling + swarm registry.
 """
 
 import time
-import uuid
 import structlog
 import httpx
 from openai import AsyncOpenAI
 
-from nanobot.core.agent import AgentConfig, AgentTask, AgentResult, AgentStatus
+from nanobot.core.agent import AgentConfig, AgentTask, AgentResult, AgentStatus, _next_id
 from nanobot.tools.base import ToolRegistry
 from nanobot.tools.router import ToolRouter
 from nanobot.core.agent_v2 import build_default_registry
@@ -22,6 +21,61 @@ log = structlog.get_logger()
 swarm_state = SwarmStateManager()
 
 
+def _build_vllm_client(
+    base_url: str,
+    api_key: str,
+    read_timeout: float = 600.0,
+    max_connections: int = 100,
+    max_keepalive_connections: int = 50,
+    keepalive_expiry: float = 60.0,
+) -> AsyncOpenAI:
+    timeout = httpx.Timeout(connect=30.0, read=read_timeout, write=60.0, pool=60.0)
+    return AsyncOpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        timeout=timeout,
+        http_client=httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                # Sub-agent calls are spaced by whole generations; the 5s
+                # default would drop the idle connection between stages.
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=True,
+        ),
+    )
+
+
+# (base_url, api_key, read_timeout) -> client shared by agents built without one
+_shared_clients: dict[tuple[str, str, float], AsyncOpenAI] = {}
+
+
+def _shared_vllm_client(base_url: str, api_key: str, read_timeout: float) -> AsyncOpenAI:
+    """
+    One AsyncOpenAI client (and HTTP/2 connection pool) per backend.
+
+    Agents are created and discarded per task; sharing the client lets
+    them reuse warm connections instead of each opening a new pool.
+    """
+    key = (base_url, api_key, read_timeout)
+    client = _shared_clients.get(key)
+    if client is None:
+        client = _shared_clients[key] = _build_vllm_client(base_url, api_key, read_timeout)
+    return client
+
+
+async def close_shared_vllm_clients() -> None:
+    """Close the shared per-backend clients (call once at shutdown)."""
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    for client in clients:
+        await client.close()
+    if clients:
+        log.info("vllm_shared_clients_closed", count=len(clients))
+
+
 class NanobotV3:
     """
     Full-capability nanobot:
@@ -31,6 +85,11 @@ class NanobotV3:
     - Swarm registry integration
     """
 
+    __slots__ = (
+        "id", "config", "session_id", "status", "client", "router",
+        "memory", "journal", "log",
+    )
+
     def __init__(
         self,
         config: AgentConfig,
@@ -38,36 +97,22 @@ class NanobotV3:
         vllm_base_url: str = "http://localhost:8000/v1",
         api_key: str = "nq-nanobot",
         tool_registry: ToolRegistry | None = None,
+        client: AsyncOpenAI | None = None,
     ):
-        self.id = str(uuid.uuid4())
+        self.id = _next_id()
         self.config = config
         self.session_id = session_id
         self.status = AgentStatus.IDLE
 
-        self.client = AsyncOpenAI(
-            base_url=vllm_base_url,
-            api_key=api_key,
-            timeout=httpx.Timeout(
-                connect=30.0,
-                read=max(config.timeout_seconds, 600.0),
-                write=60.0,
-                pool=60.0,
-            ),
-            http_client=httpx.AsyncClient(
-                timeout=httpx.Timeout(
-                    connect=30.0,
-                    read=max(config.timeout_seconds, 600.0),
-                    write=60.0,
-                    pool=60.0,
-                ),
-                http2=True,
-            ),
+        self.client = client or _shared_vllm_client(
+            vllm_base_url, api_key, max(config.timeout_seconds, 600.0)
         )
 
         registry = tool_registry or build_default_registry()
         self.router = ToolRouter(self.client, registry)
         self.memory = AgentMemoryStore(self.id, config.role.value)
         self.journal = TaskJournal(session_id)
+        self.log = log.bind(id=self.id, role=config.role.value)
 
     async def initialize(self) -> None:
         await swarm_state.register_agent(
@@ -76,32 +121,24 @@ class NanobotV3:
             name=self.config.name,
             session_id=self.session_id,
         )
-        log.info("nanobot_v3_registered", id=self.id, role=self.config.role)
+        self.log.info("nanobot_v3_registered")
 
     async def _build_messages(self, task: AgentTask) -> list[dict]:
-        memory_ctx = await self.memory.build_memory_context()
-        system_content = memory_ctx + self.config.system_prompt
-
-        messages = [{"role": "system", "content": system_content}]
-
-        history = await self.memory.get_conversation_history(last_n=10)
+        # Keep the system message static per role so backend prefix caching
+        # can reuse it; per-call memory is prepended to the task instead.
+        memory_ctx, history = await self.memory.fetch_prompt_bundle(task.content, last_n=10)
+        messages = [{"role": "system", "content": self.config.system_prompt}]
         messages.extend(history)
 
-        if task.context.get("dep_results"):
-            dep_text = "\n\n".join([
-                f"[Dependency {k}]: {v}"
-                for k, v in task.context["dep_results"].items()
-            ])
-            messages.append({
-                "role": "user",
-                "content": f"Context from completed dependencies:\n{dep_text}",
-            })
-            messages.append({
-                "role": "assistant",
-                "content": "Understood. I'll use this context in my response.",
-            })
-
-        messages.append({"role": "user", "content": task.content})
+        # Dependency results ride in the task message itself rather than as
+        # a separate user turn plus a canned assistant acknowledgement.
+        task_text = task.content
+        dep_items = task.context.get("dep_results")
+        if dep_items:
+            dep_text = "\n\n".join(f"[Dependency {k}]: {v}" for k, v in dep_items.items())
+            task_text = f"Context from completed dependencies:\n{dep_text}\n\n{task.content}"
+
+        messages.append({"role": "user", "content": memory_ctx + task_text})
         return messages
 
     async def execute(self, task: AgentTask) -> AgentResult:
@@ -122,7 +159,7 @@ class NanobotV3:
             self.status = AgentStatus.EXECUTING
             await swarm_state.update_agent_status(self.id, "executing")
 
-            final_text, updated_messages, total_tokens = await self.router.run_with_tools(
+            final_text, _, total_tokens, tool_calls_made = await self.router.run_with_tools(
                 messages=messages,
                 max_tokens=self.config.max_tokens,
                 temperature=self.config.temperature,
@@ -134,12 +171,6 @@ class NanobotV3:
             await self.memory.push_conversation_turn("user", task.content)
             await self.memory.push_conversation_turn("assistant", final_text)
 
-            tool_calls_made = [
-                m.get("name", "")
-                for m in updated_messages
-                if m.get("role") == "tool"
-            ]
-
             await self.journal.record_task_complete(
                 task_id=task.id,
                 output=final_text,
@@ -154,10 +185,9 @@ class NanobotV3:
             )
 
             self.status = AgentStatus.DONE
-            log.info(
+            self.log.info(
                 "nanobot_v3_done",
-                id=self.id,
-                duration=f"{duration:.2f}s",
+                duration=duration,
                 tokens=total_tokens,
                 tools_used=tool_calls_made,
             )
@@ -182,7 +212,7 @@ class NanobotV3:
                 success=False,
                 duration_seconds=duration,
             )
-            log.error("nanobot_v3_failed", id=self.id, error=str(e))
+            self.log.error("nanobot_v3_failed", error=str(e))
             return AgentResult(
                 task_id=task.id,
                 agent_id=self.id,
@@ -196,6 +226,14 @@ class NanobotV3:
     async def store_long_term_fact(self, key: str, value: str) -> None:
         await self.memory.store_fact(key, value)
 
+    async def recycle(self, session_id: str) -> None:
+        """Rebind a pooled agent to a new task: fresh conversation, same client."""
+        await self.memory.clear_conversation()
+        self.session_id = session_id
+        self.journal = TaskJournal(session_id)
+        self.status = AgentStatus.IDLE
+        await self.initialize()
+
     async def shutdown(self) -> None:
         await swarm_state.deregister_agent(self.id)
         self.status = AgentStatus.IDLE
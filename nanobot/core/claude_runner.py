@@ -6,17 +6,20 @@ Supports both "flat" (single Claude agent with tools) and simple
 multi-step execution for agent teams.
 """
 
+import asyncio
+import json
 import os
-import uuid
+import time
 import structlog
+from collections import deque
 from typing import Any
 
 from anthropic import AsyncAnthropic
 
 from nanobot.knowledge.artifact_writer import process_agent_output
 
-from nanobot.core.agent import AgentConfig, AgentRole, AgentTask
-from nanobot.core.agent_claude import NanobotClaude
+from nanobot.core.agent import AgentConfig, AgentRole, AgentTask, _next_id
+from nanobot.core.agent_claude import NanobotClaude, _build_anthropic_client
 from nanobot.tools.base import ToolRegistry
 from nanobot.core.agent_v2 import build_default_registry
 from nanobot.state.swarm_state import SwarmStateManager
@@ -29,6 +32,96 @@ ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
 
 swarm_state = SwarmStateManager()
 
+# Dependency outputs (500 chars each) passed into a step's prompt
+STEP_CONTEXT_WINDOW = 4
+
+# Seconds between status polls of a submitted message batch
+BATCH_POLL_SECONDS = 10.0
+
+# Longest a batch may stay unfinished before it is cancelled and its goals fail
+BATCH_MAX_WAIT_SECONDS = float(os.getenv("CLAUDE_BATCH_MAX_WAIT", "3600"))
+
+# Max plan steps running against the Claude API at once
+MAX_CONCURRENT_STEPS = int(os.getenv("CLAUDE_MAX_CONCURRENT_STEPS", "5"))
+
+
+def _parse_plan_steps(output: str):
+    """
+    Parse the planner's JSON output: a step array or a skip_plan object.
+
+    Tries the whole output first, then the outermost "[...]" or "{...}"
+    span (plans are often wrapped in prose or code fences). A "[...]" span
+    only counts when it opens before any "{" and holds step objects with
+    an instruction, so brackets inside a truncated skip_plan answer (say
+    "[1]") never pass for a plan. Returns None when nothing parses.
+    """
+    try:
+        return json.loads(output)
+    except json.JSONDecodeError:
+        pass
+    list_start, obj_start = output.find("["), output.find("{")
+    if list_start != -1 and (obj_start == -1 or list_start < obj_start):
+        end = output.rfind("]")
+        if end > list_start:
+            try:
+                steps = json.loads(output[list_start:end + 1])
+            except json.JSONDecodeError:
+                steps = None
+            if isinstance(steps, list) and steps and all(
+                isinstance(step, dict) and step.get("instruction") for step in steps
+            ):
+                return steps
+    if obj_start != -1:
+        end = output.rfind("}")
+        if end > obj_start:
+            try:
+                return json.loads(output[obj_start:end + 1])
+            except json.JSONDecodeError:
+                pass
+    return None
+
+
+def _normalize_steps(steps: list) -> list[dict]:
+    """
+    Give every plan step a unique string id and an explicit "deps" list.
+
+    A step without a "deps" key (or with a non-list value) has no
+    dependencies; unknown or self references are dropped.
+    """
+    normalized: list[dict] = []
+    seen: set[str] = set()
+    for i, raw in enumerate(steps):
+        step = dict(raw) if isinstance(raw, dict) else {"instruction": str(raw)}
+        step_id = str(step.get("id") or f"s{i + 1}")
+        while step_id in seen:
+            step_id = f"{step_id}_{i + 1}"
+        seen.add(step_id)
+        step["id"] = step_id
+        normalized.append(step)
+
+    for step in normalized:
+        wanted = step.get("deps")
+        if not isinstance(wanted, list):
+            wanted = []
+        step["deps"] = [str(d) for d in wanted if str(d) in seen and str(d) != step["id"]]
+    return normalized
+
+
+def _plan_levels(steps: list[dict]) -> list[list[dict]]:
+    """Group normalized steps into dependency levels; steps in a cycle run last."""
+    levels: list[list[dict]] = []
+    done: set[str] = set()
+    remaining = list(steps)
+    while remaining:
+        ready = [s for s in remaining if done.issuperset(s["deps"])]
+        if not ready:
+            ready = remaining
+            log.warning("claude_plan_cycle", steps=[s["id"] for s in ready])
+        levels.append(ready)
+        done.update(s["id"] for s in ready)
+        remaining = [s for s in remaining if s["id"] not in done]
+    return levels
+
 
 class ClaudeTeamRunner:
     """
@@ -45,11 +138,7 @@ class ClaudeTeamRunner:
         anthropic_client: AsyncAnthropic | None = None,
     ):
         self.registry = tool_registry or build_default_registry()
-        self.client = anthropic_client or AsyncAnthropic(
-            api_key=ANTHROPIC_API_KEY,
-            timeout=600.0,
-            max_retries=0,
-        )
+        self.client = anthropic_client or _build_anthropic_client()
 
     async def run(self, goal: str, mode: str = "flat", context: dict | None = None) -> dict[str, Any]:
         """
@@ -95,6 +184,135 @@ class ClaudeTeamRunner:
                 "subtask_results": [],
             }
 
+    async def run_batch(self, goals: list[str], context: dict | None = None) -> list[dict[str, Any]]:
+        """
+        Run many independent flat goals through the Message Batches API.
+
+        Batched requests are billed at roughly half the real-time rate but
+        may take minutes to complete. Results are returned in the order of
+        ``goals`` in run()'s shape (journal records, session_summary and
+        artifacts included), with two differences:
+
+        - The batch can't run the tool loop, so each goal gets a single
+          tool-free answer and its result has ``ran_without_tools: True``.
+        - ``context`` is only stored as session metadata; it isn't given
+          to the model.
+
+        Pass context={"latency_sensitive": True} to run the goals
+        concurrently through run() instead, with tools. A batch unfinished
+        after BATCH_MAX_WAIT_SECONDS, or whose caller is cancelled, is
+        cancelled on the API side.
+        """
+        context = context or {}
+        if context.get("latency_sensitive") or len(goals) <= 1:
+            return list(await asyncio.gather(*(self.run(g, "flat", context) for g in goals)))
+
+        start = time.time()
+        session_ids = await asyncio.gather(
+            *(swarm_state.create_session(g, context) for g in goals)
+        )
+        journals = [TaskJournal(sid) for sid in session_ids]
+        task_ids = [_next_id() for _ in goals]
+        await asyncio.gather(*(
+            journal.record_task_start(
+                task_id=task_id,
+                agent_id="claude-batch",
+                agent_role=AgentRole.EXECUTOR.value,
+                content=goal,
+            )
+            for journal, task_id, goal in zip(journals, task_ids, goals)
+        ))
+        requests = [
+            {
+                "custom_id": f"goal-{i}",
+                "params": {
+                    "model": ANTHROPIC_MODEL,
+                    "max_tokens": 4096,
+                    "temperature": 0.1,
+                    "messages": [{"role": "user", "content": goal}],
+                },
+            }
+            for i, goal in enumerate(goals)
+        ]
+
+        outputs: dict[str, tuple[bool, str, int]] = {}
+        try:
+            batch = await self.client.messages.batches.create(requests=requests)
+            log.info("claude_batch_submitted", batch_id=batch.id, goals=len(goals))
+            deadline = time.monotonic() + BATCH_MAX_WAIT_SECONDS
+            try:
+                while batch.processing_status != "ended":
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(
+                            f"Batch still {batch.processing_status} after {BATCH_MAX_WAIT_SECONDS:.0f}s"
+                        )
+                    await asyncio.sleep(BATCH_POLL_SECONDS)
+                    batch = await self.client.messages.batches.retrieve(batch.id)
+            except BaseException:
+                # Don't leave an abandoned batch running (and billed)
+                await asyncio.shield(self._cancel_batch(batch.id))
+                raise
+
+            async for entry in await self.client.messages.batches.results(batch.id):
+                if entry.result.type == "succeeded":
+                    message = entry.result.message
+                    text = "\n".join(b.text for b in message.content if b.type == "text")
+                    tokens = message.usage.input_tokens + message.usage.output_tokens
+                    outputs[entry.custom_id] = (True, text, tokens)
+                else:
+                    outputs[entry.custom_id] = (False, f"Batch request {entry.result.type}", 0)
+        except Exception as e:
+            log.error("claude_batch_failed", error=str(e))
+            outputs = {r["custom_id"]: (False, str(e), 0) for r in requests}
+
+        duration = time.time() - start
+        results = []
+        for i, (goal, session_id, journal, task_id) in enumerate(
+            zip(goals, session_ids, journals, task_ids)
+        ):
+            success, text, tokens = outputs.get(f"goal-{i}", (False, "Missing batch result", 0))
+            await journal.record_task_complete(
+                task_id=task_id,
+                output=text if success else "",
+                success=success,
+                tokens_used=tokens,
+                duration_seconds=duration,
+            )
+            await swarm_state.complete_session(session_id, text, success)
+            extraction = process_agent_output(
+                text,
+                agent_id="claude-batch",
+                duration_ms=int(duration * 1000),
+                tokens_used=tokens,
+            ) if success else None
+            results.append({
+                "success": success,
+                "session_id": session_id,
+                "goal": goal,
+                "final_answer": text if success else "",
+                "error": None if success else text,
+                "subtask_results": [{
+                    "task_id": task_id,
+                    "role": "executor",
+                    "output": text if success else "",
+                    "success": success,
+                    "tokens": tokens,
+                    "duration": duration,
+                }],
+                "artifacts_written": extraction.artifacts_written if extraction else 0,
+                "graph_updates_applied": extraction.graph_updates_applied if extraction else 0,
+                "ran_without_tools": True,
+                "session_summary": await journal.get_session_summary(),
+            })
+        return results
+
+    async def _cancel_batch(self, batch_id: str) -> None:
+        try:
+            await self.client.messages.batches.cancel(batch_id)
+            log.warning("claude_batch_cancelled", batch_id=batch_id)
+        except Exception as e:
+            log.error("claude_batch_cancel_failed", batch_id=batch_id, error=str(e))
+
     async def _run_flat(self, goal: str, session_id: str, context: dict) -> dict:
         """Single Claude agent with full tool access."""
         agent = NanobotClaude(
@@ -111,11 +329,7 @@ class ClaudeTeamRunner:
         )
         await agent.initialize()
 
-        task = AgentTask(
-            id=str(uuid.uuid4()),
-            content=goal,
-            context=context,
-        )
+        task = AgentTask(content=goal, context=context)
 
         result = await agent.execute(task)
         await agent.shutdown()
@@ -159,8 +373,13 @@ class ClaudeTeamRunner:
                 system_prompt=(
                     "You are a task planner. Break the given goal into 2-5 concrete steps. "
                     "Each step should be a clear, actionable instruction. "
+                    "List in \"deps\" the ids of earlier steps whose results a step needs; "
+                    "use [] for steps that can run independently. "
                     "Respond with a JSON array of steps:\n"
-                    '[{"id": "s1", "instruction": "..."}, ...]'
+                    '[{"id": "s1", "instruction": "...", "deps": []}, ...]\n'
+                    "If the goal is simple enough to answer fully in one step, skip "
+                    "planning and respond instead with:\n"
+                    '{"skip_plan": true, "answer": "<complete final answer>"}'
                 ),
                 max_tokens=2048,
                 temperature=0.0,
@@ -185,31 +404,52 @@ class ClaudeTeamRunner:
                 "subtask_results": [],
             }
 
-        # Parse plan
-        import json
-        import re
-        try:
-            steps = json.loads(plan_result.output)
-        except json.JSONDecodeError:
-            m = re.search(r"\[[\s\S]+\]", plan_result.output)
-            if m:
-                steps = json.loads(m.group(0))
-            else:
-                # Fallback: treat entire goal as single step
-                steps = [{"id": "s1", "instruction": goal}]
-
-        # Phase 2: Execute each step
-        subtask_results = []
-        accumulated_context = ""
-
-        for step in steps:
-            instruction = step.get("instruction", str(step))
-            step_id = step.get("id", f"s{len(subtask_results)+1}")
+        steps = _parse_plan_steps(plan_result.output)
+
+        # Simple goal answered by the planner itself: no executors, no synthesis
+        if isinstance(steps, dict) and steps.get("skip_plan") and steps.get("answer"):
+            answer = str(steps["answer"])
+            log.info("claude_plan_skipped", session_id=session_id)
+            extraction = process_agent_output(
+                answer,
+                agent_id="claude-hierarchical",
+                duration_ms=int(plan_result.duration_seconds * 1000),
+                tokens_used=plan_result.tokens_used,
+            )
+            return {
+                "success": True,
+                "session_id": session_id,
+                "goal": goal,
+                "plan_summary": "skip_plan",
+                "final_answer": answer,
+                "subtask_results": [{
+                    "task_id": plan_result.task_id,
+                    "instruction": goal,
+                    "output": answer,
+                    "success": True,
+                    "tokens": plan_result.tokens_used,
+                    "duration": plan_result.duration_seconds,
+                }],
+                "artifacts_written": extraction.artifacts_written,
+                "graph_updates_applied": extraction.graph_updates_applied,
+            }
 
-            executor = NanobotClaude(
+        if not isinstance(steps, list) or not steps:
+            # Fallback: treat entire goal as single step
+            steps = [{"id": "s1", "instruction": goal}]
+        steps = _normalize_steps(steps)
+
+        # Phase 2: Execute steps level by level; steps within a level run
+        # concurrently on a small pool of executors that is registered once
+        # and shut down once, instead of one agent per step.
+        levels = _plan_levels(steps)
+        outputs: dict[str, str] = {}
+        results_by_id: dict[str, dict] = {}
+        executors = [
+            NanobotClaude(
                 config=AgentConfig(
                     role=AgentRole.EXECUTOR,
-                    name=f"claude-executor-{step_id}",
+                    name=f"claude-executor-{i + 1}",
                     system_prompt="",
                     max_tokens=4096,
                     temperature=0.1,
@@ -217,64 +457,123 @@ class ClaudeTeamRunner:
                 session_id=session_id,
                 tool_registry=self.registry,
                 anthropic_client=self.client,
+                use_history=False,
+            )
+            for i in range(min(MAX_CONCURRENT_STEPS, max(len(level) for level in levels)))
+        ]
+        await asyncio.gather(*(e.initialize() for e in executors))
+        idle: asyncio.Queue[NanobotClaude] = asyncio.Queue()
+        for e in executors:
+            idle.put_nowait(e)
+
+        failed: set[str] = set()
+
+        async def run_step(step: dict) -> dict:
+            step_id = step["id"]
+            instruction = step.get("instruction", str(step))
+
+            # Don't spend a Claude call on a step whose input never arrived
+            failed_deps = [d for d in step["deps"] if d in failed]
+            if failed_deps:
+                failed.add(step_id)
+                log.info("claude_step_skipped", step=step_id, failed_deps=failed_deps)
+                return {
+                    "task_id": step_id,
+                    "instruction": instruction,
+                    "output": "",
+                    "success": False,
+                    "error": f"Skipped: dependency failed ({', '.join(failed_deps)})",
+                    "tokens": 0,
+                    "duration": 0.0,
+                }
+
+            # Each step only sees the outputs of the steps it depends on;
+            # with many deps, keep the most recent ones rather than a
+            # prefix cut that would drop the latest results.
+            recent = deque(
+                ((d, outputs[d][:500]) for d in step["deps"] if d in outputs),
+                maxlen=STEP_CONTEXT_WINDOW,
             )
-            await executor.initialize()
 
             step_content = instruction
-            if accumulated_context:
-                step_content = f"Previous context:\n{accumulated_context[:2000]}\n\nCurrent step:\n{instruction}"
+            if recent:
+                dep_context = "\n".join(f"[{d}]: {snippet}" for d, snippet in recent)
+                step_content = f"Previous context:\n{dep_context}\n\nCurrent step:\n{instruction}"
 
-            step_task = AgentTask(id=step_id, content=step_content, context=context)
-            step_result = await executor.execute(step_task)
-            await executor.shutdown()
+            executor = await idle.get()
+            try:
+                step_task = AgentTask(id=step_id, content=step_content, context=context)
+                step_result = await executor.execute(step_task)
+            finally:
+                idle.put_nowait(executor)
 
-            subtask_results.append({
+            if step_result.success:
+                outputs[step_id] = step_result.output
+            else:
+                failed.add(step_id)
+
+            return {
                 "task_id": step_id,
                 "instruction": instruction,
                 "output": step_result.output,
                 "success": step_result.success,
                 "tokens": step_result.tokens_used,
                 "duration": step_result.duration_seconds,
-            })
+            }
 
-            if step_result.success:
-                accumulated_context += f"\n[{step_id}]: {step_result.output[:500]}"
+        try:
+            for level in levels:
+                level_results = await asyncio.gather(*[run_step(step) for step in level])
+                for r in level_results:
+                    results_by_id[r["task_id"]] = r
+        finally:
+            await asyncio.gather(*(e.shutdown() for e in executors), return_exceptions=True)
+
+        subtask_results = [results_by_id[step["id"]] for step in steps]
 
         # Synthesize
         all_success = all(r["success"] for r in subtask_results)
+        succeeded = [r for r in subtask_results if r["success"]]
         results_text = "\n\n".join(
             f"### Step {r['task_id']}:\n{r['output'][:1000]}"
-            for r in subtask_results
-            if r["success"]
+            for r in succeeded
         )
 
-        synthesizer = NanobotClaude(
-            config=AgentConfig(
-                role=AgentRole.ORCHESTRATOR,
-                name="claude-synthesizer",
-                system_prompt=(
-                    "Combine the step results into a single comprehensive answer. "
-                    "Write clear text, not JSON. Be concise but thorough."
+        if len(succeeded) <= 1:
+            # Nothing to combine: skip the synthesizer round-trip
+            synth_success = True
+            final_answer = succeeded[0]["output"] if succeeded else ""
+            all_outputs = [r["output"] for r in subtask_results]
+        else:
+            synthesizer = NanobotClaude(
+                config=AgentConfig(
+                    role=AgentRole.ORCHESTRATOR,
+                    name="claude-synthesizer",
+                    system_prompt=(
+                        "Combine the step results into a single comprehensive answer. "
+                        "Write clear text, not JSON. Be concise but thorough."
+                    ),
+                    max_tokens=4096,
+                    temperature=0.1,
                 ),
-                max_tokens=4096,
-                temperature=0.1,
-            ),
-            session_id=session_id,
-            tool_registry=self.registry,
-            anthropic_client=self.client,
-        )
-        await synthesizer.initialize()
+                session_id=session_id,
+                tool_registry=self.registry,
+                anthropic_client=self.client,
+            )
+            await synthesizer.initialize()
 
-        synth_task = AgentTask(
-            content=f"Original goal: {goal}\n\nStep results:\n{results_text}\n\nSynthesize a final answer:",
-        )
-        synth_result = await synthesizer.execute(synth_task)
-        await synthesizer.shutdown()
+            synth_task = AgentTask(
+                content=f"Original goal: {goal}\n\nStep results:\n{results_text}\n\nSynthesize a final answer:",
+            )
+            synth_result = await synthesizer.execute(synth_task)
+            await synthesizer.shutdown()
 
-        final_answer = synth_result.output if synth_result.success else results_text
+            synth_success = synth_result.success
+            final_answer = synth_result.output if synth_result.success else results_text
+            all_outputs = [r["output"] for r in subtask_results] + [final_answer]
 
         # Process artifacts and graph updates from all outputs
-        all_text = "\n\n".join([r["output"] for r in subtask_results] + [final_answer])
+        all_text = "\n\n".join(all_outputs)
         total_tokens = sum(r.get("tokens", 0) or 0 for r in subtask_results)
         total_duration = sum(r.get("duration", 0) or 0 for r in subtask_results)
         extraction = process_agent_output(
@@ -285,7 +584,7 @@ class ClaudeTeamRunner:
         )
 
         return {
-            "success": synth_result.success and all_success,
+            "success": synth_success and all_success,
             "session_id": session_id,
             "goal": goal,
             "plan_summary": plan_result.output[:200],
@@ -5,16 +5,23 @@ Main entry point for the entire nanobot system.
 """
 
 import asyncio
-import json
 import re
 import uuid
 import structlog
+from itertools import islice
 from typing import Any
 
 from nanobot.core.roles import L1Role
 from nanobot.core.l1_agent import L1Agent
 from nanobot.core.agent import AgentConfig, AgentRole, AgentTask, AgentResult
-from nanobot.core.agent_v3 import NanobotV3, swarm_state
+from nanobot.core.agent_v3 import NanobotV3, _build_vllm_client, swarm_state
+from nanobot.core.orchestrator import (
+    Plan,
+    PlanTask,
+    _coalesce_duplicates,
+    _compute_levels,
+    _parse_plan_text,
+)
 from nanobot.state.task_journal import TaskJournal
 from nanobot.tools.base import ToolRegistry
 from nanobot.core.agent_v2 import build_default_registry
@@ -23,6 +30,22 @@ log = structlog.get_logger()
 
 VALID_L1_ROLES = {r.value for r in L1Role}
 
+DEP_CONTEXT_TOKENS = 200  # per-dependency excerpt handed to downstream leads
+SYNTH_RESULT_TOKENS = 400  # per-lead excerpt fed to the synthesizer
+
+# Rough BPE stand-in: word runs split every 4 chars, each symbol on its own.
+# Dense code and JSON count as more tokens per character than prose, as they do
+# for the served models.
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text after roughly max_tokens model tokens, on a token boundary."""
+    if len(text) <= max_tokens:
+        return text
+    cut = next(islice(_TOKEN_RE.finditer(text), max_tokens, None), None)
+    return text if cut is None else text[:cut.start()].rstrip()
+
 # Mapping of common LLM hallucinated roles to valid L1 roles
 L1_ROLE_ALIASES: dict[str, str] = {
     "tester": "validator",
@@ -61,6 +84,8 @@ Do NOT invent new role names. For testing tasks, use "validator". For design tas
 
 Decompose the goal into L1-level tasks. Each task will be fully handled by the L1 agent's sub-swarm.
 Design tasks at L1 granularity — do NOT try to specify L2 details.
+For each task, write a short brief the lead hands straight to its sub-swarm: scope clarifications,
+constraints to emphasize, and the quality criteria for its output.
 
 Respond with JSON:
 {
@@ -70,6 +95,7 @@ Respond with JSON:
       "id": "t1",
       "l1_role": "coder|researcher|analyst|validator|executor|architect",
       "instruction": "What the L1 lead should accomplish (1-2 sentences)",
+      "brief": "Scope, key constraints and quality criteria (2-4 short lines)",
       "depends_on": [],
       "priority": 1
     }
@@ -77,6 +103,13 @@ Respond with JSON:
   "synthesis_instruction": "How to combine L1 outputs into final answer"
 }"""
 
+SYNTHESIZER_PROMPT = (
+    "You are the Queen Synthesizer of the NeuralQuantum Nanobot Swarm. "
+    "Your job is to combine results from multiple domain lead agents into "
+    "a single comprehensive answer. Do NOT output JSON. Write a clear, "
+    "well-structured text response that directly answers the original goal."
+)
+
 
 class HierarchicalSwarm:
     """3-tier swarm: Queen -> L1 Leads -> L2 Sub-agents."""
@@ -92,10 +125,17 @@ class HierarchicalSwarm:
         self.vllm_url = vllm_url
         self.api_key = api_key
         self.registry = tool_registry or build_default_registry()
-        self.l1_semaphore = asyncio.Semaphore(max_concurrent_l1)
         self.global_semaphore = asyncio.Semaphore(max_concurrent_global)
         self.max_concurrent_l1 = max_concurrent_l1
         self.max_concurrent_global = max_concurrent_global
+        # One HTTP/2 pool for the queen, every L1 lead and all their L2 sub-agents
+        self.client = _build_vllm_client(
+            vllm_url, api_key, max_connections=64, max_keepalive_connections=32
+        )
+        # Idle L1 leads kept per role so later tasks reuse them across runs
+        self._l1_pool: dict[L1Role, asyncio.Queue[L1Agent]] = {
+            role: asyncio.Queue(maxsize=max_concurrent_l1) for role in L1Role
+        }
 
     def _make_queen(self, session_id: str) -> NanobotV3:
         return NanobotV3(
@@ -110,7 +150,27 @@ class HierarchicalSwarm:
             vllm_base_url=self.vllm_url,
             api_key=self.api_key,
             tool_registry=self.registry,
+            client=self.client,
+        )
+
+    async def _ready_synthesizer(self, session_id: str) -> NanobotV3:
+        # Dedicated synthesizer prompt (not the planner prompt)
+        agent = NanobotV3(
+            config=AgentConfig(
+                role=AgentRole.ORCHESTRATOR,
+                name="queen-synthesizer",
+                system_prompt=SYNTHESIZER_PROMPT,
+                max_tokens=4096,
+                temperature=0.1,
+            ),
+            session_id=session_id,
+            vllm_base_url=self.vllm_url,
+            api_key=self.api_key,
+            tool_registry=self.registry,
+            client=self.client,
         )
+        await agent.initialize()
+        return agent
 
     def _make_l1(self, role: L1Role, session_id: str) -> L1Agent:
         return L1Agent(
@@ -120,51 +180,74 @@ class HierarchicalSwarm:
             api_key=self.api_key,
             tool_registry=self.registry,
             global_semaphore=self.global_semaphore,
+            client=self.client,
         )
 
-    def _parse_plan(self, text: str) -> dict:
+    async def _acquire_l1(self, role: L1Role, session_id: str) -> L1Agent:
+        try:
+            agent = self._l1_pool[role].get_nowait()
+        except asyncio.QueueEmpty:
+            agent = self._make_l1(role, session_id)
+            await agent.initialize()
+        else:
+            await agent.recycle(session_id)
+        return agent
+
+    async def _release_l1(self, role: L1Role, agent: L1Agent) -> None:
+        # Leave the registry while idle; recycle() re-registers on reuse
+        await swarm_state.deregister_agent(agent.self_agent.id)
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            m = re.search(r"```(?:json)?\s*([\s\S]+?)```", text)
-            if m:
-                return json.loads(m.group(1))
-            raise ValueError(f"Could not parse plan: {text[:200]}")
-
-    def _dep_level(self, task_id: str, tasks: list[dict]) -> int:
-        task = next((t for t in tasks if t["id"] == task_id), None)
-        if not task or not task.get("depends_on"):
-            return 0
-        return max(self._dep_level(d, tasks) for d in task["depends_on"]) + 1
+            self._l1_pool[role].put_nowait(agent)
+        except asyncio.QueueFull:
+            await agent.shutdown()
+
+    async def aclose(self) -> None:
+        """Shut down pooled leads and close the shared vLLM connection pool."""
+        for pool in self._l1_pool.values():
+            while not pool.empty():
+                await pool.get_nowait().shutdown()
+        await self.client.close()
+
+    def _parse_plan(self, text: str) -> Plan:
+        return _parse_plan_text(text, tasks_key="l1_tasks", role_key="l1_role")
 
     async def _run_l1_task(
         self,
-        task_def: dict,
+        task_def: PlanTask,
         session_id: str,
         dep_outputs: dict[str, str],
     ) -> tuple[str, AgentResult]:
-        async with self.l1_semaphore:
-            role = L1Role(task_def["l1_role"])
-            agent = self._make_l1(role, session_id)
-            await agent.initialize()
-
-            instruction = task_def["instruction"]
-            if dep_outputs:
-                dep_text = "\n\n".join([
-                    f"[{tid}]: {output[:800]}"
-                    for tid, output in dep_outputs.items()
-                ])
-                instruction = f"{instruction}\n\n## Context from prior tasks:\n{dep_text}"
-
-            task = AgentTask(
-                id=task_def["id"],
-                content=instruction,
-                priority=task_def.get("priority", 5),
-            )
+        """Run one L1 task; dep_outputs are already trimmed to DEP_CONTEXT_TOKENS."""
+        role = L1Role(task_def.role)
+        agent = await self._acquire_l1(role, session_id)
+
+        instruction = task_def.instruction
+        if dep_outputs:
+            dep_text = "\n\n".join([
+                f"[{tid}]: {output}"
+                for tid, output in dep_outputs.items()
+            ])
+            instruction = f"{instruction}\n\n## Context from prior tasks:\n{dep_text}"
+
+        # The queen writes each lead's brief in its plan, which stands in for
+        # the lead's own contextualization call.
+        context: dict[str, Any] = {}
+        if task_def.brief:
+            context["l1_brief"] = task_def.brief
+        if dep_outputs:
+            context["dep_task_ids"] = list(dep_outputs)
+        task = AgentTask(
+            id=task_def.id,
+            content=instruction,
+            context=context,
+            priority=task_def.priority,
+        )
 
+        try:
             result = await agent.execute(task)
-            await agent.shutdown()
-            return task_def["id"], result
+        finally:
+            await self._release_l1(role, agent)
+        return task_def.id, result
 
     async def run(self, goal: str, metadata: dict | None = None) -> dict[str, Any]:
         """Execute the full 3-tier hierarchical swarm on a goal."""
@@ -193,115 +276,138 @@ class HierarchicalSwarm:
             await swarm_state.complete_session(session_id, str(e), False)
             return {"success": False, "session_id": session_id, "error": str(e)}
 
-        l1_tasks = plan.get("l1_tasks", [])
-
         # Validate and remap L1 roles
         valid_tasks = []
-        for t in l1_tasks:
-            role = t.get("l1_role", "").lower().strip()
+        for t in plan.tasks:
+            role = t.role.lower().strip()
             if role in VALID_L1_ROLES:
-                t["l1_role"] = role
+                t.role = role
                 valid_tasks.append(t)
             elif role in L1_ROLE_ALIASES:
                 remapped = L1_ROLE_ALIASES[role]
-                log.warning("l1_role_remapped", original=role, remapped=remapped, task_id=t.get("id"))
-                t["l1_role"] = remapped
+                log.warning("l1_role_remapped", original=role, remapped=remapped, task_id=t.id)
+                t.role = remapped
                 valid_tasks.append(t)
             else:
-                log.warning("l1_role_invalid_dropped", role=role, task_id=t.get("id"))
+                log.warning("l1_role_invalid_dropped", role=role, task_id=t.id)
 
-        l1_tasks = valid_tasks
+        l1_tasks = _coalesce_duplicates(valid_tasks)
+        try:
+            levels = _compute_levels(l1_tasks)
+        except ValueError as e:
+            await swarm_state.complete_session(session_id, str(e), False)
+            return {"success": False, "session_id": session_id, "error": str(e)}
         log.info("queen_plan_ready", l1_task_count=len(l1_tasks))
-        await swarm_state.update_session(session_id, {"task_count": len(l1_tasks)})
-
-        # Execute L1 tasks in dependency order
-        completed_outputs: dict[str, str] = {}
-        all_l1_results: list[dict] = []
-
-        max_level = max(
-            (self._dep_level(t["id"], l1_tasks) for t in l1_tasks), default=0
+        swarm_state.queue_session_update(session_id, {"task_count": len(l1_tasks)})
+
+        # Execute L1 tasks with a fixed pool of workers. A task is queued the
+        # moment its own dependencies finish, so there is no per-level barrier;
+        # the worker count is the L1 concurrency cap. Outputs are trimmed once,
+        # as each task finishes, for both downstream leads and the synthesizer.
+        dep_excerpts: dict[str, str] = {}
+        synth_sections: dict[str, str] = {}
+        results_by_id: dict[str, dict] = {}
+        by_id = {t.id: t for level_tasks in levels for t in level_tasks}
+        rank = {tid: i for i, tid in enumerate(by_id)}
+        waiting_on = {
+            t.id: {d for d in t.depends_on if d in rank} for t in by_id.values()
+        }
+        dependents: dict[str, list[PlanTask]] = {tid: [] for tid in by_id}
+        for t in by_id.values():
+            for d in waiting_on[t.id]:
+                dependents[d].append(t)
+        log.info(
+            "l1_levels_planned",
+            levels=[[t.id for t in level_tasks] for level_tasks in levels],
         )
 
-        for level in range(max_level + 1):
-            level_tasks = [
-                t
-                for t in l1_tasks
-                if self._dep_level(t["id"], l1_tasks) == level
-            ]
-
-            log.info(
-                "l1_level_executing",
-                level=level,
-                roles=[t["l1_role"] for t in level_tasks],
-            )
-
-            coros = [
-                self._run_l1_task(
-                    t,
-                    session_id,
-                    {
-                        d: completed_outputs[d]
-                        for d in t.get("depends_on", [])
-                        if d in completed_outputs
-                    },
-                )
-                for t in level_tasks
-            ]
-            level_results = await asyncio.gather(*coros, return_exceptions=True)
-
-            for task_def, res in zip(level_tasks, level_results):
-                if isinstance(res, Exception):
-                    tid = task_def["id"]
-                    output = f"FAILED: {res}"
-                    success = False
-                else:
-                    tid, agent_result = res
+        # Ready tasks are served in level/fan-out order from _compute_levels
+        ready: asyncio.PriorityQueue[tuple[int, str]] = asyncio.PriorityQueue()
+        for tid, pending in waiting_on.items():
+            if not pending:
+                ready.put_nowait((rank[tid], tid))
+
+        async def worker() -> None:
+            while True:
+                _, task_id = await ready.get()
+                task_def = by_id[task_id]
+                log.info("l1_task_dispatched", task_id=task_id, role=task_def.role)
+                try:
+                    tid, agent_result = await self._run_l1_task(
+                        task_def,
+                        session_id,
+                        {
+                            d: dep_excerpts[d]
+                            for d in task_def.depends_on
+                            if d in dep_excerpts
+                        },
+                    )
                     output = agent_result.output
                     success = agent_result.success
+                except Exception as e:
+                    tid = task_id
+                    output = f"FAILED: {e}"
+                    success = False
 
-                completed_outputs[tid] = output
-                all_l1_results.append({
-                    "task_id": tid,
-                    "l1_role": task_def["l1_role"],
-                    "instruction": task_def["instruction"],
-                    "output": output,
-                    "success": success,
-                })
-
-            await swarm_state.update_session(
-                session_id, {"completed_tasks": len(completed_outputs)}
-            )
-
-        # Queen synthesis — use a dedicated synthesizer prompt (not the planner prompt)
-        synth_agent = NanobotV3(
-            config=AgentConfig(
-                role=AgentRole.ORCHESTRATOR,
-                name="queen-synthesizer",
-                system_prompt=(
-                    "You are the Queen Synthesizer of the NeuralQuantum Nanobot Swarm. "
-                    "Your job is to combine results from multiple domain lead agents into "
-                    "a single comprehensive answer. Do NOT output JSON. Write a clear, "
-                    "well-structured text response that directly answers the original goal."
-                ),
-                max_tokens=4096,
-                temperature=0.1,
-            ),
-            session_id=session_id,
-            vllm_base_url=self.vllm_url,
-            api_key=self.api_key,
-            tool_registry=self.registry,
-        )
-        await synth_agent.initialize()
+                # Always mark the task done, or ready.join() waits forever
+                try:
+                    dep_excerpts[tid] = _truncate_tokens(output, DEP_CONTEXT_TOKENS)
+                    if success:
+                        synth_sections[tid] = (
+                            f"### {task_def.role.upper()} ({tid}):\n"
+                            f"{_truncate_tokens(output, SYNTH_RESULT_TOKENS)}"
+                        )
+                    results_by_id[tid] = {
+                        "task_id": tid,
+                        "l1_role": task_def.role,
+                        "instruction": task_def.instruction,
+                        "output": output,
+                        "success": success,
+                    }
+                    for child in dependents[task_id]:
+                        pending = waiting_on[child.id]
+                        pending.discard(task_id)
+                        if not pending:
+                            ready.put_nowait((rank[child.id], child.id))
+                    swarm_state.queue_session_update(
+                        session_id, {"completed_tasks": len(results_by_id)}
+                    )
+                except Exception as e:
+                    log.error("l1_task_bookkeeping_failed", task_id=task_id, error=str(e))
+                finally:
+                    ready.task_done()
+
+        synth_ready: asyncio.Task | None = None
+        workers: list[asyncio.Task] = []
+        try:
+            # The synthesizer doesn't depend on any L1 output, so get it
+            # constructed and registered off the critical path.
+            synth_ready = asyncio.create_task(self._ready_synthesizer(session_id))
+            workers = [
+                asyncio.create_task(worker())
+                for _ in range(min(self.max_concurrent_l1, len(by_id)))
+            ]
+            await ready.join()
+            # Queen synthesis — registered while the leads were still running
+            synth_agent = await synth_ready
+        finally:
+            for w in workers:
+                w.cancel()
+            if synth_ready is not None and not synth_ready.done():
+                synth_ready.cancel()
+                workers.append(synth_ready)
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        # Report in plan order regardless of completion order
+        all_l1_results = [results_by_id[tid] for tid in by_id if tid in results_by_id]
 
         # Truncate individual results to avoid context overflow
-        results_text = "\n\n".join([
-            f"### {r['l1_role'].upper()} ({r['task_id']}):\n{r['output'][:1500]}"
-            for r in all_l1_results
-            if r["success"]
-        ])
-
-        synth_instruction = plan.get(
-            "synthesis_instruction", "Combine all results into a comprehensive answer."
+        results_text = "\n\n".join(
+            synth_sections[tid] for tid in by_id if tid in synth_sections
+        )
+
+        synth_instruction = (
+            plan.synthesis_instruction or "Combine all results into a comprehensive answer."
         )
 
         synth_task = AgentTask(
@@ -331,7 +437,7 @@ class HierarchicalSwarm:
             "success": True,
             "session_id": session_id,
             "goal": goal,
-            "plan_summary": plan.get("plan_summary"),
+            "plan_summary": plan.plan_summary,
             "l1_results": all_l1_results,
             "final_answer": final_answer,
             "session_summary": summary,
@@ -2,21 +2,40 @@
 L1 Agent — primary domain specialist that commands its own sub-swarm.
 """
 
+import hashlib
 import time
 import uuid
+from secrets import token_hex
 import asyncio
 import structlog
+from types import MappingProxyType
+from typing import Mapping
+
+from openai import AsyncOpenAI
 
 from nanobot.core.roles import L1Role
-from nanobot.core.sub_swarm import SubSwarm
+from nanobot.core.sub_swarm import PIPELINES, SubSwarm
+from nanobot.core.sub_prompts import SUB_AGENT_PROMPTS
 from nanobot.core.agent import AgentTask, AgentResult, AgentStatus, AgentConfig, AgentRole
 from nanobot.core.agent_v3 import NanobotV3, swarm_state
+from nanobot.state.swarm_state import result_cache_key
 from nanobot.tools.base import ToolRegistry
+from nanobot.tools.router import SWARM_MODEL
 from nanobot.core.agent_v2 import build_default_registry
 
 log = structlog.get_logger()
 
-L1_SYSTEM_PROMPTS: dict[L1Role, str] = {
+# Tasks shorter than this with no upstream context skip the Phase-1 scoping call
+CONTEXT_PHASE_MIN_CHARS = 240
+
+# L1 roles mirror AgentRole values; convert once instead of per result
+_L1_TO_AGENT_ROLE: Mapping[L1Role, AgentRole] = MappingProxyType(
+    {r: AgentRole(r.value) for r in L1Role}
+)
+
+# Frozen and byte-identical per role: the system prompt is the shared prefix
+# vLLM's prefix cache reuses, so nothing per-agent may be formatted into it.
+L1_SYSTEM_PROMPTS: Mapping[L1Role, str] = MappingProxyType({
     L1Role.CODER: """You are the Lead Coder in the NeuralQuantum Nanobot Swarm.
 You coordinate a sub-swarm of: Code Planner, Code Writer, Code Tester, and Code Reviewer.
 Your sub-swarm handles full implementation pipelines automatically.
@@ -47,7 +66,23 @@ Your role: define success criteria, monitor execution, handle blockers.""",
 You operate solo — no sub-swarm.
 Your specialty: system design, architecture decisions, technology selection, integration patterns.
 Output: architecture diagrams (text), decision rationale, tradeoff analysis, implementation roadmap.""",
-}
+})
+
+
+
+def _pipeline_version(role: L1Role) -> str:
+    """Digest of the lead prompt and L2 pipeline behind a role's answers."""
+    parts = [L1_SYSTEM_PROMPTS[role]]
+    for stage in PIPELINES.get(role, ()):
+        parts.append(",".join(r.value for r in stage))
+        parts.extend(SUB_AGENT_PROMPTS[r] for r in stage)
+    return hashlib.blake2b("\x00".join(parts).encode(), digest_size=8).hexdigest()
+
+
+# Part of every result-cache key, so editing a prompt or pipeline retires old answers
+_PIPELINE_VERSIONS: Mapping[L1Role, str] = MappingProxyType(
+    {r: _pipeline_version(r) for r in L1Role}
+)
 
 
 class L1Agent:
@@ -61,9 +96,12 @@ class L1Agent:
         api_key: str = "nq-nanobot",
         tool_registry: ToolRegistry | None = None,
         global_semaphore: asyncio.Semaphore | None = None,
+        client: AsyncOpenAI | None = None,
     ):
         self.role = role
+        self.agent_role = _L1_TO_AGENT_ROLE[role]
         self.session_id = session_id
+        self.vllm_url = vllm_url
         self.id = str(uuid.uuid4())
         self.status = AgentStatus.IDLE
         self.registry = tool_registry or build_default_registry()
@@ -71,8 +109,8 @@ class L1Agent:
 
         self.self_agent = NanobotV3(
             config=AgentConfig(
-                role=AgentRole(role.value),
-                name=f"{role.value}-lead-{uuid.uuid4().hex[:6]}",
+                role=self.agent_role,
+                name=f"{role.value}-lead-{token_hex(3)}",
                 system_prompt=L1_SYSTEM_PROMPTS[role],
                 max_tokens=3072,
                 temperature=0.05,
@@ -81,6 +119,7 @@ class L1Agent:
             vllm_base_url=vllm_url,
             api_key=api_key,
             tool_registry=self.registry,
+            client=client,
         )
 
         self.sub_swarm = SubSwarm(
@@ -90,6 +129,7 @@ class L1Agent:
             api_key=api_key,
             tool_registry=self.registry,
             semaphore=self.global_semaphore,
+            client=client,
         )
 
         log.info("l1_agent_init", id=self.id, role=role.value)
@@ -101,6 +141,31 @@ class L1Agent:
         start = time.time()
         self.status = AgentStatus.EXECUTING
 
+        # Same role, instruction, brief and dependency context as a recent run:
+        # reuse its output. Executors are never cached — their sub-swarm acts.
+        cache_key = None
+        if self.role != L1Role.EXECUTOR:
+            cache_key = result_cache_key(
+                self.role.value,
+                task.content,
+                task.context.get("l1_brief") or "",
+                SWARM_MODEL,
+                self.vllm_url,
+                _PIPELINE_VERSIONS[self.role],
+            )
+        cached = await swarm_state.get_cached_result(cache_key) if cache_key else None
+        if cached and cached.get("output"):
+            self.status = AgentStatus.DONE
+            log.info("l1_cache_hit", id=self.id, role=self.role.value)
+            return AgentResult(
+                task_id=task.id,
+                agent_id=self.id,
+                agent_role=self.agent_role,
+                output=cached["output"],
+                success=True,
+                duration_seconds=time.time() - start,
+            )
+
         log.info(
             "l1_execute_start",
             id=self.id,
@@ -108,20 +173,37 @@ class L1Agent:
             task_preview=task.content[:100],
         )
 
+        sub_ready: asyncio.Task | None = None
         try:
-            # Phase 1: L1 contextualizes the task
-            context_task = AgentTask(
-                content=(
-                    f"Before delegating to your sub-swarm, analyze this task and provide:\n"
-                    f"1. Key clarifications or scope definitions\n"
-                    f"2. Specific constraints or requirements to emphasize\n"
-                    f"3. Quality criteria for the final output\n\n"
-                    f"TASK:\n{task.content}"
-                ),
-                context=task.context,
-            )
-            context_result = await self.self_agent.execute(context_task)
-            context_enrichment = context_result.output if context_result.success else ""
+            brief = task.context.get("l1_brief")
+            if self.role == L1Role.ARCHITECT:
+                return await self._execute_solo(task, brief, cache_key, start)
+
+            # Register the sub-swarm's L2 agents while Phase 1 (when it runs)
+            # and the prompt assembly below proceed
+            sub_ready = asyncio.create_task(self.sub_swarm.initialize())
+
+            # Phase 1: L1 contextualizes the task, unless the queen's plan
+            # already carried a brief for it or the task is short and self-contained
+            context_tokens = 0
+            if brief:
+                context_enrichment = brief
+            elif not self._needs_context_phase(task):
+                context_enrichment = ""
+            else:
+                context_task = AgentTask(
+                    content=(
+                        f"Before delegating to your sub-swarm, analyze this task and provide:\n"
+                        f"1. Key clarifications or scope definitions\n"
+                        f"2. Specific constraints or requirements to emphasize\n"
+                        f"3. Quality criteria for the final output\n\n"
+                        f"TASK:\n{task.content}"
+                    ),
+                    context=task.context,
+                )
+                context_result = await self.self_agent.execute(context_task)
+                context_enrichment = context_result.output if context_result.success else ""
+                context_tokens = context_result.tokens_used
 
             # Phase 2: Sub-swarm executes pipeline
             enriched_task = (
@@ -129,6 +211,7 @@ class L1Agent:
                 if context_enrichment
                 else task.content
             )
+            await sub_ready
             sub_result = await self.sub_swarm.execute(enriched_task)
 
             # Phase 3: L1 reviews sub-swarm output
@@ -164,7 +247,7 @@ class L1Agent:
 
             duration = time.time() - start
             total_tokens = (
-                context_result.tokens_used
+                context_tokens
                 + sub_result.get("total_tokens", 0)
                 + final_result.tokens_used
             )
@@ -183,11 +266,13 @@ class L1Agent:
             if not final_output:
                 log.warning("l1_review_empty_fallback", id=self.id, role=self.role.value)
                 final_output = raw_sub_output
+            if cache_key and final_output:
+                await swarm_state.put_cached_result(cache_key, {"output": final_output})
 
             return AgentResult(
                 task_id=task.id,
                 agent_id=self.id,
-                agent_role=AgentRole(self.role.value),
+                agent_role=self.agent_role,
                 output=final_output,
                 success=True,
                 duration_seconds=duration,
@@ -200,12 +285,63 @@ class L1Agent:
             return AgentResult(
                 task_id=task.id,
                 agent_id=self.id,
-                agent_role=AgentRole(self.role.value),
+                agent_role=self.agent_role,
                 output="",
                 success=False,
                 error=str(e),
                 duration_seconds=time.time() - start,
             )
+        finally:
+            if sub_ready is not None and not sub_ready.done():
+                sub_ready.cancel()
+
+    @staticmethod
+    def _needs_context_phase(task: AgentTask) -> bool:
+        if task.context.get("dep_task_ids") or task.context.get("dep_results"):
+            return True
+        return len(task.content) >= CONTEXT_PHASE_MIN_CHARS
+
+    async def _execute_solo(
+        self,
+        task: AgentTask,
+        brief: str | None,
+        cache_key: str | None,
+        start: float,
+    ) -> AgentResult:
+        """Solo specialists have no sub-swarm to brief or review: one call."""
+        content = f"{task.content}\n\n## BRIEF:\n{brief}" if brief else task.content
+        result = await self.self_agent.execute(
+            AgentTask(id=task.id, content=content, context=task.context)
+        )
+        output = result.output.strip() if result.success else ""
+        self.status = AgentStatus.DONE if output else AgentStatus.FAILED
+        log.info(
+            "l1_execute_done",
+            id=self.id,
+            role=self.role.value,
+            duration=f"{time.time() - start:.2f}s",
+            total_tokens=result.tokens_used,
+            solo=True,
+        )
+        if cache_key and output:
+            await swarm_state.put_cached_result(cache_key, {"output": output})
+        return AgentResult(
+            task_id=task.id,
+            agent_id=self.id,
+            agent_role=self.agent_role,
+            output=output,
+            success=bool(output),
+            error=result.error or (None if output else "Empty response"),
+            duration_seconds=time.time() - start,
+            tokens_used=result.tokens_used,
+        )
+
+    async def recycle(self, session_id: str) -> None:
+        """Rebind a pooled L1 agent (and its sub-swarm) to a new session."""
+        self.session_id = session_id
+        self.sub_swarm.session_id = session_id
+        self.status = AgentStatus.IDLE
+        await self.self_agent.recycle(session_id)
 
     async def shutdown(self) -> None:
         await self.self_agent.shutdown()
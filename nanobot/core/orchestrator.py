@@ -7,17 +7,29 @@ import asyncio
 import json
 import re
 import uuid
+from secrets import token_hex
 import structlog
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
 
 from nanobot.core.agent import AgentConfig, AgentRole, AgentTask
-from nanobot.core.agent_v3 import NanobotV3, swarm_state
+from nanobot.core.agent_v3 import NanobotV3, _build_vllm_client, swarm_state
+from nanobot.state.swarm_state import result_cache_key
 from nanobot.state.task_journal import TaskJournal
 from nanobot.tools.base import ToolRegistry
+from nanobot.tools.router import SWARM_MODEL
 from nanobot.core.agent_v2 import build_default_registry
 
 log = structlog.get_logger()
 
-SYSTEM_PROMPTS = {
+SYNTH_RESULT_CHARS = 1500  # per-subtask excerpt fed to the synthesizer
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]+?)```")
+
+# Frozen and byte-identical per role so vLLM's prefix cache hits on every call;
+# agent names stay Python-side and never reach the prompt.
+SYSTEM_PROMPTS: Mapping[AgentRole, str] = MappingProxyType({
     AgentRole.ORCHESTRATOR: """You are the Queen Orchestrator of a NeuralQuantum Nanobot Swarm.
 Decompose complex goals into subtasks for specialized nanobots.
 
@@ -52,7 +64,165 @@ Score quality 1-10. Use run_python to verify code claims. Be specific about issu
 
     AgentRole.EXECUTOR: """You are an Executor Nanobot. Translate plans into concrete action steps.
 Be sequential and specific. Use file_io to save outputs for persistence.""",
-}
+})
+
+
+@dataclass(slots=True)
+class PlanTask:
+    """One planned task, normalized from the planner's JSON."""
+
+    id: str
+    role: str
+    instruction: str
+    depends_on: list[str] = field(default_factory=list)
+    priority: int = 5
+    brief: str = ""
+
+    @classmethod
+    def from_dict(cls, raw: dict, position: int, role_key: str = "role") -> "PlanTask":
+        deps = raw.get("depends_on")
+        priority = raw.get("priority")
+        brief = raw.get("brief")
+        return cls(
+            id=str(raw.get("id") or f"t{position + 1}"),
+            role=str(raw.get(role_key) or ""),
+            instruction=str(raw.get("instruction") or ""),
+            depends_on=[str(d) for d in deps] if isinstance(deps, list) else [],
+            priority=priority if type(priority) is int else 5,
+            brief=brief.strip() if isinstance(brief, str) else "",
+        )
+
+
+@dataclass(slots=True)
+class Plan:
+    tasks: list[PlanTask]
+    plan_summary: str | None = None
+    synthesis_instruction: str = ""
+
+
+def _parse_plan_text(text: str, tasks_key: str = "subtasks", role_key: str = "role") -> Plan:
+    """Parse a planner reply: bare JSON, or JSON inside a markdown code fence."""
+    raw = None
+    if not text.lstrip().startswith("```"):
+        try:
+            raw = json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    if raw is None:
+        m = _FENCE_RE.search(text)
+        if not m:
+            raise ValueError(f"Could not parse plan: {text[:200]}")
+        raw = json.loads(m.group(1))
+    if not isinstance(raw, dict):
+        raise ValueError(f"Plan is not a JSON object: {text[:200]}")
+
+    tasks = raw.get(tasks_key)
+    return Plan(
+        tasks=[
+            PlanTask.from_dict(t, i, role_key)
+            for i, t in enumerate(tasks if isinstance(tasks, list) else [])
+            if isinstance(t, dict)
+        ],
+        plan_summary=raw.get("plan_summary"),
+        synthesis_instruction=str(raw.get("synthesis_instruction") or ""),
+    )
+
+
+def _coalesce_duplicates(tasks: list[PlanTask]) -> list[PlanTask]:
+    """
+    Drop sibling tasks that repeat an earlier one and point their dependents
+    at the task that was kept.
+
+    Siblings share a role and the same dependencies (so they land in the same
+    level with the same inputs); they are duplicates only when their
+    instructions are identical ignoring case and whitespace. Near matches such
+    as "analyze well 3" / "analyze well 4" are distinct work and are kept.
+    """
+    canonical: dict[str, str] = {}
+    seen: dict[tuple[str, frozenset[str], str], PlanTask] = {}
+    kept: list[PlanTask] = []
+    for t in tasks:
+        key = (
+            t.role,
+            frozenset(canonical.get(d, d) for d in t.depends_on),
+            " ".join(t.instruction.lower().split()),
+        )
+        match = seen.get(key)
+        if match is None:
+            seen[key] = t
+            kept.append(t)
+        else:
+            canonical[t.id] = match.id
+            log.info("plan_duplicate_task_coalesced", task_id=t.id, kept=match.id, role=t.role)
+
+    if canonical:
+        for t in kept:
+            t.depends_on = list(dict.fromkeys(canonical.get(d, d) for d in t.depends_on))
+    return kept
+
+
+def _compute_levels(tasks: list[PlanTask]) -> list[list[PlanTask]]:
+    """
+    Group plan tasks into dependency levels with a single Kahn pass.
+    Dependencies on unknown task ids are ignored; a cycle raises ValueError.
+
+    Within a level, tasks with the most transitive dependents come first (then
+    lowest priority number), so the semaphore admits critical-path work first.
+    """
+    index = {t.id: i for i, t in enumerate(tasks)}
+    in_degree = [0] * len(tasks)
+    dependents: list[list[int]] = [[] for _ in tasks]
+    for i, t in enumerate(tasks):
+        for d in set(t.depends_on):
+            j = index.get(d)
+            if j is not None:
+                in_degree[i] += 1
+                dependents[j].append(i)
+
+    layers: list[list[int]] = []
+    layer = [i for i, n in enumerate(in_degree) if n == 0]
+    placed = 0
+    while layer:
+        layers.append(layer)
+        placed += len(layer)
+        next_layer = []
+        for i in layer:
+            for j in dependents[i]:
+                in_degree[j] -= 1
+                if in_degree[j] == 0:
+                    next_layer.append(j)
+        layer = next_layer
+
+    if placed < len(tasks):
+        # Every blocked task still waits on another blocked task, so walking
+        # dependencies from any of them must loop back; report that loop rather
+        # than everything stuck behind it.
+        blocked = {i for i, n in enumerate(in_degree) if n}
+        path: list[int] = []
+        seen: dict[int, int] = {}
+        i = min(blocked)
+        while i not in seen:
+            seen[i] = len(path)
+            path.append(i)
+            i = next(index[d] for d in tasks[i].depends_on if index.get(d) in blocked)
+        cycle = [tasks[j].id for j in path[seen[i]:]]
+        raise ValueError(
+            f"Dependency cycle in plan: {' -> '.join(cycle + cycle[:1])} "
+            f"({len(blocked)} task(s) blocked)"
+        )
+
+    # Deepest layers first, so every dependent's descendant set is already known
+    descendants: list[set[int]] = [set() for _ in tasks]
+    for layer in reversed(layers):
+        for i in layer:
+            for j in dependents[i]:
+                descendants[i].add(j)
+                descendants[i] |= descendants[j]
+
+    def order(i: int) -> tuple[int, int]:
+        return -len(descendants[i]), tasks[i].priority
+
+    return [[tasks[i] for i in sorted(layer, key=order)] for layer in layers]
 
 
 class NanobotSwarm:
@@ -70,12 +240,19 @@ class NanobotSwarm:
         self.max_parallel = max_parallel_agents
         self.semaphore = asyncio.Semaphore(max_parallel_agents)
         self.registry = tool_registry or build_default_registry()
+        self.client = _build_vllm_client(
+            vllm_url, api_key, max_connections=64, max_keepalive_connections=32
+        )
+        # Idle agents kept per role so later subtasks skip construction and registration
+        self._agent_pool: dict[AgentRole, asyncio.Queue[NanobotV3]] = {
+            role: asyncio.Queue(maxsize=max_parallel_agents) for role in SYSTEM_PROMPTS
+        }
 
     def _make_agent(self, role: AgentRole, session_id: str) -> NanobotV3:
         return NanobotV3(
             config=AgentConfig(
                 role=role,
-                name=f"{role.value}-{uuid.uuid4().hex[:6]}",
+                name=f"{role.value}-{token_hex(3)}",
                 system_prompt=SYSTEM_PROMPTS[role],
                 max_tokens=2048,
                 temperature=0.0 if role == AgentRole.ORCHESTRATOR else 0.1,
@@ -84,40 +261,80 @@ class NanobotSwarm:
             vllm_base_url=self.vllm_url,
             api_key=self.api_key,
             tool_registry=self.registry,
+            client=self.client,
         )
 
-    def _parse_plan(self, text: str) -> dict:
+    async def _acquire(self, role: AgentRole, session_id: str) -> NanobotV3:
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            match = re.search(r"```(?:json)?\s*([\s\S]+?)```", text)
-            if match:
-                return json.loads(match.group(1))
-            raise ValueError(f"Could not parse plan: {text[:200]}")
+            agent = self._agent_pool[role].get_nowait()
+        except asyncio.QueueEmpty:
+            agent = self._make_agent(role, session_id)
+            await agent.initialize()
+        else:
+            await agent.recycle(session_id)
+        return agent
+
+    async def _release(self, role: AgentRole, agent: NanobotV3) -> None:
+        # An idle pooled agent isn't part of any session; recycle() in
+        # _acquire registers it again under the next one.
+        await swarm_state.deregister_agent(agent.id)
+        try:
+            self._agent_pool[role].put_nowait(agent)
+        except asyncio.QueueFull:
+            await agent.shutdown()
+
+    async def aclose(self) -> None:
+        """Shut down pooled agents and close the shared vLLM connection pool."""
+        for pool in self._agent_pool.values():
+            while not pool.empty():
+                await pool.get_nowait().shutdown()
+        await self.client.close()
+
+    def _parse_plan(self, text: str) -> Plan:
+        return _parse_plan_text(text)
 
     async def _run_subtask(
         self,
-        task_def: dict,
+        task_def: PlanTask,
         session_id: str,
         dep_results: dict[str, str],
     ) -> tuple[str, str]:
+        role = AgentRole(task_def.role)
+        # Reuse a recent identical result; executors act, so they always run
+        cache_key = None
+        if role != AgentRole.EXECUTOR:
+            cache_key = result_cache_key(
+                role.value,
+                task_def.instruction,
+                json.dumps(dep_results, sort_keys=True),
+                SWARM_MODEL,
+                self.vllm_url,
+                SYSTEM_PROMPTS[role],
+            )
+        cached = await swarm_state.get_cached_result(cache_key) if cache_key else None
+        if cached and cached.get("output"):
+            log.info("subtask_cache_hit", task_id=task_def.id, role=role.value)
+            return task_def.id, cached["output"]
+
         async with self.semaphore:
-            role = AgentRole(task_def["role"])
-            agent = self._make_agent(role, session_id)
-            await agent.initialize()
+            agent = await self._acquire(role, session_id)
 
             task = AgentTask(
-                id=task_def["id"],
-                content=task_def["instruction"],
+                id=task_def.id,
+                content=task_def.instruction,
                 context={"dep_results": dep_results} if dep_results else {},
-                priority=task_def.get("priority", 5),
+                priority=task_def.priority,
             )
 
-            result = await agent.execute(task)
-            await agent.shutdown()
+            try:
+                result = await agent.execute(task)
+            finally:
+                await self._release(role, agent)
 
+            if cache_key and result.success and result.output:
+                await swarm_state.put_cached_result(cache_key, {"output": result.output})
             return (
-                task_def["id"],
+                task_def.id,
                 result.output if result.success else f"FAILED: {result.error}",
             )
 
@@ -128,8 +345,7 @@ class NanobotSwarm:
         log.info("swarm_run_start", session_id=session_id, goal_preview=goal[:80])
 
         # Queen planning
-        queen = self._make_agent(AgentRole.ORCHESTRATOR, session_id)
-        await queen.initialize()
+        queen = await self._acquire(AgentRole.ORCHESTRATOR, session_id)
 
         session_history = await journal.get_full_context_for_orchestrator()
         plan_content = goal
@@ -140,8 +356,10 @@ class NanobotSwarm:
             id=str(uuid.uuid4()),
             content=f"Decompose this goal into a nanobot swarm execution plan:\n\n{plan_content}",
         )
-        plan_result = await queen.execute(plan_task)
-        await queen.shutdown()
+        try:
+            plan_result = await queen.execute(plan_task)
+        finally:
+            await self._release(AgentRole.ORCHESTRATOR, queen)
 
         if not plan_result.success:
             await swarm_state.complete_session(session_id, "Planning failed", False)
@@ -153,35 +371,27 @@ class NanobotSwarm:
             await swarm_state.complete_session(session_id, str(e), False)
             return {"success": False, "session_id": session_id, "error": str(e)}
 
-        subtasks = plan.get("subtasks", [])
-        await swarm_state.update_session(session_id, {"task_count": len(subtasks)})
+        subtasks = _coalesce_duplicates(plan.tasks)
+        try:
+            levels = _compute_levels(subtasks)
+        except ValueError as e:
+            await swarm_state.complete_session(session_id, str(e), False)
+            return {"success": False, "session_id": session_id, "error": str(e)}
+        swarm_state.queue_session_update(session_id, {"task_count": len(subtasks)})
 
         # Execute subtasks in dependency order
         completed: dict[str, str] = {}
         all_results: list[dict] = []
+        synth_sections: list[str] = []
 
-        def dep_level(t: dict) -> int:
-            deps = t.get("depends_on", [])
-            if not deps:
-                return 0
-            return max(
-                dep_level(
-                    next((s for s in subtasks if s["id"] == d), {"depends_on": []})
-                )
-                for d in deps
-            ) + 1
-
-        max_level = max((dep_level(t) for t in subtasks), default=0)
-
-        for level in range(max_level + 1):
-            level_tasks = [t for t in subtasks if dep_level(t) == level]
+        for level, level_tasks in enumerate(levels):
             log.info("executing_level", level=level, tasks=len(level_tasks))
 
             level_coros = [
                 self._run_subtask(
                     t,
                     session_id,
-                    {d: completed[d] for d in t.get("depends_on", []) if d in completed},
+                    {d: completed[d] for d in t.depends_on if d in completed},
                 )
                 for t in level_tasks
             ]
@@ -189,18 +399,21 @@ class NanobotSwarm:
 
             for task_def, res in zip(level_tasks, level_results):
                 if isinstance(res, Exception):
-                    tid, output = task_def["id"], f"Exception: {res}"
+                    tid, output = task_def.id, f"Exception: {res}"
                 else:
                     tid, output = res
                 completed[tid] = output
                 all_results.append({
                     "task_id": tid,
-                    "role": task_def["role"],
+                    "role": task_def.role,
                     "output": output,
                     "success": not output.startswith("FAILED:") and not output.startswith("Exception:"),
                 })
+                synth_sections.append(
+                    f"### {task_def.role.upper()} ({tid}):\n{output[:SYNTH_RESULT_CHARS]}"
+                )
 
-            await swarm_state.update_session(
+            swarm_state.queue_session_update(
                 session_id, {"completed_tasks": len(completed)}
             )
 
@@ -222,20 +435,18 @@ class NanobotSwarm:
             vllm_base_url=self.vllm_url,
             api_key=self.api_key,
             tool_registry=self.registry,
+            client=self.client,
         )
         await synth_agent.initialize()
 
-        results_text = "\n\n".join([
-            f"### {r['role'].upper()} ({r['task_id']}):\n{r['output'][:1500]}"
-            for r in all_results
-        ])
+        results_text = "\n\n".join(synth_sections)
         synth_task = AgentTask(
             content=f"""Original Goal: {goal}
 
 Subtask Results:
 {results_text}
 
-Synthesis Instruction: {plan.get('synthesis_instruction', 'Combine all results into a comprehensive final answer.')}
+Synthesis Instruction: {plan.synthesis_instruction or 'Combine all results into a comprehensive final answer.'}
 
 Produce the final comprehensive answer in plain text (NOT JSON):""",
         )
@@ -253,7 +464,7 @@ Produce the final comprehensive answer in plain text (NOT JSON):""",
             "success": True,
             "session_id": session_id,
             "goal": goal,
-            "plan_summary": plan.get("plan_summary"),
+            "plan_summary": plan.plan_summary,
             "subtask_results": all_results,
             "final_answer": final_answer,
             "session_summary": summary,
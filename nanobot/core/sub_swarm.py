@@ -4,11 +4,14 @@ manage its own team of L2 sub-agents.
 """
 
 import asyncio
-import uuid
+from secrets import token_hex
 import time
 import structlog
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Mapping
+
+from openai import AsyncOpenAI
 
 from nanobot.core.roles import L1Role, L2Role
 from nanobot.core.sub_prompts import SUB_AGENT_PROMPTS
@@ -20,14 +23,99 @@ log = structlog.get_logger()
 
 MAX_SUB_PARALLEL = 4
 
-
-@dataclass
+# L2 stages each L1 role runs, in order; roles within a stage run in parallel
+PIPELINES: Mapping[L1Role, tuple[tuple[L2Role, ...], ...]] = MappingProxyType({
+    L1Role.CODER: (
+        (L2Role.CODE_PLANNER,),
+        (L2Role.CODE_WRITER,),
+        (L2Role.CODE_TESTER, L2Role.CODE_REVIEWER),
+    ),
+    L1Role.RESEARCHER: (
+        (L2Role.WEB_SEARCHER,),
+        (L2Role.SYNTHESIZER, L2Role.FACT_VERIFIER),
+    ),
+    L1Role.ANALYST: (
+        (L2Role.REASONER,),
+        (L2Role.CRITIQUER,),
+        (L2Role.SUMMARIZER,),
+    ),
+    L1Role.VALIDATOR: (
+        (L2Role.CORRECTNESS, L2Role.COMPLETENESS),
+        (L2Role.SCORER,),
+    ),
+    L1Role.EXECUTOR: (
+        (L2Role.ACTION_PLANNER,),
+        (L2Role.ACTION_RUNNER,),
+    ),
+    L1Role.ARCHITECT: (),
+})
+
+# L2 roles that get one specific upstream output handed over under a label
+_INJECTIONS: Mapping[L2Role, tuple[L2Role, str]] = MappingProxyType({
+    L2Role.CODE_WRITER: (L2Role.CODE_PLANNER, "IMPLEMENTATION PLAN TO FOLLOW"),
+    L2Role.CODE_TESTER: (L2Role.CODE_WRITER, "CODE TO TEST"),
+    L2Role.SYNTHESIZER: (L2Role.WEB_SEARCHER, "RAW SEARCH RESULTS TO SYNTHESIZE"),
+    L2Role.FACT_VERIFIER: (L2Role.SYNTHESIZER, "SYNTHESIZED CLAIMS TO VERIFY"),
+    L2Role.CRITIQUER: (L2Role.REASONER, "REASONING TO CRITIQUE"),
+    L2Role.ACTION_RUNNER: (L2Role.ACTION_PLANNER, "ACTION PLAN TO EXECUTE"),
+})
+
+# Upstream outputs each L2 role actually reads. Roles not listed see every
+# prior output; the summarizer folds them all into its own block.
+_ROLE_DEPS: Mapping[L2Role, tuple[L2Role, ...]] = MappingProxyType({
+    L2Role.CODE_WRITER: (L2Role.CODE_PLANNER,),
+    L2Role.CODE_TESTER: (L2Role.CODE_WRITER,),
+    L2Role.SYNTHESIZER: (L2Role.WEB_SEARCHER,),
+    # Runs alongside the synthesizer, so checks against the raw search results
+    L2Role.FACT_VERIFIER: (L2Role.WEB_SEARCHER, L2Role.SYNTHESIZER),
+    L2Role.CRITIQUER: (L2Role.REASONER,),
+    L2Role.ACTION_RUNNER: (L2Role.ACTION_PLANNER,),
+})
+
+# Roles every later stage builds on; if one fails the rest of its pipeline
+# would only be working from an error message, so the run stops there.
+_CRITICAL_ROLES = frozenset({
+    L2Role.CODE_PLANNER,
+    L2Role.WEB_SEARCHER,
+    L2Role.REASONER,
+    L2Role.ACTION_PLANNER,
+})
+
+# System prompt for every L2 role, generic fallback included
+_PROMPT_FOR_ROLE: Mapping[L2Role, str] = MappingProxyType({
+    r: SUB_AGENT_PROMPTS.get(r, f"You are a {r.value} sub-agent. Complete your assigned task.")
+    for r in L2Role
+})
+
+# Per-role agent config; each agent only gets its own name on top
+_BASE_CONFIG: Mapping[L2Role, AgentConfig] = MappingProxyType({
+    r: AgentConfig(
+        role=AgentRole(r.value),
+        name="",
+        system_prompt=_PROMPT_FOR_ROLE[r],
+        max_tokens=2048,
+        temperature=0.05,
+        timeout_seconds=300.0,
+    )
+    for r in L2Role
+})
+
+
+@dataclass(slots=True, frozen=True)
 class SubTaskResult:
     role: L2Role
     output: str
     success: bool
     duration: float
     tokens: int
+    preview: str  # first 200 chars of output, sliced once for stage logs
+
+
+def _append_clipped(parts: list[str], header: str, text: str, max_chars: int) -> None:
+    """Append a prompt section clipped to its context budget, noting any cut."""
+    parts.append(header + text[:max_chars])
+    if len(text) > max_chars:
+        parts.append(f"[... truncated {len(text) - max_chars} chars]")
 
 
 class SubSwarm:
@@ -41,6 +129,7 @@ class SubSwarm:
         api_key: str,
         tool_registry: ToolRegistry,
         semaphore: asyncio.Semaphore,
+        client: AsyncOpenAI | None = None,
     ):
         self.l1_role = l1_role
         self.session_id = session_id
@@ -48,59 +137,52 @@ class SubSwarm:
         self.api_key = api_key
         self.registry = tool_registry
         self.semaphore = semaphore
+        self.client = client
         self.sub_semaphore = asyncio.Semaphore(MAX_SUB_PARALLEL)
-
-        self.pipelines: dict[L1Role, list[list[L2Role]]] = {
-            L1Role.CODER: [
-                [L2Role.CODE_PLANNER],
-                [L2Role.CODE_WRITER],
-                [L2Role.CODE_TESTER, L2Role.CODE_REVIEWER],
-            ],
-            L1Role.RESEARCHER: [
-                [L2Role.WEB_SEARCHER],
-                [L2Role.SYNTHESIZER, L2Role.FACT_VERIFIER],
-            ],
-            L1Role.ANALYST: [
-                [L2Role.REASONER],
-                [L2Role.CRITIQUER],
-                [L2Role.SUMMARIZER],
-            ],
-            L1Role.VALIDATOR: [
-                [L2Role.CORRECTNESS, L2Role.COMPLETENESS],
-                [L2Role.SCORER],
-            ],
-            L1Role.EXECUTOR: [
-                [L2Role.ACTION_PLANNER],
-                [L2Role.ACTION_RUNNER],
-            ],
-            L1Role.ARCHITECT: [],
-        }
+        # One registered L2 agent per role, reused for the whole pipeline run
+        # and shut down together when execute() finishes
+        self._agent_pool: dict[L2Role, NanobotV3] = {}
+
+        self._pipeline = PIPELINES.get(l1_role, ())
+        # Role names per stage for log events, rendered once per swarm
+        self._stage_role_names: tuple[tuple[str, ...], ...] = tuple(
+            tuple(r.value for r in stage) for stage in self._pipeline
+        )
 
     def _make_sub_agent(self, role: L2Role) -> NanobotV3:
-        prompt = SUB_AGENT_PROMPTS.get(
-            role, f"You are a {role.value} sub-agent. Complete your assigned task."
-        )
         return NanobotV3(
-            config=AgentConfig(
-                role=AgentRole(role.value),
-                name=f"{role.value}-{uuid.uuid4().hex[:6]}",
-                system_prompt=prompt,
-                max_tokens=2048,
-                temperature=0.05,
-                timeout_seconds=300.0,
-            ),
+            config=replace(_BASE_CONFIG[role], name=f"{role.value}-{token_hex(3)}"),
             session_id=self.session_id,
             vllm_base_url=self.vllm_url,
             api_key=self.api_key,
             tool_registry=self.registry,
+            client=self.client,
         )
 
-    @staticmethod
-    def _truncate(text: str, max_chars: int = 6000) -> str:
-        """Truncate text to fit within context window budget."""
-        if len(text) <= max_chars:
-            return text
-        return text[:max_chars] + f"\n\n[... truncated {len(text) - max_chars} chars]"
+    async def initialize(self) -> None:
+        """Build and register this pipeline's L2 agents ahead of execution."""
+        roles = [
+            role
+            for stage in self._pipeline
+            for role in stage
+            if role not in self._agent_pool
+        ]
+        agents = [self._make_sub_agent(role) for role in roles]
+        await asyncio.gather(*(agent.initialize() for agent in agents))
+        self._agent_pool.update(zip(roles, agents))
+
+    async def _get_sub_agent(self, role: L2Role) -> NanobotV3:
+        agent = self._agent_pool.get(role)
+        if agent is None:
+            agent = self._make_sub_agent(role)
+            await agent.initialize()
+            self._agent_pool[role] = agent
+        return agent
+
+    async def _shutdown_agents(self) -> None:
+        agents = list(self._agent_pool.values())
+        self._agent_pool.clear()
+        await asyncio.gather(*(agent.shutdown() for agent in agents), return_exceptions=True)
 
     def _build_sub_task_content(
         self,
@@ -108,36 +190,32 @@ class SubSwarm:
         original_task: str,
         stage_inputs: dict[L2Role, str],
     ) -> str:
-        content_parts = [f"TASK:\n{self._truncate(original_task, 2000)}"]
-
-        if stage_inputs:
-            relevant = {r: o for r, o in stage_inputs.items() if r != role}
-            if relevant:
-                ctx = "\n\n".join([
-                    f"### Output from {r.value}:\n{self._truncate(o, 4000)}"
-                    for r, o in relevant.items()
-                ])
-                content_parts.append(f"PRIOR STAGE OUTPUTS:\n{ctx}")
-
-        # Role-specific context injection
-        injections = {
-            L2Role.CODE_WRITER: (L2Role.CODE_PLANNER, "IMPLEMENTATION PLAN TO FOLLOW"),
-            L2Role.CODE_TESTER: (L2Role.CODE_WRITER, "CODE TO TEST"),
-            L2Role.SYNTHESIZER: (L2Role.WEB_SEARCHER, "RAW SEARCH RESULTS TO SYNTHESIZE"),
-            L2Role.FACT_VERIFIER: (L2Role.SYNTHESIZER, "SYNTHESIZED CLAIMS TO VERIFY"),
-            L2Role.CRITIQUER: (L2Role.REASONER, "REASONING TO CRITIQUE"),
-            L2Role.ACTION_RUNNER: (L2Role.ACTION_PLANNER, "ACTION PLAN TO EXECUTE"),
-        }
+        # The role's system prompt is the static prefix. Below it the layout is
+        # fixed: the task (shared by every role in this run), then upstream
+        # outputs in pipeline order, so identical inputs give identical bytes.
+        # Every section and truncation note is one part of a single join.
+        parts: list[str] = []
+        _append_clipped(parts, "TASK:\n", original_task, 2000)
+
+        if role == L2Role.SUMMARIZER:
+            header = "CONTENT TO SUMMARIZE:\n"
+            for v in stage_inputs.values():
+                _append_clipped(parts, header, v, 3000)
+                header = ""
+            return "\n\n".join(parts)
+
+        # Role-specific context injection gets its own labelled block
+        dep_role, label = _INJECTIONS.get(role, (None, ""))
+        header = "PRIOR STAGE OUTPUTS:\n"
+        for r, o in stage_inputs.items():
+            if r != role and r != dep_role:
+                _append_clipped(parts, f"{header}### Output from {r.value}:\n", o, 4000)
+                header = ""
 
-        if role in injections:
-            dep_role, label = injections[role]
-            if dep_role in stage_inputs:
-                content_parts.append(f"{label}:\n{self._truncate(stage_inputs[dep_role], 5000)}")
-        elif role == L2Role.SUMMARIZER and stage_inputs:
-            all_prior = "\n\n".join(self._truncate(v, 3000) for v in stage_inputs.values())
-            content_parts.append(f"CONTENT TO SUMMARIZE:\n{all_prior}")
+        if dep_role in stage_inputs:
+            _append_clipped(parts, f"{label}:\n", stage_inputs[dep_role], 5000)
 
-        return "\n\n".join(content_parts)
+        return "\n\n".join(parts)
 
     async def _run_sub_agent(
         self,
@@ -148,72 +226,155 @@ class SubSwarm:
         async with self.semaphore:
             async with self.sub_semaphore:
                 start = time.time()
-                agent = self._make_sub_agent(role)
-                await agent.initialize()
-
+                agent = await self._get_sub_agent(role)
+                deps = _ROLE_DEPS.get(role)
+                if deps is not None:
+                    stage_inputs = {r: stage_inputs[r] for r in deps if r in stage_inputs}
                 content = self._build_sub_task_content(role, original_task, stage_inputs)
-                task = AgentTask(id=str(uuid.uuid4()), content=content)
+                task = AgentTask(content=content)
 
                 result = await agent.execute(task)
-                await agent.shutdown()
 
+                output = result.output if result.success else f"FAILED: {result.error}"
                 return SubTaskResult(
                     role=role,
-                    output=result.output if result.success else f"FAILED: {result.error}",
+                    output=output,
                     success=result.success,
                     duration=time.time() - start,
                     tokens=result.tokens_used,
+                    preview=output[:200],
                 )
 
-    async def execute(self, task_content: str) -> dict[str, Any]:
-        pipeline = self.pipelines.get(self.l1_role, [])
+    async def execute_stream(self, task_content: str) -> AsyncIterator[SubTaskResult]:
+        """
+        Run the pipeline, yielding each sub-agent result as soon as it lands.
 
+        A failed critical role (one every later role builds on) ends the
+        run: in-flight sub-agents are cancelled and nothing more is yielded.
+        Close the iterator (aclose) if abandoning it early so the pooled
+        agents are released.
+        """
+        pipeline = self._pipeline
         if not pipeline:
-            return {
-                "l1_role": self.l1_role.value,
-                "stages": [],
-                "final_output": task_content,
-                "total_tokens": 0,
-            }
-
-        all_outputs: dict[L2Role, str] = {}
-        stage_logs = []
-        total_tokens = 0
+            return
 
         log.info(
             "sub_swarm_start",
             l1_role=self.l1_role,
-            stages=len(pipeline),
+            stages=self._stage_role_names,
             task_preview=task_content[:80],
         )
 
-        for stage_idx, stage_roles in enumerate(pipeline):
-            log.info(
-                "sub_swarm_stage",
-                stage=stage_idx + 1,
-                roles=[r.value for r in stage_roles],
+        # A role waits only on the earlier-stage roles it reads (every earlier
+        # role if it has no explicit deps), not on its whole previous stage.
+        stage_of = {role: idx for idx, stage in enumerate(pipeline) for role in stage}
+        needs: dict[L2Role, tuple[L2Role, ...]] = {}
+        for role, idx in stage_of.items():
+            deps = _ROLE_DEPS.get(role)
+            needs[role] = tuple(
+                r for r, r_idx in stage_of.items()
+                if r_idx < idx and (deps is None or r in deps)
             )
+        waiting_on = {role: set(deps) for role, deps in needs.items()}
+        dependents: dict[L2Role, list[L2Role]] = {role: [] for role in stage_of}
+        for role, deps in needs.items():
+            for d in deps:
+                dependents[d].append(role)
+
+        outputs: dict[L2Role, str] = {}
+        finished: asyncio.Queue[SubTaskResult] = asyncio.Queue()
+        ready: asyncio.Queue[L2Role] = asyncio.Queue()
+        for role, pending in waiting_on.items():
+            if not pending:
+                ready.put_nowait(role)
+
+        async def worker() -> None:
+            while True:
+                role = await ready.get()
+                log.info("sub_agent_dispatched", l1_role=self.l1_role, role=role.value)
+                try:
+                    res = await self._run_sub_agent(
+                        role, task_content, {r: outputs[r] for r in needs[role]}
+                    )
+                except Exception as e:
+                    output = f"FAILED: {e}"
+                    res = SubTaskResult(
+                        role=role, output=output, success=False,
+                        duration=0.0, tokens=0, preview=output[:200],
+                    )
+                outputs[role] = res.output
+                if res.success or role not in _CRITICAL_ROLES:
+                    for child in dependents[role]:
+                        pending = waiting_on[child]
+                        pending.discard(role)
+                        if not pending:
+                            ready.put_nowait(child)
+                finished.put_nowait(res)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(MAX_SUB_PARALLEL, len(stage_of)))
+        ]
+        try:
+            for _ in range(len(stage_of)):
+                res = await finished.get()
+                yield res
+                if not res.success and res.role in _CRITICAL_ROLES:
+                    log.warning(
+                        "sub_swarm_halted", l1_role=self.l1_role, role=res.role.value
+                    )
+                    break
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self._shutdown_agents()
 
-            stage_coros = [
-                self._run_sub_agent(role, task_content, all_outputs)
-                for role in stage_roles
-            ]
-            stage_results: list[SubTaskResult] = await asyncio.gather(*stage_coros)
-
-            stage_entry = {"stage": stage_idx + 1, "results": []}
-            for res in stage_results:
-                all_outputs[res.role] = res.output
-                total_tokens += res.tokens
-                stage_entry["results"].append({
-                    "role": res.role.value,
-                    "success": res.success,
-                    "duration": round(res.duration, 2),
-                    "tokens": res.tokens,
-                    "output_preview": res.output[:200],
-                })
-            stage_logs.append(stage_entry)
-
-        final_output = self._synthesize_pipeline_output(all_outputs)
+    async def execute(self, task_content: str) -> dict[str, Any]:
+        pipeline = self._pipeline
+
+        if not pipeline:
+            return {
+                "l1_role": self.l1_role.value,
+                "stages": [],
+                "final_output": task_content,
+                "total_tokens": 0,
+            }
+
+        results = {res.role: res async for res in self.execute_stream(task_content)}
+
+        # Results stay as slotted SubTaskResults until here; the report dicts
+        # are built once, in the pipeline's declared role order (never
+        # completion order) so the report and synthesis are byte-stable.
+        ran = [
+            [role for role in stage_roles if role in results] for stage_roles in pipeline
+        ]
+        all_outputs = {role: results[role].output for stage in ran for role in stage}
+        total_tokens = sum(res.tokens for res in results.values())
+        stage_logs = [
+            {
+                "stage": stage_idx + 1,
+                "results": [
+                    {
+                        "role": res.role.value,
+                        "success": res.success,
+                        "duration": round(res.duration, 2),
+                        "tokens": res.tokens,
+                        "output_preview": res.preview,
+                    }
+                    for res in map(results.__getitem__, stage_roles)
+                ],
+            }
+            for stage_idx, stage_roles in enumerate(ran)
+            if stage_roles
+        ]
+
+        # A halted pipeline lacks the roles its synthesizer expects; report
+        # what did run, failure included, instead.
+        if len(all_outputs) < sum(map(len, pipeline)):
+            final_output = self._synth_default(all_outputs)
+        else:
+            final_output = self._synthesize_pipeline_output(all_outputs)
 
         log.info(
             "sub_swarm_complete",
@@ -230,40 +391,52 @@ class SubSwarm:
         }
 
     def _synthesize_pipeline_output(self, outputs: dict[L2Role, str]) -> str:
-        if self.l1_role == L1Role.CODER:
-            code = outputs.get(L2Role.CODE_WRITER, "")
-            tests = outputs.get(L2Role.CODE_TESTER, "")
-            review = outputs.get(L2Role.CODE_REVIEWER, "")
-            parts = ["## Implementation\n" + code]
-            if tests:
-                parts.append("## Test Results\n" + tests)
-            if review:
-                parts.append("## Code Review\n" + review)
-            return "\n\n".join(parts)
-
-        elif self.l1_role == L1Role.RESEARCHER:
-            synthesis = outputs.get(L2Role.SYNTHESIZER, "")
-            verification = outputs.get(L2Role.FACT_VERIFIER, "")
-            parts = [synthesis]
-            if verification:
-                parts.append("## Fact Verification\n" + verification)
-            return "\n\n".join(parts)
-
-        elif self.l1_role == L1Role.ANALYST:
-            return outputs.get(L2Role.SUMMARIZER, "\n\n".join(outputs.values()))
+        synth = self._SYNTHESIZERS.get(self.l1_role, SubSwarm._synth_default)
+        return synth(self, outputs)
+
+    def _synth_coder(self, outputs: dict[L2Role, str]) -> str:
+        code = outputs.get(L2Role.CODE_WRITER, "")
+        tests = outputs.get(L2Role.CODE_TESTER, "")
+        review = outputs.get(L2Role.CODE_REVIEWER, "")
+        parts = ["## Implementation\n" + code]
+        if tests:
+            parts.append("## Test Results\n" + tests)
+        if review:
+            parts.append("## Code Review\n" + review)
+        return "\n\n".join(parts)
+
+    def _synth_researcher(self, outputs: dict[L2Role, str]) -> str:
+        synthesis = outputs.get(L2Role.SYNTHESIZER, "")
+        verification = outputs.get(L2Role.FACT_VERIFIER, "")
+        parts = [synthesis]
+        if verification:
+            parts.append("## Fact Verification\n" + verification)
+        return "\n\n".join(parts)
+
+    def _synth_analyst(self, outputs: dict[L2Role, str]) -> str:
+        return outputs.get(L2Role.SUMMARIZER, "\n\n".join(outputs.values()))
+
+    def _synth_validator(self, outputs: dict[L2Role, str]) -> str:
+        return (
+            "## Validation Report\n\n"
+            f"### Correctness\n{outputs.get(L2Role.CORRECTNESS, '')}\n\n"
+            f"### Completeness\n{outputs.get(L2Role.COMPLETENESS, '')}\n\n"
+            f"### Quality Score\n{outputs.get(L2Role.SCORER, '')}"
+        )
 
-        elif self.l1_role == L1Role.VALIDATOR:
-            return (
-                "## Validation Report\n\n"
-                f"### Correctness\n{outputs.get(L2Role.CORRECTNESS, '')}\n\n"
-                f"### Completeness\n{outputs.get(L2Role.COMPLETENESS, '')}\n\n"
-                f"### Quality Score\n{outputs.get(L2Role.SCORER, '')}"
-            )
+    def _synth_executor(self, outputs: dict[L2Role, str]) -> str:
+        return outputs.get(L2Role.ACTION_RUNNER, "\n\n".join(outputs.values()))
 
-        elif self.l1_role == L1Role.EXECUTOR:
-            return outputs.get(L2Role.ACTION_RUNNER, "\n\n".join(outputs.values()))
+    def _synth_default(self, outputs: dict[L2Role, str]) -> str:
+        return "\n\n---\n\n".join(
+            f"### {role.value}\n{output}" for role, output in outputs.items()
+        )
 
-        else:
-            return "\n\n---\n\n".join(
-                f"### {role.value}\n{output}" for role, output in outputs.items()
-            )
+    # How each L1 role folds its sub-agent outputs into one deliverable
+    _SYNTHESIZERS: dict[L1Role, Callable[["SubSwarm", dict[L2Role, str]], str]] = {
+        L1Role.CODER: _synth_coder,
+        L1Role.RESEARCHER: _synth_researcher,
+        L1Role.ANALYST: _synth_analyst,
+        L1Role.VALIDATOR: _synth_validator,
+        L1Role.EXECUTOR: _synth_executor,
+    }
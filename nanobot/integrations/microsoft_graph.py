@@ -20,11 +20,15 @@ The integration exposes both:
 import asyncio
 import json
 import os
+import random
 import re
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+from urllib.parse import quote, quote_plus, urlencode
 
 import httpx
 import msal
@@ -35,8 +39,24 @@ log = structlog.get_logger()
 NELLIE_HOME = Path(os.getenv("NELLIE_HOME", str(Path.home() / ".nellie")))
 CRED_FILE = NELLIE_HOME / "config" / "microsoft_graph.json"
 TOKEN_FILE = NELLIE_HOME / "config" / ".ms_graph_token.json"
+DELTA_FILE = NELLIE_HOME / "config" / ".ms_graph_delta.json"
 
 GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+GRAPH_BATCH_LIMIT = 20  # max sub-requests Graph accepts in one $batch
+# Bounded pool for Graph fan-out (task lists, pagination, batches); idle
+# connections are kept long enough to span a digest's sequential phases.
+GRAPH_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60)
+TASK_LIST_CONCURRENCY = 5  # To Do lists fetched at once by get_tasks
+GRAPH_RATE = 15  # requests/second the client paces itself to (Graph's per-app guidance)
+_QUERY_SAFE = "$,/:'()"  # OData query characters left unescaped in batch URLs
+INBOX_BUFFER_SIZE = 200  # newest inbox messages kept in memory between delta syncs
+DELTA_MAX_PAGES = 10  # delta pages applied per sync; the rest resume next call
+EMAIL_BODY_CACHE_SIZE = 256  # message bodies kept in memory, least recently used dropped
+EMAIL_BODY_TTL = 600  # seconds
+PROFILE_TTL = 3600  # seconds the /me profile is reused
+
+# UTC date -> (start, end) calendarView bounds for that day
+_today_window: tuple[str, str, str] = ("", "", "")
 
 # Default scopes for Nellie's Microsoft Graph access
 DEFAULT_SCOPES = [
@@ -48,10 +68,31 @@ DEFAULT_SCOPES = [
     "Files.Read",
     "Tasks.ReadWrite",
 ]
+_SCOPES_STR = " ".join(DEFAULT_SCOPES)
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
 
 
 MSAL_CACHE_FILE = NELLIE_HOME / "config" / ".msal_cache.json"
 
+TOKEN_EXPIRY_MARGIN = 300  # seconds before expiry a token is treated as stale
+
+# Process-wide token cache: client_id -> (access_token, refresh_token,
+# monotonic deadline), so a new client skips re-reading TOKEN_FILE.
+_TOKEN_CACHE: dict[str, tuple[str, str, float]] = {}
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replace path with text so a crash mid-write never leaves it truncated."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, text.encode("utf-8"))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
 
 class MicrosoftGraphCredentials:
     """Manages OAuth2 credentials using MSAL with device code flow and silent refresh.
@@ -69,7 +110,9 @@ class MicrosoftGraphCredentials:
         self.tenant_id: str = "common"
         self.access_token: str = ""
         self.refresh_token: str = ""
-        self.token_expires: float = 0
+        self.token_expires: float = 0  # wall clock, for persistence and status
+        self._monotonic_deadline: float = 0.0  # what validity is judged against
+        self._refresh_form: tuple[str, str, bytes] | None = None  # (client_id, secret, encoded)
         self._loaded = False
         self._msal_app: msal.PublicClientApplication | None = None
         self._msal_account: dict | None = None
@@ -81,7 +124,7 @@ class MicrosoftGraphCredentials:
             return False
 
         try:
-            data = json.loads(CRED_FILE.read_text(encoding="utf-8"))
+            data = json.loads(CRED_FILE.read_bytes())
             self.client_id = data.get("client_id", "")
             self.client_secret = data.get("client_secret", "")
             self.tenant_id = data.get("tenant_id", "common")
@@ -101,12 +144,17 @@ class MicrosoftGraphCredentials:
                 log.info("ms_graph_cached_account", username=self._msal_account.get("username", ""))
 
             # Also load legacy token file for backward compatibility
-            if TOKEN_FILE.exists() and not self._msal_account:
+            cached = _TOKEN_CACHE.get(self.client_id)
+            if cached and not self._msal_account and time.monotonic() < cached[2]:
+                self.access_token, self.refresh_token, self._monotonic_deadline = cached
+                self.token_expires = time.time() + (cached[2] - time.monotonic())
+            elif TOKEN_FILE.exists() and not self._msal_account:
                 try:
-                    token_data = json.loads(TOKEN_FILE.read_text(encoding="utf-8"))
+                    token_data = json.loads(TOKEN_FILE.read_bytes())
                     self.access_token = token_data.get("access_token", "")
                     self.refresh_token = token_data.get("refresh_token", "")
                     self.token_expires = token_data.get("expires_at", 0)
+                    self._monotonic_deadline = time.monotonic() + (self.token_expires - time.time())
                 except Exception:
                     pass
 
@@ -156,9 +204,7 @@ class MicrosoftGraphCredentials:
         """Persist the MSAL token cache to disk."""
         if self._msal_app and self._msal_app.token_cache.has_state_changed:
             try:
-                MSAL_CACHE_FILE.write_text(
-                    self._msal_app.token_cache.serialize(), encoding="utf-8"
-                )
+                _write_atomic(MSAL_CACHE_FILE, self._msal_app.token_cache.serialize())
             except Exception as e:
                 log.warning("msal_cache_save_failed", error=str(e))
 
@@ -176,8 +222,7 @@ class MicrosoftGraphCredentials:
                 scopes=["https://graph.microsoft.com/.default"],
             )
             if result and "access_token" in result:
-                self.access_token = result["access_token"]
-                self.token_expires = time.time() + result.get("expires_in", 3600) - 60
+                self._set_access_token(result["access_token"], result.get("expires_in", 3600))
                 self._save_msal_cache()
                 return True
 
@@ -188,8 +233,7 @@ class MicrosoftGraphCredentials:
                 account=self._msal_account,
             )
             if result and "access_token" in result:
-                self.access_token = result["access_token"]
-                self.token_expires = time.time() + result.get("expires_in", 3600) - 60
+                self._set_access_token(result["access_token"], result.get("expires_in", 3600))
                 self._save_msal_cache()
                 return True
 
@@ -222,8 +266,7 @@ class MicrosoftGraphCredentials:
         result = self._msal_app.acquire_token_by_device_flow(flow)
 
         if "access_token" in result:
-            self.access_token = result["access_token"]
-            self.token_expires = time.time() + result.get("expires_in", 3600) - 60
+            self._set_access_token(result["access_token"], result.get("expires_in", 3600))
             accounts = self._msal_app.get_accounts()
             if accounts:
                 self._msal_account = accounts[0]
@@ -236,15 +279,39 @@ class MicrosoftGraphCredentials:
 
     def save_token(self, token_response: dict) -> None:
         """Save token response to disk (legacy format for backward compatibility)."""
-        TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-        self.access_token = token_response.get("access_token", "")
         self.refresh_token = token_response.get("refresh_token", self.refresh_token)
-        self.token_expires = time.time() + token_response.get("expires_in", 3600) - 60
-        TOKEN_FILE.write_text(json.dumps({
+        self._set_access_token(
+            token_response.get("access_token", ""), token_response.get("expires_in", 3600)
+        )
+        _write_atomic(TOKEN_FILE, json.dumps({
             "access_token": self.access_token,
             "refresh_token": self.refresh_token,
             "expires_at": self.token_expires,
-        }), encoding="utf-8")
+        }))
+
+    @property
+    def token_url(self) -> str:
+        return f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
+
+    def refresh_body(self) -> bytes:
+        """Form-encoded refresh_token grant; only the token varies per call."""
+        form = self._refresh_form
+        if form is None or form[:2] != (self.client_id, self.client_secret):
+            encoded = urlencode({
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "grant_type": "refresh_token",
+                "scope": _SCOPES_STR,
+            }).encode()
+            form = self._refresh_form = (self.client_id, self.client_secret, encoded)
+        return form[2] + b"&refresh_token=" + quote_plus(self.refresh_token).encode()
+
+    def _set_access_token(self, access_token: str, expires_in: float) -> None:
+        """Record a fresh token; validity runs on the monotonic clock."""
+        self.access_token = access_token
+        self.token_expires = time.time() + expires_in - TOKEN_EXPIRY_MARGIN
+        self._monotonic_deadline = time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN
+        _TOKEN_CACHE[self.client_id] = (access_token, self.refresh_token, self._monotonic_deadline)
 
     @property
     def is_configured(self) -> bool:
@@ -252,13 +319,224 @@ class MicrosoftGraphCredentials:
 
     @property
     def is_token_valid(self) -> bool:
-        return bool(self.access_token) and time.time() < self.token_expires
+        return bool(self.access_token) and time.monotonic() < self._monotonic_deadline
 
     @property
     def has_cached_account(self) -> bool:
         return self._msal_account is not None
 
 
+def _retry_delay(resp_or_headers: httpx.Response | dict) -> float:
+    """Retry-After plus up to 25% jitter, so callers throttled together don't
+    all come back in the same instant."""
+    headers = resp_or_headers.headers if isinstance(resp_or_headers, httpx.Response) else resp_or_headers
+    try:
+        base = float(headers.get("Retry-After", "5"))
+    except ValueError:
+        base = 5.0
+    return base + random.uniform(0, base * 0.25)
+
+
+class _TokenBucket:
+    """Client-side pacing: at most `rate` tokens per second, bursting to `rate`."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: int = 1) -> None:
+        n = min(n, self.rate)
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < n:
+                await asyncio.sleep((n - self._tokens) / self.rate)
+                self._tokens = n
+                self._updated = time.monotonic()
+            self._tokens -= n
+
+
+def _sent_token(resp: httpx.Response) -> str:
+    """The bearer token a request was sent with."""
+    return resp.request.headers.get("Authorization", "").removeprefix("Bearer ")
+
+
+# Error codes Graph answers a delta link it no longer holds sync state for with
+_DELTA_EXPIRED_CODES = frozenset({"syncStateNotFound", "syncStateInvalid", "resyncRequired"})
+
+
+class _DeltaExpired(Exception):
+    """A saved delta/next link was refused as expired (410 Gone / syncStateNotFound)."""
+
+
+def _is_delta_expired(resp: httpx.Response) -> bool:
+    if resp.status_code == 410:
+        return True
+    try:
+        code = json.loads(resp.content)["error"]["code"]
+    except Exception:
+        return False
+    return code in _DELTA_EXPIRED_CODES
+
+
+# ── Response projections ─────────────────────────────────────────────
+# Shared by the single-resource methods and the $batch composites.
+
+# Shared default for absent sub-objects, so a missing field costs no allocation
+_ABSENT: Mapping[str, Any] = MappingProxyType({})
+
+# Static query options, built once. Each $select is exactly the fields its
+# row projection reads.
+_EMAIL_LIST_PARAMS: Mapping[str, str] = MappingProxyType({
+    "$orderby": "receivedDateTime desc",
+    "$select": "id,subject,from,toRecipients,receivedDateTime,bodyPreview,isRead,importance",
+})
+_EMAIL_BODY_PARAMS: Mapping[str, str] = MappingProxyType({
+    "$select": "id,subject,from,toRecipients,body,receivedDateTime,conversationId",
+})
+_EMAIL_SEARCH_SELECT = "id,subject,from,receivedDateTime,bodyPreview"
+# Have Exchange convert bodies to plain text (far smaller than HTML with inline markup)
+_TEXT_BODY_HEADERS: Mapping[str, str] = MappingProxyType({"Prefer": 'outlook.body-content-type="text"'})
+_TODAY_EVENT_PARAMS: Mapping[str, str] = MappingProxyType({
+    "$select": "id,subject,start,end,location,organizer,attendees,isAllDay",
+    "$orderby": "start/dateTime",
+})
+_EVENT_PARAMS: Mapping[str, str] = MappingProxyType({
+    "$select": "id,subject,start,end,location,organizer",
+    "$orderby": "start/dateTime",
+})
+_CONTACT_PARAMS: Mapping[str, str] = MappingProxyType({
+    "$select": "id,displayName,givenName,surname,emailAddresses,businessPhones,mobilePhone,companyName,jobTitle,department",
+    "$orderby": "displayName",
+})
+_CONTACT_SEARCH_SELECT = "id,displayName,emailAddresses,companyName,jobTitle"
+
+
+def _email_address(obj: dict, key: str) -> Mapping[str, Any]:
+    """The emailAddress ({name, address}) of a recipient-typed field."""
+    return obj.get(key, _ABSENT).get("emailAddress", _ABSENT)
+
+
+def _first_email(c: dict) -> str:
+    addresses = c.get("emailAddresses")
+    return addresses[0].get("address", "") if addresses else ""
+
+
+def _email_row(msg: dict) -> dict:
+    sender = _email_address(msg, "from")
+    return {
+        "id": msg["id"],
+        "subject": msg.get("subject", ""),
+        "from": sender.get("name", ""),
+        "from_email": sender.get("address", ""),
+        "to": [r.get("emailAddress", _ABSENT).get("name", "") for r in msg.get("toRecipients", ())],
+        "received": msg.get("receivedDateTime", ""),
+        "preview": msg.get("bodyPreview", ""),
+        "is_read": msg.get("isRead", False),
+        "importance": msg.get("importance", "normal"),
+    }
+
+
+def _clip_body(row: dict, max_chars: int | None) -> dict:
+    """Copy of a cached body row, with the body cut to max_chars."""
+    row = dict(row)
+    if max_chars is not None:
+        row["body"] = row["body"][:max_chars]
+    return row
+
+
+def _email_search_row(msg: dict) -> dict:
+    return {
+        "id": msg["id"],
+        "subject": msg.get("subject", ""),
+        "from": _email_address(msg, "from").get("name", ""),
+        "received": msg.get("receivedDateTime", ""),
+        "preview": msg.get("bodyPreview", ""),
+    }
+
+
+def _today_event_row(evt: dict) -> dict:
+    return {
+        "id": evt["id"],
+        "subject": evt.get("subject", ""),
+        "start": evt.get("start", _ABSENT).get("dateTime", ""),
+        "end": evt.get("end", _ABSENT).get("dateTime", ""),
+        "location": evt.get("location", _ABSENT).get("displayName", ""),
+        "organizer": _email_address(evt, "organizer").get("name", ""),
+        "attendees": [
+            a.get("emailAddress", _ABSENT).get("name", "")
+            for a in evt.get("attendees", ())
+        ],
+        "is_all_day": evt.get("isAllDay", False),
+    }
+
+
+def _upcoming_event_row(evt: dict) -> dict:
+    return {
+        "id": evt["id"],
+        "subject": evt.get("subject", ""),
+        "start": evt.get("start", _ABSENT).get("dateTime", ""),
+        "end": evt.get("end", _ABSENT).get("dateTime", ""),
+        "organizer": _email_address(evt, "organizer").get("name", ""),
+    }
+
+
+def _shared_event_rows(events: list[dict], terms: Iterable[str]) -> list[dict]:
+    """Events where a term matches an attendee's or the organizer's name or address."""
+    terms = [t.lower() for t in terms if t]
+    shared = []
+    for evt in events:
+        people = [a.get("emailAddress", _ABSENT) for a in evt.get("attendees", ())]
+        people.append(_email_address(evt, "organizer"))
+        if any(
+            t in p.get("name", "").lower() or t in p.get("address", "").lower()
+            for p in people
+            for t in terms
+        ):
+            shared.append(_upcoming_event_row(evt))
+    return shared
+
+
+def _contact_search_row(c: dict) -> dict:
+    return {
+        "name": c.get("displayName", ""),
+        "email": _first_email(c),
+        "company": c.get("companyName", ""),
+        "title": c.get("jobTitle", ""),
+    }
+
+
+def _contact_row(c: dict) -> dict:
+    return {
+        "id": c.get("id", ""),
+        "name": c.get("displayName", ""),
+        "email": _first_email(c),
+        "company": c.get("companyName", ""),
+        "title": c.get("jobTitle", ""),
+        "department": c.get("department", ""),
+        "phone": (c.get("businessPhones") or ("",))[0] or c.get("mobilePhone", ""),
+    }
+
+
+def _task_row(t: dict) -> dict:
+    due = t.get("dueDateTime")
+    return {
+        "id": t.get("id", ""),
+        "title": t.get("title", ""),
+        "status": t.get("status", ""),
+        "importance": t.get("importance", "normal"),
+        "due": due.get("dateTime", "")[:10] if due else "",
+        "list": t.get("_list_name", ""),
+    }
+
+
+def _task_rows(results: list[dict], count: int) -> list[dict]:
+    return [_task_row(t) for t in results[:count] if t.get("title")]
+
+
 class MicrosoftGraphClient:
     """
     Microsoft Graph API client for Nellie.
@@ -279,6 +557,20 @@ class MicrosoftGraphClient:
         self._client: httpx.AsyncClient | None = None
         self._user_id: str = ""  # Resolved user ID for app-only mode
         self._app_only: bool = False  # True when using client_credentials
+        # Single-flight guard: concurrent callers that find the token stale
+        # wait for one refresh instead of each POSTing to /token.
+        self._refresh_lock = asyncio.Lock()
+        # Kept open across refreshes so each one reuses the login connection
+        self._auth_client: httpx.AsyncClient | None = None
+        # Inbox delta sync: folder -> saved delta/next link (persisted to
+        # DELTA_FILE) and the newest messages, keyed by id, it keeps current
+        self._delta_link: dict[str, str] = {}
+        self._delta_loaded = False
+        self._inbox: dict[str, dict] = {}
+        # (message_id, as_text) -> (monotonic expiry, body row), LRU ordered
+        self._body_cache: OrderedDict[tuple[str, bool], tuple[float, dict]] = OrderedDict()
+        self._profile: tuple[float, dict] | None = None
+        self._pace = _TokenBucket(GRAPH_RATE)
 
     @property
     def _me(self) -> str:
@@ -315,10 +607,7 @@ class MicrosoftGraphClient:
         if not self.creds.is_token_valid and self.creds.refresh_token:
             await self._refresh_token()
 
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(connect=10, read=30, write=30, pool=30),
-            headers=self._auth_headers(),
-        )
+        self._client = self._build_http_client()
 
         # Detect app-only mode — use UPN directly, no extra HTTP call
         if self.creds.is_token_valid and self.creds._msal_confidential and not self.creds._msal_account:
@@ -347,50 +636,72 @@ class MicrosoftGraphClient:
 
         success = self.creds.acquire_token_device_code()
         if success:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(connect=10, read=30, write=30, pool=30),
-                headers=self._auth_headers(),
-            )
+            self._client = self._build_http_client()
             # Verify by calling /me
+            self._profile = None
             me = await self.get_me()
             if me:
                 print(f"\nAuthenticated as: {me.get('displayName', 'Unknown')} ({me.get('mail', me.get('userPrincipalName', ''))})")
                 return True
         return False
 
-    def _auth_headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self.creds.access_token}",
-            "Content-Type": "application/json",
-        }
+    def _build_http_client(self) -> httpx.AsyncClient:
+        # HTTP/2: HPACK-compressed headers and one multiplexed connection
+        # for concurrent Graph calls.
+        return httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=GRAPH_LIMITS,
+                retries=2,  # re-dial failed connects
+            ),
+            timeout=httpx.Timeout(connect=10, read=30, write=30, pool=30),
+            headers={
+                "Authorization": f"Bearer {self.creds.access_token}",
+                "Content-Type": "application/json",
+            },
+        )
 
-    async def _refresh_token(self) -> bool:
-        """Refresh the OAuth2 access token."""
+    def _sync_auth_header(self) -> None:
+        """Point the pooled client at the current token; the only header that changes."""
+        if self._client:
+            self._client.headers["Authorization"] = f"Bearer {self.creds.access_token}"
+
+    async def _refresh_token(self, rejected: str = "") -> bool:
+        """Refresh the OAuth2 access token.
+
+        ``rejected`` is the token a request just got a 401 for. A token that
+        is valid and differs from it was refreshed by another caller while
+        this one waited on the lock, so it is used as-is.
+        """
+        async with self._refresh_lock:
+            if self.creds.is_token_valid and self.creds.access_token != rejected:
+                return True
+            return await self._refresh_token_locked()
+
+    async def _refresh_token_locked(self) -> bool:
         if not self.creds.refresh_token:
             return False
 
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.post(
-                    f"https://login.microsoftonline.com/{self.creds.tenant_id}/oauth2/v2.0/token",
-                    data={
-                        "client_id": self.creds.client_id,
-                        "client_secret": self.creds.client_secret,
-                        "refresh_token": self.creds.refresh_token,
-                        "grant_type": "refresh_token",
-                        "scope": " ".join(DEFAULT_SCOPES),
-                    },
-                )
-                if resp.status_code == 200:
-                    self.creds.save_token(resp.json())
-                    log.info("ms_graph_token_refreshed")
-                    return True
-                else:
-                    log.error("ms_graph_token_refresh_failed", status=resp.status_code)
-                    return False
-            except Exception as e:
-                log.error("ms_graph_token_refresh_error", error=str(e))
+        if self._auth_client is None:
+            self._auth_client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        try:
+            resp = await self._auth_client.post(
+                self.creds.token_url, content=self.creds.refresh_body(), headers=_FORM_HEADERS,
+            )
+            if resp.status_code == 200:
+                self.creds.save_token(resp.json())
+                log.info("ms_graph_token_refreshed")
+                return True
+            else:
+                log.error("ms_graph_token_refresh_failed", status=resp.status_code)
                 return False
+        except Exception as e:
+            log.error("ms_graph_token_refresh_error", error=str(e))
+            return False
 
     async def _ensure_token(self) -> bool:
         """Ensure we have a valid token before making requests.
@@ -400,22 +711,33 @@ class MicrosoftGraphClient:
         if self.creds.is_token_valid:
             return True
 
-        # Try MSAL silent refresh first
-        if self.creds.has_cached_account and self.creds.acquire_token_silent():
-            if self._client:
-                self._client.headers.update(self._auth_headers())
-            return True
+        async with self._refresh_lock:
+            # Another caller may have refreshed while this one waited
+            if self.creds.is_token_valid:
+                return True
 
-        # Fall back to legacy refresh token
-        if self.creds.refresh_token:
-            refreshed = await self._refresh_token()
-            if refreshed and self._client:
-                self._client.headers.update(self._auth_headers())
-            return refreshed
-        return False
+            # Try MSAL silent refresh first
+            if self.creds.has_cached_account and self.creds.acquire_token_silent():
+                self._sync_auth_header()
+                return True
 
-    async def _get(self, endpoint: str, params: dict | None = None) -> dict | None:
-        """Make a GET request to Microsoft Graph API with 429 retry."""
+            # Fall back to legacy refresh token
+            if self.creds.refresh_token:
+                refreshed = await self._refresh_token_locked()
+                if refreshed:
+                    self._sync_auth_header()
+                return refreshed
+            return False
+
+    async def _get(
+        self, endpoint: str, params: dict | None = None, headers: dict | None = None,
+        delta: bool = False,
+    ) -> dict | None:
+        """Make a GET request to Microsoft Graph API with 429 retry.
+
+        With delta=True an expired delta/next link raises _DeltaExpired
+        instead of returning None like any other failure.
+        """
         if not await self._ensure_token() or not self._client:
             return None
 
@@ -425,23 +747,34 @@ class MicrosoftGraphClient:
 
         while retries <= max_retries:
             try:
-                resp = await self._client.get(url, params=params if retries == 0 else None)
+                await self._pace.acquire()
+                resp = await self._client.get(url, params=params, headers=headers)
                 if resp.status_code == 200:
-                    return resp.json()
+                    return json.loads(resp.content)
                 elif resp.status_code == 429:
                     # Rate limited — respect Retry-After header
-                    retry_after = int(resp.headers.get("Retry-After", "5"))
+                    retry_after = _retry_delay(resp)
                     log.warning("ms_graph_rate_limited", endpoint=endpoint, retry_after=retry_after)
                     await asyncio.sleep(retry_after)
                     retries += 1
                     continue
                 elif resp.status_code == 401:
-                    if await self._refresh_token():
-                        self._client.headers.update(self._auth_headers())
+                    if await self._refresh_token(rejected=_sent_token(resp)):
+                        self._sync_auth_header()
                         retries += 1
                         continue
+                elif delta and _is_delta_expired(resp):
+                    raise _DeltaExpired(endpoint)
                 log.warning("ms_graph_get_error", endpoint=endpoint, status=resp.status_code)
                 return None
+            except _DeltaExpired:
+                raise
+            except (httpx.ReadError, httpx.RemoteProtocolError) as e:
+                # A pooled connection dropped under load; retry on a fresh one
+                log.warning("ms_graph_transport_retry", endpoint=endpoint, error=str(e))
+                retries += 1
+                await asyncio.sleep(0.5 * retries)
+                continue
             except Exception as e:
                 log.error("ms_graph_request_error", endpoint=endpoint, error=str(e))
                 return None
@@ -451,8 +784,39 @@ class MicrosoftGraphClient:
         self, endpoint: str, params: dict | None = None, max_pages: int = 5,
     ) -> list[dict]:
         """Auto-paginate through a Graph API collection following @odata.nextLink."""
+        return await self._collect_pages(await self._get(endpoint, params), max_pages)
+
+    async def _paginate_parallel(
+        self, endpoint: str, params: dict, max_pages: int = 5,
+    ) -> list[dict]:
+        """Paginate a $skip-capable collection with the later pages fetched at once.
+
+        The first page asks for @odata.count; from it and $top the remaining
+        pages are requested concurrently by $skip. Collections that don't
+        report a count fall back to following @odata.nextLink.
+        """
+        first = await self._get(
+            endpoint, {**params, "$count": "true"}, headers={"ConsistencyLevel": "eventual"},
+        )
+        total = first.get("@odata.count") if first else None
+        if total is None or max_pages <= 1:
+            return await self._collect_pages(first, max_pages)
+
+        top = int(params.get("$top", "10"))
+        pages = min(max_pages, -(-total // top))
+        rest = await asyncio.gather(*(
+            self._get(endpoint, {**params, "$skip": str(top * n)})
+            for n in range(1, pages)
+        ))
+        results = list(first.get("value", []))
+        for page in rest:
+            if page:
+                results.extend(page.get("value", []))
+        return results
+
+    async def _collect_pages(self, data: dict | None, max_pages: int = 5) -> list[dict]:
+        """Gather a collection's items, starting from an already fetched first page."""
         results: list[dict] = []
-        data = await self._get(endpoint, params)
         if not data:
             return results
 
@@ -470,14 +834,92 @@ class MicrosoftGraphClient:
 
         return results
 
+    @staticmethod
+    def _batch_url(endpoint: str, params: dict | None) -> str:
+        """Relative URL for a $batch sub-request (path under GRAPH_BASE + query)."""
+        if not params:
+            return endpoint
+        return f"{endpoint}?{urlencode(params, quote_via=quote, safe=_QUERY_SAFE)}"
+
+    async def _batch(self, requests: dict[str, str]) -> dict[str, dict | None]:
+        """GET several Graph resources in one JSON $batch round trip.
+
+        Takes sub-request id → relative URL and returns id → response body,
+        None for any sub-request that failed. Throttled (429) sub-requests are
+        re-batched on their own after the longest Retry-After they carried.
+        """
+        results: dict[str, dict | None] = dict.fromkeys(requests)
+        if len(requests) > GRAPH_BATCH_LIMIT:
+            items = list(requests.items())
+            chunks = await asyncio.gather(*(
+                self._batch(dict(items[n:n + GRAPH_BATCH_LIMIT]))
+                for n in range(0, len(items), GRAPH_BATCH_LIMIT)
+            ))
+            for chunk in chunks:
+                results.update(chunk)
+            return results
+
+        pending = dict(requests)
+        retries = 0
+        max_retries = 3
+        while pending and retries <= max_retries:
+            if not await self._ensure_token() or not self._client:
+                break
+            try:
+                await self._pace.acquire(len(pending))
+                resp = await self._client.post(
+                    f"{GRAPH_BASE}/$batch",
+                    json={"requests": [
+                        {"id": rid, "method": "GET", "url": url} for rid, url in pending.items()
+                    ]},
+                )
+            except Exception as e:
+                log.error("ms_graph_request_error", endpoint="$batch", error=str(e))
+                break
+            if resp.status_code == 429:
+                retry_after = _retry_delay(resp)
+                log.warning("ms_graph_rate_limited", endpoint="$batch", retry_after=retry_after)
+                await asyncio.sleep(retry_after)
+                retries += 1
+                continue
+            if resp.status_code == 401 and await self._refresh_token(rejected=_sent_token(resp)):
+                self._sync_auth_header()
+                retries += 1
+                continue
+            if resp.status_code != 200:
+                log.warning("ms_graph_get_error", endpoint="$batch", status=resp.status_code)
+                break
+
+            throttled: dict[str, str] = {}
+            retry_after = 0.0
+            for item in json.loads(resp.content).get("responses", []):
+                rid = item.get("id")
+                status = item.get("status")
+                if rid not in pending:
+                    continue
+                if status == 200:
+                    results[rid] = item.get("body")
+                elif status == 429:
+                    throttled[rid] = pending[rid]
+                    retry_after = max(retry_after, _retry_delay(item.get("headers") or {}))
+                else:
+                    log.warning("ms_graph_get_error", endpoint=pending[rid], status=status)
+            pending = throttled
+            if pending and retries < max_retries:
+                log.warning("ms_graph_rate_limited", endpoint="$batch", retry_after=retry_after, requests=len(pending))
+                await asyncio.sleep(retry_after)
+            retries += 1
+        return results
+
     async def _post(self, endpoint: str, data: dict) -> dict | None:
         """Make a POST request to Microsoft Graph API."""
         if not await self._ensure_token() or not self._client:
             return None
         try:
+            await self._pace.acquire()
             resp = await self._client.post(f"{GRAPH_BASE}{endpoint}", json=data)
             if resp.status_code in (200, 201, 202):
-                return resp.json() if resp.text else {"status": "ok"}
+                return json.loads(resp.content) if resp.content else {"status": "ok"}
             log.warning("ms_graph_post_error", endpoint=endpoint, status=resp.status_code)
             return None
         except Exception as e:
@@ -486,73 +928,165 @@ class MicrosoftGraphClient:
 
     # ── Mail ─────────────────────────────────────────────────────────────
 
-    async def get_recent_emails(self, count: int = 20, folder: str = "inbox") -> list[dict]:
-        """Get recent emails from the specified folder."""
-        data = await self._get(
-            f"{self._me}/mailFolders/{folder}/messages",
-            params={
-                "$top": str(count),
-                "$orderby": "receivedDateTime desc",
-                "$select": "id,subject,from,toRecipients,receivedDateTime,bodyPreview,isRead,importance",
-            },
-        )
+    def _recent_emails_query(
+        self, count: int, folder: str, unread_only: bool = False,
+    ) -> tuple[str, dict]:
+        params = {**_EMAIL_LIST_PARAMS, "$top": str(count)}
+        if unread_only:
+            # Graph wants the $orderby property leading the $filter
+            params["$filter"] = "receivedDateTime ge 1900-01-01T00:00:00Z and isRead eq false"
+        return f"{self._me}/mailFolders/{folder}/messages", params
+
+    async def get_recent_emails(
+        self, count: int = 20, folder: str = "inbox", unread_only: bool = False,
+    ) -> list[dict]:
+        """Get recent emails from the specified folder.
+
+        The inbox is served from a buffer kept current by delta query, so
+        repeat calls only transfer what changed since the last one.
+        """
+        if folder == "inbox" and count <= INBOX_BUFFER_SIZE and await self._sync_inbox():
+            rows = sorted(self._inbox.values(), key=lambda r: r["received"], reverse=True)
+            if unread_only:
+                rows = [r for r in rows if not r["is_read"]]
+            # Too few buffered rows may just mean older matches were trimmed
+            if len(rows) >= count:
+                return rows[:count]
+        data = await self._get(*self._recent_emails_query(count, folder, unread_only))
         if not data:
             return []
-        return [
-            {
-                "id": msg["id"],
-                "subject": msg.get("subject", ""),
-                "from": msg.get("from", {}).get("emailAddress", {}).get("name", ""),
-                "from_email": msg.get("from", {}).get("emailAddress", {}).get("address", ""),
-                "to": [r.get("emailAddress", {}).get("name", "") for r in msg.get("toRecipients", [])],
-                "received": msg.get("receivedDateTime", ""),
-                "preview": msg.get("bodyPreview", ""),
-                "is_read": msg.get("isRead", False),
-                "importance": msg.get("importance", "normal"),
-            }
-            for msg in data.get("value", [])
-        ]
+        return [_email_row(msg) for msg in data.get("value", [])]
+
+    def _load_delta_links(self) -> None:
+        if self._delta_loaded:
+            return
+        self._delta_loaded = True
+        if DELTA_FILE.exists():
+            try:
+                self._delta_link = json.loads(DELTA_FILE.read_bytes())
+            except Exception as e:
+                log.warning("ms_graph_delta_load_error", error=str(e))
+
+    def _save_delta_links(self) -> None:
+        try:
+            _write_atomic(DELTA_FILE, json.dumps(self._delta_link))
+        except Exception as e:
+            log.warning("ms_graph_delta_save_error", error=str(e))
+
+    async def _sync_inbox(self) -> bool:
+        """Bring the inbox buffer up to date; False if Graph couldn't be reached."""
+        self._load_delta_links()
+        if not self._inbox:
+            # A fresh process has no buffer to apply changes to: seed it with
+            # the newest messages, then replay the saved link on top.
+            seed = await self._get(*self._recent_emails_query(INBOX_BUFFER_SIZE, "inbox"))
+            if seed is None:
+                return False
+            for msg in seed.get("value", []):
+                self._inbox[msg["id"]] = _email_row(msg)
+
+        link = self._delta_link.get("inbox")
+        if link:
+            try:
+                data = await self._get(link, delta=True)
+            except _DeltaExpired:
+                # Graph dropped the sync state behind the link: start over now
+                log.info("ms_graph_delta_expired", folder="inbox")
+                self._delta_link.pop("inbox", None)
+                link = None
+        if not link:
+            # A new round only needs to cover what the buffer can hold, not
+            # the whole mailbox: start it at the oldest buffered message.
+            params = {"$select": _EMAIL_LIST_PARAMS["$select"]}
+            oldest = min((r["received"] for r in self._inbox.values() if r["received"]), default="")
+            if oldest:
+                params["$filter"] = f"receivedDateTime ge {oldest}"
+            data = await self._get(
+                f"{self._me}/mailFolders/inbox/messages/delta",
+                params,
+                headers={"Prefer": "odata.maxpagesize=50"},
+            )
+        if data is None:
+            # Unreachable or a transient error: keep the link for next time
+            return bool(self._inbox)
+
+        changed = 0
+        for page in range(DELTA_MAX_PAGES):
+            for msg in data.get("value", []):
+                if "@removed" in msg:
+                    self._inbox.pop(msg["id"], None)
+                else:
+                    self._inbox[msg["id"]] = _email_row(msg)
+                changed += 1
+            link = data.get("@odata.deltaLink") or data.get("@odata.nextLink")
+            if link:
+                self._delta_link["inbox"] = link
+            if "@odata.nextLink" not in data or page == DELTA_MAX_PAGES - 1:
+                break
+            try:
+                data = await self._get(data["@odata.nextLink"], delta=True)
+            except _DeltaExpired:
+                self._delta_link.pop("inbox", None)
+                break
+            if data is None:
+                break
+        self._save_delta_links()
+
+        if len(self._inbox) > INBOX_BUFFER_SIZE:
+            newest = sorted(self._inbox.values(), key=lambda r: r["received"], reverse=True)
+            self._inbox = {r["id"]: r for r in newest[:INBOX_BUFFER_SIZE]}
+        log.debug("ms_graph_inbox_delta", changed=changed, buffered=len(self._inbox))
+        return True
+
+    async def get_email_body(
+        self, message_id: str, as_text: bool = True, max_chars: int | None = None,
+    ) -> dict | None:
+        """Get the body of an email (cached for EMAIL_BODY_TTL).
+
+        Bodies come back as plain text unless as_text=False asks for the
+        original HTML; max_chars clips the returned body.
+        """
+        key = (message_id, as_text)
+        cached = self._body_cache.get(key)
+        if cached and time.monotonic() < cached[0]:
+            self._body_cache.move_to_end(key)
+            return _clip_body(cached[1], max_chars)
 
-    async def get_email_body(self, message_id: str) -> dict | None:
-        """Get the full body of an email."""
         data = await self._get(
             f"{self._me}/messages/{message_id}",
-            params={"$select": "id,subject,from,toRecipients,body,receivedDateTime,conversationId"},
+            params=_EMAIL_BODY_PARAMS,
+            headers=_TEXT_BODY_HEADERS if as_text else None,
         )
         if not data:
             return None
-        return {
+        row = {
             "id": data["id"],
             "subject": data.get("subject", ""),
-            "from": data.get("from", {}).get("emailAddress", {}).get("name", ""),
-            "body": data.get("body", {}).get("content", ""),
-            "body_type": data.get("body", {}).get("contentType", "text"),
+            "from": _email_address(data, "from").get("name", ""),
+            "body": data.get("body", _ABSENT).get("content", ""),
+            "body_type": data.get("body", _ABSENT).get("contentType", "text"),
             "received": data.get("receivedDateTime", ""),
             "conversation_id": data.get("conversationId", ""),
         }
+        self._body_cache[key] = (time.monotonic() + EMAIL_BODY_TTL, row)
+        self._body_cache.move_to_end(key)
+        if len(self._body_cache) > EMAIL_BODY_CACHE_SIZE:
+            self._body_cache.popitem(last=False)
+        return _clip_body(row, max_chars)
+
+    def _search_emails_query(self, query: str, count: int) -> tuple[str, dict]:
+        return f"{self._me}/messages", {
+            "$search": f'"{query}"',
+            "$top": str(count),
+            "$select": _EMAIL_SEARCH_SELECT,
+        }
 
     async def search_emails(self, query: str, count: int = 10) -> list[dict]:
         """Search emails by subject, body, or sender."""
-        data = await self._get(
-            f"{self._me}/messages",
-            params={
-                "$search": f'"{query}"',
-                "$top": str(count),
-                "$select": "id,subject,from,receivedDateTime,bodyPreview",
-            },
-        )
+        data = await self._get(*self._search_emails_query(query, count))
         if not data:
             return []
-        return [
-            {
-                "id": msg["id"],
-                "subject": msg.get("subject", ""),
-                "from": msg.get("from", {}).get("emailAddress", {}).get("name", ""),
-                "received": msg.get("receivedDateTime", ""),
-                "preview": msg.get("bodyPreview", ""),
-            }
-            for msg in data.get("value", [])
-        ]
+        return [_email_search_row(msg) for msg in data.get("value", [])]
 
     async def send_email(
         self,
@@ -595,115 +1129,69 @@ class MicrosoftGraphClient:
 
     # ── Calendar ─────────────────────────────────────────────────────────
 
+    def _today_events_query(self) -> tuple[str, dict]:
+        global _today_window
+        today = time.strftime("%Y-%m-%d", time.gmtime())
+        if _today_window[0] != today:
+            _today_window = (today, f"{today}T00:00:00Z", f"{today}T23:59:59Z")
+        return f"{self._me}/calendarview", {
+            "startDateTime": _today_window[1],
+            "endDateTime": _today_window[2],
+            **_TODAY_EVENT_PARAMS,
+        }
+
     async def get_today_events(self) -> list[dict]:
         """Get today's calendar events."""
-        now = datetime.utcnow()
-        start = now.replace(hour=0, minute=0, second=0).isoformat() + "Z"
-        end = now.replace(hour=23, minute=59, second=59).isoformat() + "Z"
-
-        data = await self._get(
-            f"{self._me}/calendarview",
-            params={
-                "startDateTime": start,
-                "endDateTime": end,
-                "$select": "id,subject,start,end,location,organizer,attendees,isAllDay",
-                "$orderby": "start/dateTime",
-            },
-        )
+        data = await self._get(*self._today_events_query())
         if not data:
             return []
-        return [
-            {
-                "id": evt["id"],
-                "subject": evt.get("subject", ""),
-                "start": evt.get("start", {}).get("dateTime", ""),
-                "end": evt.get("end", {}).get("dateTime", ""),
-                "location": evt.get("location", {}).get("displayName", ""),
-                "organizer": evt.get("organizer", {}).get("emailAddress", {}).get("name", ""),
-                "attendees": [
-                    a.get("emailAddress", {}).get("name", "")
-                    for a in evt.get("attendees", [])
-                ],
-                "is_all_day": evt.get("isAllDay", False),
-            }
-            for evt in data.get("value", [])
-        ]
+        return [_today_event_row(evt) for evt in data.get("value", [])]
 
-    async def get_upcoming_events(self, days: int = 7) -> list[dict]:
-        """Get upcoming calendar events for the next N days."""
+    def _upcoming_events_query(self, days: int) -> tuple[str, dict]:
         now = datetime.utcnow()
-        start = now.isoformat() + "Z"
-        end = (now + timedelta(days=days)).isoformat() + "Z"
+        return f"{self._me}/calendarview", {
+            "startDateTime": now.isoformat() + "Z",
+            "endDateTime": (now + timedelta(days=days)).isoformat() + "Z",
+            **_EVENT_PARAMS,
+            "$top": "50",
+        }
 
-        data = await self._get(
-            f"{self._me}/calendarview",
-            params={
-                "startDateTime": start,
-                "endDateTime": end,
-                "$select": "id,subject,start,end,location,organizer",
-                "$orderby": "start/dateTime",
-                "$top": "50",
-            },
-        )
+    def _shared_events_query(self, days: int) -> tuple[str, dict]:
+        """Upcoming calendarView (recurring occurrences included) with attendees."""
+        endpoint, params = self._upcoming_events_query(days)
+        params["$select"] += ",attendees"
+        return endpoint, params
+
+    async def get_upcoming_events(self, days: int = 7) -> list[dict]:
+        """Get upcoming calendar events for the next N days."""
+        data = await self._get(*self._upcoming_events_query(days))
         if not data:
             return []
-        return [
-            {
-                "id": evt["id"],
-                "subject": evt.get("subject", ""),
-                "start": evt.get("start", {}).get("dateTime", ""),
-                "end": evt.get("end", {}).get("dateTime", ""),
-                "organizer": evt.get("organizer", {}).get("emailAddress", {}).get("name", ""),
-            }
-            for evt in data.get("value", [])
-        ]
+        return [_upcoming_event_row(evt) for evt in data.get("value", [])]
 
     # ── Contacts ──────────────────────────────────────────────────────────
 
     async def get_contacts(self, count: int = 100) -> list[dict]:
         """Get Outlook contacts (structured data — no LLM needed for vault merge)."""
-        results = await self._paginate(
+        results = await self._paginate_parallel(
             f"{self._me}/contacts",
-            params={
-                "$top": str(min(count, 100)),
-                "$select": "id,displayName,givenName,surname,emailAddresses,businessPhones,mobilePhone,companyName,jobTitle,department",
-                "$orderby": "displayName",
-            },
+            params={**_CONTACT_PARAMS, "$top": str(min(count, 100))},
             max_pages=max(1, count // 100),
         )
-        return [
-            {
-                "id": c.get("id", ""),
-                "name": c.get("displayName", ""),
-                "email": (c.get("emailAddresses") or [{}])[0].get("address", "") if c.get("emailAddresses") else "",
-                "company": c.get("companyName", ""),
-                "title": c.get("jobTitle", ""),
-                "department": c.get("department", ""),
-                "phone": (c.get("businessPhones") or [""])[0] or c.get("mobilePhone", ""),
-            }
-            for c in results if c.get("displayName")
-        ]
+        return [_contact_row(c) for c in results if c.get("displayName")]
+
+    def _search_contacts_query(self, query: str) -> tuple[str, dict]:
+        safe_query = query.replace("'", "''")
+        return f"{self._me}/contacts", {
+            "$filter": f"startswith(displayName,'{safe_query}')",
+            "$top": "25",
+            "$select": _CONTACT_SEARCH_SELECT,
+        }
 
     async def search_contacts(self, query: str) -> list[dict]:
         """Search contacts by name prefix."""
-        safe_query = query.replace("'", "''")
-        results = await self._paginate(
-            f"{self._me}/contacts",
-            params={
-                "$filter": f"startswith(displayName,'{safe_query}')",
-                "$top": "25",
-                "$select": "id,displayName,emailAddresses,companyName,jobTitle",
-            },
-        )
-        return [
-            {
-                "name": c.get("displayName", ""),
-                "email": (c.get("emailAddresses") or [{}])[0].get("address", "") if c.get("emailAddresses") else "",
-                "company": c.get("companyName", ""),
-                "title": c.get("jobTitle", ""),
-            }
-            for c in results if c.get("displayName")
-        ]
+        results = await self._paginate(*self._search_contacts_query(query))
+        return [_contact_search_row(c) for c in results if c.get("displayName")]
 
     # ── Tasks (Microsoft To Do) ──────────────────────────────────────────
 
@@ -715,42 +1203,67 @@ class MicrosoftGraphClient:
             for tl in results
         ]
 
+    def _tasks_query(self, list_id: str, status: str, count: int) -> tuple[str, dict]:
+        params = {"$top": str(count)}
+        if status != "all":
+            params["$filter"] = f"status eq '{status}'"
+        return f"{self._me}/todo/lists/{list_id}/tasks", params
+
+    def _task_lists_query(self, status: str, count: int) -> tuple[str, dict]:
+        """All To Do lists with their tasks expanded inline."""
+        options = f"$top={count}"
+        if status != "all":
+            options += f";$filter=status eq '{status}'"
+        return f"{self._me}/todo/lists", {"$expand": f"tasks({options})"}
+
+    async def _expanded_tasks(self, first_page: dict | None) -> list[dict] | None:
+        """Tasks from a _task_lists_query response, tagged with their list name.
+
+        None when the expansion didn't come back (request refused, or lists
+        without a tasks array), so the caller can fetch per list instead.
+        """
+        if first_page is None:
+            return None
+        lists = await self._collect_pages(first_page)
+        if not all("tasks" in tl for tl in lists):
+            return None
+        results: list[dict] = []
+        for tl in lists:
+            for t in tl["tasks"]:
+                t["_list_name"] = tl.get("displayName", "")
+                results.append(t)
+        return results
+
     async def get_tasks(
         self, status: str = "all", count: int = 50, list_id: str | None = None,
     ) -> list[dict]:
         """Get tasks from Microsoft To Do. Status: notStarted, inProgress, completed, all."""
         if list_id:
-            params: dict[str, str] = {"$top": str(count)}
-            if status != "all":
-                params["$filter"] = f"status eq '{status}'"
-            results = await self._paginate(f"{self._me}/todo/lists/{list_id}/tasks", params)
-        else:
-            # Fetch from all lists
+            results = await self._paginate(*self._tasks_query(list_id, status, count))
+        elif (results := await self._expanded_tasks(
+            await self._get(*self._task_lists_query(status, count))
+        )) is None:
+            # Fetch from all lists concurrently, a few at a time to stay
+            # clear of Graph's per-user throttling
             lists = await self.get_task_lists()
+            slots = asyncio.Semaphore(TASK_LIST_CONCURRENCY)
+
+            async def fetch(list_id: str) -> list[dict]:
+                async with slots:
+                    return await self._paginate(*self._tasks_query(list_id, status, count))
+
+            pages = await asyncio.gather(
+                *(fetch(tl["id"]) for tl in lists), return_exceptions=True,
+            )
             results = []
-            for tl in lists:
-                params = {"$top": str(count)}
-                if status != "all":
-                    params["$filter"] = f"status eq '{status}'"
-                try:
-                    tasks = await self._paginate(f"{self._me}/todo/lists/{tl['id']}/tasks", params)
-                    for t in tasks:
-                        t["_list_name"] = tl["name"]
-                    results.extend(tasks)
-                except Exception:
-                    pass
+            for tl, tasks in zip(lists, pages):
+                if isinstance(tasks, BaseException):
+                    continue
+                for t in tasks:
+                    t["_list_name"] = tl["name"]
+                results.extend(tasks)
 
-        return [
-            {
-                "id": t.get("id", ""),
-                "title": t.get("title", ""),
-                "status": t.get("status", ""),
-                "importance": t.get("importance", "normal"),
-                "due": (t.get("dueDateTime") or {}).get("dateTime", "")[:10] if t.get("dueDateTime") else "",
-                "list": t.get("_list_name", ""),
-            }
-            for t in results[:count] if t.get("title")
-        ]
+        return _task_rows(results, count)
 
     async def create_task(
         self, title: str, list_id: str | None = None,
@@ -773,45 +1286,96 @@ class MicrosoftGraphClient:
 
     # ── Composite Queries ─────────────────────────────────────────────────
 
-    async def get_daily_digest(self) -> dict:
-        """Daily digest: unread emails + today's events + pending tasks in parallel."""
-        emails_task = asyncio.create_task(self.get_recent_emails(count=50, folder="inbox"))
-        events_task = asyncio.create_task(self.get_today_events())
-        tasks_task = asyncio.create_task(self.get_tasks(status="notStarted", count=25))
+    async def get_sync_snapshot(
+        self, contacts: int = 200, emails: int = 20, days: int = 7, tasks: int = 50,
+    ) -> dict[str, list[dict] | None]:
+        """Contacts, recent inbox mail, upcoming events and pending tasks in one $batch.
 
-        emails = await emails_task
-        events = await events_task
-        tasks = await tasks_task
+        Rows match get_contacts / get_recent_emails / get_upcoming_events /
+        get_tasks. A section whose sub-request failed is None, so the caller
+        can fetch it on its own.
+        """
+        contact_params = {**_CONTACT_PARAMS, "$top": str(min(contacts, 100))}
+        bodies = await self._batch({
+            "contacts": self._batch_url(f"{self._me}/contacts", contact_params),
+            "emails": self._batch_url(*self._recent_emails_query(emails, "inbox")),
+            "events": self._batch_url(*self._upcoming_events_query(days)),
+            "tasks": self._batch_url(*self._task_lists_query("notStarted", tasks)),
+        })
+
+        snapshot: dict[str, list[dict] | None] = dict.fromkeys(bodies)
+        if bodies["contacts"] is not None:
+            pages = await self._collect_pages(bodies["contacts"], max(1, contacts // 100))
+            snapshot["contacts"] = [_contact_row(c) for c in pages if c.get("displayName")]
+        if bodies["emails"] is not None:
+            snapshot["emails"] = [_email_row(m) for m in bodies["emails"].get("value", [])]
+        if bodies["events"] is not None:
+            snapshot["events"] = [_upcoming_event_row(e) for e in bodies["events"].get("value", [])]
+        expanded = await self._expanded_tasks(bodies["tasks"])
+        if expanded is not None:
+            snapshot["tasks"] = _task_rows(expanded, tasks)
+        return snapshot
 
-        # Filter to unread only
-        unread = [e for e in emails if not e.get("is_read")]
+    async def get_daily_digest(self) -> dict:
+        """Daily digest: unread emails + today's events + pending tasks, batched."""
+        # Up to 50 unread so the summary's count isn't capped at the 15 shown
+        first = await self._batch({
+            "emails": self._batch_url(*self._recent_emails_query(50, "inbox", unread_only=True)),
+            "events": self._batch_url(*self._today_events_query()),
+            "lists": self._batch_url(*self._task_lists_query("notStarted", 25)),
+        })
+        emails = [_email_row(m) for m in (first["emails"] or {}).get("value", [])]
+        events = [_today_event_row(e) for e in (first["events"] or {}).get("value", [])]
+
+        results = await self._expanded_tasks(first["lists"])
+        if results is None:
+            # No inline tasks: fetch each list's own, which needs the list ids first
+            lists = [
+                {"id": tl.get("id", ""), "name": tl.get("displayName", "")}
+                for tl in await self._paginate(f"{self._me}/todo/lists")
+            ]
+            task_pages = await self._batch({
+                str(n): self._batch_url(*self._tasks_query(tl["id"], "notStarted", 25))
+                for n, tl in enumerate(lists)
+            })
+            results = []
+            for n, tl in enumerate(lists):
+                for t in await self._collect_pages(task_pages[str(n)]):
+                    t["_list_name"] = tl["name"]
+                    results.append(t)
+        tasks = _task_rows(results, 25)
 
         return {
-            "summary": f"{len(unread)} unread emails, {len(events)} events today, {len(tasks)} pending tasks",
-            "unread_emails": unread[:15],
+            "summary": f"{len(emails)} unread emails, {len(events)} events today, {len(tasks)} pending tasks",
+            "unread_emails": emails[:15],
             "today_events": events,
             "pending_tasks": tasks,
         }
 
     async def get_person_context(self, name_or_email: str) -> dict:
-        """Gather all context about a person: contact + emails + shared events."""
-        contacts_task = asyncio.create_task(self.search_contacts(name_or_email))
-        emails_task = asyncio.create_task(self.search_emails(name_or_email, count=10))
-        events_task = asyncio.create_task(self.get_upcoming_events(days=30))
+        """Gather all context about a person: contact + emails + shared events, batched.
 
-        contacts = await contacts_task
-        emails = await emails_task
-        events = await events_task
+        Shared events come from calendarView, so occurrences of recurring
+        meetings count, and are matched locally on the name or address
+        given plus the address on their contact card.
+        """
+        bodies = await self._batch({
+            "contacts": self._batch_url(*self._search_contacts_query(name_or_email)),
+            "emails": self._batch_url(*self._search_emails_query(name_or_email, 10)),
+            "events": self._batch_url(*self._shared_events_query(30)),
+        })
+        contacts = [
+            _contact_search_row(c)
+            for c in (bodies["contacts"] or {}).get("value", [])
+            if c.get("displayName")
+        ]
+        emails = [_email_search_row(m) for m in (bodies["emails"] or {}).get("value", [])]
 
         contact = contacts[0] if contacts else None
-
-        # Filter events to those with the person as attendee
-        search_lower = name_or_email.lower()
-        shared = [
-            e for e in events
-            if any(search_lower in a.lower() for a in e.get("attendees", []))
-            or search_lower in e.get("organizer", "").lower()
-        ]
+        shared = _shared_event_rows(
+            (bodies["events"] or {}).get("value", []),
+            (name_or_email, contact["email"] if contact else ""),
+        )
 
         return {
             "contact": contact,
@@ -822,8 +1386,14 @@ class MicrosoftGraphClient:
     # ── User Profile ─────────────────────────────────────────────────────
 
     async def get_me(self) -> dict | None:
-        """Get the authenticated user's profile."""
-        return await self._get(self._me)
+        """Get the authenticated user's profile (cached for PROFILE_TTL)."""
+        if self._profile and time.monotonic() < self._profile[0]:
+            return dict(self._profile[1])
+        me = await self._get(self._me)
+        if me:
+            self._profile = (time.monotonic() + PROFILE_TTL, me)
+            return dict(me)
+        return me
 
     # ── Status ───────────────────────────────────────────────────────────
 
@@ -837,10 +1407,13 @@ class MicrosoftGraphClient:
         }
 
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP clients."""
         if self._client:
             await self._client.aclose()
             self._client = None
+        if self._auth_client:
+            await self._auth_client.aclose()
+            self._auth_client = None
 
 
 # Singleton
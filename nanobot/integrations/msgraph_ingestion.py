@@ -18,32 +18,59 @@ from datetime import datetime
 import structlog
 
 from nanobot.integrations.microsoft_graph import ms_graph
-from nanobot.knowledge.vault import vault
+from nanobot.knowledge.vault import NoteSpec, _note_path, _slugify, vault
 
 log = structlog.get_logger()
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_UNSAFE_NAME_RE = re.compile(r"[^\w\s\-.]")
+
 
 def _strip_html(html: str) -> str:
     """Remove HTML tags and collapse whitespace."""
-    text = re.sub(r"<[^>]+>", " ", html)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WS_RE.sub(" ", _TAG_RE.sub(" ", html)).strip()
     return text[:2000]  # cap for vault notes
 
 
 def _safe_name(name: str) -> str:
     """Sanitize a name for use as a vault note title."""
-    return re.sub(r"[^\w\s\-.]", "", name).strip()[:80] or "Unknown"
+    return _UNSAFE_NAME_RE.sub("", name).strip()[:80] or "Unknown"
+
+
+def _append_to_daily(section: str, sources: list[dict] | None = None) -> None:
+    """Append a section to today's daily note, creating the note if needed."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    daily_name = f"Daily - {today}"
+    if _note_path("daily", daily_name).exists():
+        vault.update_note("daily", daily_name, append_content=section)
+    else:
+        vault.create_note(
+            "daily", daily_name,
+            content=section,
+            metadata={"source": "microsoft_graph", "date": today},
+            sources=sources,
+        )
 
 
-async def ingest_contacts(count: int = 200) -> dict:
+def _email_sources() -> list[dict]:
+    return [{"type": "outlook_email", "synced": datetime.now().isoformat()}]
+
+
+async def ingest_contacts(count: int = 200, contacts: list[dict] | None = None) -> dict:
     """Sync Outlook contacts into vault/people/ notes.
 
     Contacts are structured data — no LLM needed.
     Creates or updates a person note for each contact with email, company, title.
+    Pass already fetched contacts to skip the Graph call.
     """
-    contacts = await ms_graph.get_contacts(count=count)
-    created = 0
+    if contacts is None:
+        contacts = await ms_graph.get_contacts(count=count)
     updated = 0
+    existing = vault.note_slugs("people")
+    to_create: list[NoteSpec] = []
+    to_update: list[tuple[str, dict]] = []
+    synced = datetime.now().isoformat()
 
     for c in contacts:
         name = _safe_name(c.get("name", ""))
@@ -83,39 +110,47 @@ async def ingest_contacts(count: int = 200) -> dict:
             metadata["email"] = email
 
         # Check if note exists — update if so, create if not
-        from nanobot.knowledge.vault import _note_path
-        path = _note_path("people", name)
-        if path.exists():
-            vault.update_note(
-                "people", name,
-                update_metadata=metadata,
-                add_source={"type": "outlook_contact", "synced": datetime.now().isoformat()},
-            )
+        slug = _slugify(name)
+        if slug in existing:
+            to_update.append((name, metadata))
             updated += 1
         else:
-            vault.create_note(
-                "people", name,
+            to_create.append(NoteSpec(
+                name,
                 content=content,
                 metadata=metadata,
                 backlinks=backlinks,
-                sources=[{"type": "outlook_contact", "synced": datetime.now().isoformat()}],
+                sources=[{"type": "outlook_contact", "synced": synced}],
                 confidence=0.95,
-            )
-            created += 1
+            ))
+            existing.add(slug)
+
+    # New notes first, so a name repeated within this sync updates its note
+    vault.create_notes_batch("people", to_create)
+    for name, metadata in to_update:
+        vault.update_note(
+            "people", name,
+            update_metadata=metadata,
+            add_source={"type": "outlook_contact", "synced": synced},
+        )
+    created = len(to_create)
 
     log.info("contacts_ingested", total=len(contacts), created=created, updated=updated)
     return {"total": len(contacts), "created": created, "updated": updated}
 
 
-async def ingest_emails(count: int = 20) -> dict:
+async def ingest_emails(
+    count: int = 20, emails: list[dict] | None = None, daily: dict[str, str] | None = None,
+) -> dict:
     """Ingest recent emails into vault/daily/ notes.
 
     Appends email summaries to today's daily note and creates person
-    notes for new senders.
+    notes for new senders. Given a `daily` dict, the summary section is
+    left there under "emails" for the caller to write instead.
     """
-    emails = await ms_graph.get_recent_emails(count=count)
+    if emails is None:
+        emails = await ms_graph.get_recent_emails(count=count)
     today = datetime.now().strftime("%Y-%m-%d")
-    daily_name = f"Daily - {today}"
 
     people_seen = set()
     email_summaries = []
@@ -137,45 +172,43 @@ async def ingest_emails(count: int = 20) -> dict:
     # Append to daily note
     if email_summaries:
         email_section = "\n## Email Summary\n\n" + "\n".join(email_summaries[:15])
-
-        from nanobot.knowledge.vault import _note_path
-        daily_path = _note_path("daily", daily_name)
-        if daily_path.exists():
-            vault.update_note("daily", daily_name, append_content=email_section)
+        if daily is None:
+            _append_to_daily(email_section, _email_sources())
         else:
-            vault.create_note(
-                "daily", daily_name,
-                content=email_section,
-                metadata={"source": "microsoft_graph", "date": today},
-                sources=[{"type": "outlook_email", "synced": datetime.now().isoformat()}],
-            )
+            daily["emails"] = email_section
 
     # Create person notes for new senders
-    people_created = 0
+    existing = vault.note_slugs("people") if people_seen else set()
+    new_people: list[NoteSpec] = []
     for sender in people_seen:
         safe = _safe_name(sender)
-        path = _note_path("people", safe)
-        if not path.exists():
-            vault.create_note(
-                "people", safe,
+        slug = _slugify(safe)
+        if slug not in existing:
+            new_people.append(NoteSpec(
+                safe,
                 content=f"First seen in email on {today}.",
                 metadata={"source": "microsoft_graph"},
                 sources=[{"type": "outlook_email", "first_seen": today}],
                 confidence=0.6,
-            )
-            people_created += 1
+            ))
+            existing.add(slug)
+    vault.create_notes_batch("people", new_people)
+    people_created = len(new_people)
 
     log.info("emails_ingested", total=len(emails), people_created=people_created)
     return {"total": len(emails), "people_created": people_created}
 
 
-async def ingest_calendar(days: int = 7) -> dict:
+async def ingest_calendar(days: int = 7, events: list[dict] | None = None) -> dict:
     """Ingest upcoming calendar events into vault/meetings/ notes.
 
     Creates a meeting note for each event with attendees linked as backlinks.
     """
-    events = await ms_graph.get_upcoming_events(days=days)
-    created = 0
+    if events is None:
+        events = await ms_graph.get_upcoming_events(days=days)
+    existing = vault.note_slugs("meetings")
+    to_create: list[NoteSpec] = []
+    synced = datetime.now().isoformat()
 
     for evt in events:
         subject = _safe_name(evt.get("subject", "Untitled Meeting"))
@@ -202,31 +235,35 @@ async def ingest_calendar(days: int = 7) -> dict:
         # Use date + subject as note name to avoid collisions
         note_name = f"{start[:10]} {subject}" if start else subject
 
-        from nanobot.knowledge.vault import _note_path
-        path = _note_path("meetings", note_name)
-        if not path.exists():
-            vault.create_note(
-                "meetings", note_name,
+        slug = _slugify(note_name)
+        if slug not in existing:
+            to_create.append(NoteSpec(
+                note_name,
                 content=content,
                 metadata={"source": "microsoft_graph", "ms_event_id": evt.get("id", "")[:20]},
                 backlinks=backlinks,
-                sources=[{"type": "outlook_calendar", "synced": datetime.now().isoformat()}],
+                sources=[{"type": "outlook_calendar", "synced": synced}],
                 confidence=0.95,
-            )
-            created += 1
+            ))
+            existing.add(slug)
+
+    vault.create_notes_batch("meetings", to_create)
+    created = len(to_create)
 
     log.info("calendar_ingested", total=len(events), created=created)
     return {"total": len(events), "created": created}
 
 
-async def ingest_tasks() -> dict:
+async def ingest_tasks(
+    tasks: list[dict] | None = None, daily: dict[str, str] | None = None,
+) -> dict:
     """Ingest pending tasks into today's daily note.
 
-    Appends a task summary section to the daily note.
+    Appends a task summary section to the daily note, or leaves it in
+    `daily` under "tasks" when one is given.
     """
-    tasks = await ms_graph.get_tasks(status="notStarted", count=50)
-    today = datetime.now().strftime("%Y-%m-%d")
-    daily_name = f"Daily - {today}"
+    if tasks is None:
+        tasks = await ms_graph.get_tasks(status="notStarted", count=50)
 
     if not tasks:
         return {"total": 0}
@@ -241,17 +278,10 @@ async def ingest_tasks() -> dict:
         task_lines.append(f"- [{marker}] {title}{due_str}")
 
     task_section = "\n## Pending Tasks\n\n" + "\n".join(task_lines[:25])
-
-    from nanobot.knowledge.vault import _note_path
-    daily_path = _note_path("daily", daily_name)
-    if daily_path.exists():
-        vault.update_note("daily", daily_name, append_content=task_section)
+    if daily is None:
+        _append_to_daily(task_section)
     else:
-        vault.create_note(
-            "daily", daily_name,
-            content=task_section,
-            metadata={"source": "microsoft_graph", "date": today},
-        )
+        daily["tasks"] = task_section
 
     log.info("tasks_ingested", total=len(tasks))
     return {"total": len(tasks)}
@@ -270,31 +300,51 @@ async def run_full_sync() -> dict:
     if not ms_graph.creds.is_token_valid:
         return {"error": "Microsoft Graph token expired — re-authenticate"}
 
-    results = {}
-
+    # One $batch for all four sections; any that failed there (None) are
+    # fetched again by their own ingest step.
     try:
-        results["contacts"] = await ingest_contacts()
+        snapshot = await ms_graph.get_sync_snapshot()
     except Exception as e:
-        log.error("contact_ingestion_failed", error=str(e))
-        results["contacts"] = {"error": str(e)}
+        log.warning("sync_prefetch_failed", error=str(e))
+        snapshot = {}
+
+    # Emails and tasks leave their daily-note sections here; the note is
+    # written once below, emails first.
+    daily: dict[str, str] = {}
+
+    # Vault writes are synchronous, so the steps never interleave mid-note
+    # (emails and tasks share the daily note); running them together
+    # overlaps whatever Graph refetches they need.
+    sections = (
+        ("contacts", "contact_ingestion_failed"),
+        ("emails", "email_ingestion_failed"),
+        ("calendar", "calendar_ingestion_failed"),
+        ("tasks", "task_ingestion_failed"),
+    )
+    outcomes = await asyncio.gather(
+        ingest_contacts(contacts=snapshot.get("contacts")),
+        ingest_emails(emails=snapshot.get("emails"), daily=daily),
+        ingest_calendar(events=snapshot.get("events")),
+        ingest_tasks(tasks=snapshot.get("tasks"), daily=daily),
+        return_exceptions=True,
+    )
 
-    try:
-        results["emails"] = await ingest_emails()
-    except Exception as e:
-        log.error("email_ingestion_failed", error=str(e))
-        results["emails"] = {"error": str(e)}
-
-    try:
-        results["calendar"] = await ingest_calendar()
-    except Exception as e:
-        log.error("calendar_ingestion_failed", error=str(e))
-        results["calendar"] = {"error": str(e)}
-
-    try:
-        results["tasks"] = await ingest_tasks()
-    except Exception as e:
-        log.error("task_ingestion_failed", error=str(e))
-        results["tasks"] = {"error": str(e)}
+    results = {}
+    for (section, failed_event), outcome in zip(sections, outcomes):
+        if isinstance(outcome, Exception):
+            log.error(failed_event, error=str(outcome))
+            outcome = {"error": str(outcome)}
+        results[section] = outcome
+
+    if daily:
+        try:
+            _append_to_daily(
+                "\n".join(daily[k] for k in ("emails", "tasks") if k in daily),
+                _email_sources() if "emails" in daily else None,
+            )
+        except Exception as e:
+            log.error("daily_note_write_failed", error=str(e))
+            results["daily"] = {"error": str(e)}
 
     log.info("full_sync_complete", results=results)
     return results
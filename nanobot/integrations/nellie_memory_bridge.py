@@ -36,6 +36,9 @@ BRIDGE_NS = f"{NS.get('swarm_state', 'nq:swarm:')}bridge:"
 # Sync interval and retention
 SYNC_INTERVAL_SECONDS = 60
 MAX_HISTORY_ENTRIES = 500
+VAULT_ENTRY_TTL = 60 * 60 * 24 * 30  # 30 days
+VAULT_RECENT_LIMIT = 1000  # entries kept in the vault_recent index
+BULK_SYNC_CHUNK = 200  # vault files per pipeline round trip in bulk sync
 
 
 class NellieMemoryBridge:
@@ -127,12 +130,14 @@ class NellieMemoryBridge:
         """Get recent swarm results from Redis bridge store."""
         redis = await get_redis()
         session_ids = await redis.lrange(f"{BRIDGE_NS}results_index", 0, n - 1)
-        results = []
-        for sid in session_ids:
-            raw = await redis.get(f"{BRIDGE_NS}result:{sid}")
-            if raw:
-                results.append(json.loads(raw))
-        return results
+        return [json.loads(raw) for raw in await self._get_results(redis, session_ids) if raw]
+
+    @staticmethod
+    async def _get_results(redis, session_ids: list[str]) -> list[str | None]:
+        """Fetch stored result records for many sessions in one MGET."""
+        if not session_ids:
+            return []
+        return await redis.mget([f"{BRIDGE_NS}result:{sid}" for sid in session_ids])
 
     async def sync_workspace(self, session_id: str, artifacts: dict[str, str]) -> None:
         """Sync swarm output artifacts to NellieNano's workspace directory."""
@@ -167,22 +172,29 @@ class NellieMemoryBridge:
         This allows memory_search to find vault entities without hitting disk.
         """
         redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            self._queue_vault_entry(pipe, category, name, content, time.time())
+            pipe.zremrangebyrank(f"{BRIDGE_NS}vault_recent", 0, -(VAULT_RECENT_LIMIT + 1))
+            await pipe.execute()
+
+        log.info("vault_entry_synced_to_redis", category=category, name=name)
+
+    @staticmethod
+    def _queue_vault_entry(pipe, category: str, name: str, content: str, now: float) -> None:
+        """Queue one vault entity's hash, TTL and index writes on a pipeline."""
         key = f"{BRIDGE_NS}vault:{category}:{name}"
-        await redis.hset(key, mapping={
+        pipe.hset(key, mapping={
             "category": category,
             "name": name,
             "content": content[:5000],
-            "updated_at": time.time(),
+            "updated_at": now,
         })
-        await redis.expire(key, 60 * 60 * 24 * 30)  # 30 day TTL
+        pipe.expire(key, VAULT_ENTRY_TTL)
 
         # Add to category index
-        await redis.sadd(f"{BRIDGE_NS}vault_index:{category}", name)
+        pipe.sadd(f"{BRIDGE_NS}vault_index:{category}", name)
         # Add to global search index
-        await redis.zadd(f"{BRIDGE_NS}vault_recent", {f"{category}:{name}": time.time()})
-        await redis.zremrangebyrank(f"{BRIDGE_NS}vault_recent", 0, -1001)  # Keep last 1000
-
-        log.info("vault_entry_synced_to_redis", category=category, name=name)
+        pipe.zadd(f"{BRIDGE_NS}vault_recent", {f"{category}:{name}": now})
 
     async def search_swarm_history(self, query: str, max_results: int = 5) -> list[dict]:
         """Search Redis-backed swarm history for results matching a query.
@@ -195,8 +207,7 @@ class NellieMemoryBridge:
         query_words = set(query.lower().split())
         scored: list[tuple[float, dict]] = []
 
-        for sid in session_ids:
-            raw = await redis.get(f"{BRIDGE_NS}result:{sid}")
+        for raw in await self._get_results(redis, session_ids):
             if not raw:
                 continue
             record = json.loads(raw)
@@ -242,7 +253,7 @@ class NellieMemoryBridge:
         """
         from nanobot.knowledge.vault import vault
 
-        synced = 0
+        entries: list[tuple[str, str, str]] = []
         for category in ["people", "companies", "projects", "topics",
                          "decisions", "commitments", "meetings"]:
             cat_dir = vault.root / category
@@ -251,11 +262,27 @@ class NellieMemoryBridge:
             for md_file in cat_dir.glob("*.md"):
                 try:
                     content = md_file.read_text(encoding="utf-8")
-                    name = md_file.stem.replace("-", " ").title()
-                    await self.sync_vault_entry(category, name, content[:3000])
-                    synced += 1
                 except Exception as e:
                     log.warning("bulk_sync_entry_failed", file=str(md_file), error=str(e))
+                    continue
+                name = md_file.stem.replace("-", " ").title()
+                entries.append((category, name, content[:3000]))
+
+        # One pipeline round trip per chunk rather than five commands per file
+        redis = await get_redis()
+        synced = 0
+        for start in range(0, len(entries), BULK_SYNC_CHUNK):
+            chunk = entries[start:start + BULK_SYNC_CHUNK]
+            now = time.time()
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for category, name, content in chunk:
+                        self._queue_vault_entry(pipe, category, name, content, now)
+                    pipe.zremrangebyrank(f"{BRIDGE_NS}vault_recent", 0, -(VAULT_RECENT_LIMIT + 1))
+                    await pipe.execute()
+                synced += len(chunk)
+            except Exception as e:
+                log.warning("bulk_sync_chunk_failed", entries=len(chunk), error=str(e))
 
         log.info("vault_bulk_synced_to_redis", entries=synced)
         return synced
@@ -20,6 +20,7 @@ Entity categories:
 import json
 import os
 import re
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -135,6 +136,46 @@ def _build_frontmatter(metadata: dict) -> str:
     return "\n".join(lines)
 
 
+@dataclass
+class NoteSpec:
+    """One note for KnowledgeVault.create_notes_batch (create_note's arguments)."""
+    name: str
+    content: str
+    metadata: dict | None = None
+    backlinks: list[str] | None = None
+    sources: list[dict] | None = None
+    confidence: float = 0.9
+    aliases: list[str] | None = None
+
+
+def _render_note(category: str, spec: NoteSpec, now: str) -> str:
+    """Frontmatter + body for a new note."""
+    fm: dict[str, Any] = {
+        "id": f"{category}/{_slugify(spec.name)}",
+        "type": category.rstrip("s"),  # people -> person, etc.
+        "title": spec.name,
+        "created": now,
+        "updated": now,
+        "confidence": spec.confidence,
+        "tags": [category],
+    }
+    if spec.aliases:
+        fm["aliases"] = spec.aliases
+    if spec.sources:
+        fm["sources"] = spec.sources
+    if spec.metadata:
+        fm.update(spec.metadata)
+
+    body = f"# {spec.name}\n\n{spec.content}"
+
+    if spec.backlinks:
+        body += "\n\n## Relationships\n"
+        for link in spec.backlinks:
+            body += f"- [[{link}]]\n"
+
+    return _build_frontmatter(fm) + body
+
+
 def extract_backlinks(content: str) -> list[str]:
     """Extract all [[wikilink]] targets from content."""
     return BACKLINK_RE.findall(content)
@@ -168,31 +209,8 @@ class KnowledgeVault:
         if category not in CATEGORIES:
             raise ValueError(f"Unknown category: {category}. Use one of {CATEGORIES}")
 
-        now = datetime.now().isoformat(timespec="seconds")
-        fm: dict[str, Any] = {
-            "id": f"{category}/{_slugify(name)}",
-            "type": category.rstrip("s"),  # people -> person, etc.
-            "title": name,
-            "created": now,
-            "updated": now,
-            "confidence": confidence,
-            "tags": [category],
-        }
-        if aliases:
-            fm["aliases"] = aliases
-        if sources:
-            fm["sources"] = sources
-        if metadata:
-            fm.update(metadata)
-
-        body = f"# {name}\n\n{content}"
-
-        if backlinks:
-            body += "\n\n## Relationships\n"
-            for link in backlinks:
-                body += f"- [[{link}]]\n"
-
-        full_content = _build_frontmatter(fm) + body
+        spec = NoteSpec(name, content, metadata, backlinks, sources, confidence, aliases)
+        full_content = _render_note(category, spec, datetime.now().isoformat(timespec="seconds"))
 
         path = _note_path(category, name)
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -200,6 +218,28 @@ class KnowledgeVault:
         log.info("note_created", category=category, name=name, path=str(path))
         return path
 
+    def create_notes_batch(self, category: str, notes: list[NoteSpec]) -> list[Path]:
+        """Create or overwrite many notes in one category.
+
+        Same result as create_note per spec, with the category check,
+        directory setup and timestamp done once and a single log line.
+        """
+        if category not in CATEGORIES:
+            raise ValueError(f"Unknown category: {category}. Use one of {CATEGORIES}")
+        if not notes:
+            return []
+
+        now = datetime.now().isoformat(timespec="seconds")
+        cat_dir = VAULT_ROOT / category
+        cat_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for spec in notes:
+            path = cat_dir / f"{_slugify(spec.name)}.md"
+            path.write_text(_render_note(category, spec, now), encoding="utf-8")
+            paths.append(path)
+        log.info("notes_created", category=category, count=len(paths))
+        return paths
+
     def update_note(
         self,
         category: str,
@@ -446,6 +486,18 @@ class KnowledgeVault:
 
         return results
 
+    def note_slugs(self, category: str) -> set[str]:
+        """Filename slugs of a category's notes, from one directory scan.
+
+        Lets bulk writers test `_slugify(name) in slugs` instead of a stat
+        per note.
+        """
+        try:
+            with os.scandir(VAULT_ROOT / category) as entries:
+                return {e.name[:-3] for e in entries if e.name.endswith(".md")}
+        except FileNotFoundError:
+            return set()
+
     def create_daily_note(self, date: datetime | None = None) -> Path:
         """Create or update today's daily note."""
         d = date or datetime.now()
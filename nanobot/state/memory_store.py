@@ -6,7 +6,9 @@ Each nanobot has:
   - Episodic: summaries of completed task sessions
 """
 
+import hashlib
 import json
+import re
 import time
 from typing import Any
 from nanobot.state.connection import get_redis, NS
@@ -21,6 +23,15 @@ EPISODIC_TTL = 60 * 60 * 24 * 7
 SHORT_TERM_MAX_TURNS = 50
 LONG_TERM_MAX_FACTS = 200
 
+# Facts included in a prompt memory pack
+MEMORY_PACK_TOP_K = 30
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+def _words(text: str) -> set[str]:
+    return set(_WORD_RE.findall(text.lower()))
+
 
 class AgentMemoryStore:
     """Persistent memory for a single nanobot agent."""
@@ -29,6 +40,7 @@ class AgentMemoryStore:
         self.agent_id = agent_id
         self.role = role
         self._key = lambda t: f"{NS['agent_memory']}{agent_id}:{t}"
+        self.last_pack_version = ""
 
     async def push_conversation_turn(self, role: str, content: str) -> None:
         redis = await get_redis()
@@ -44,10 +56,28 @@ class AgentMemoryStore:
         pipe.expire(key, SHORT_TERM_TTL)
         await pipe.execute()
 
+    async def push_conversation_turns(self, turns: list[tuple[str, str]]) -> None:
+        """Append several (role, content) turns in one pipelined round-trip."""
+        redis = await get_redis()
+        key = self._key("conversation")
+        now = time.time()
+        pipe = redis.pipeline()
+        pipe.rpush(key, *(
+            json.dumps({"role": role, "content": content, "timestamp": now})
+            for role, content in turns
+        ))
+        pipe.ltrim(key, -SHORT_TERM_MAX_TURNS, -1)
+        pipe.expire(key, SHORT_TERM_TTL)
+        await pipe.execute()
+
     async def get_conversation_history(self, last_n: int = 20) -> list[dict]:
         redis = await get_redis()
         key = self._key("conversation")
         raw_turns = await redis.lrange(key, -last_n, -1)
+        return self._parse_turns(raw_turns)
+
+    @staticmethod
+    def _parse_turns(raw_turns: list[str]) -> list[dict]:
         turns = []
         for raw in raw_turns:
             try:
@@ -131,10 +161,60 @@ class AgentMemoryStore:
                 episodes.append(json.loads(raw))
         return episodes
 
-    async def build_memory_context(self) -> str:
+    async def fetch_prompt_bundle(
+        self, query: str = "", last_n: int = 10
+    ) -> tuple[str, list[dict]]:
+        """
+        Fetch the memory pack and the last ``last_n`` conversation turns.
+
+        Takes two pipelined round-trips in total: one for the episode index,
+        fact index and history, and one MGET for the episodes and facts.
+        Pass last_n=0 to skip the history. Returns (memory_ctx, history).
+        """
+        redis = await get_redis()
+        pipe = redis.pipeline()
+        pipe.lrange(self._key("episode_index"), 0, 2)
+        pipe.smembers(self._key("fact_index"))
+        if last_n:
+            pipe.lrange(self._key("conversation"), -last_n, -1)
+        results = await pipe.execute()
+        session_ids, fact_keys = results[0], sorted(results[1])
+        history = self._parse_turns(results[2]) if last_n else []
+
+        episodes: list[dict] = []
+        facts: dict[str, Any] = {}
+        keys = [self._key(f"episode:{sid}") for sid in session_ids]
+        keys += [self._key(f"fact:{fk}") for fk in fact_keys]
+        if keys:
+            values = await redis.mget(keys)
+            for raw in values[:len(session_ids)]:
+                if raw:
+                    episodes.append(json.loads(raw))
+            for fk, raw in zip(fact_keys, values[len(session_ids):]):
+                if raw:
+                    value = json.loads(raw).get("value")
+                    if value is not None:
+                        facts[fk] = value
+
+        return self._format_memory_pack(episodes, facts, query), history
+
+    async def build_memory_context(self, query: str = "") -> str:
+        memory_ctx, _ = await self.fetch_prompt_bundle(query, last_n=0)
+        return memory_ctx
+
+    def _format_memory_pack(
+        self, episodes: list[dict], facts: dict[str, Any], query: str = ""
+    ) -> str:
+        """
+        Build a deterministic memory pack for the prompt.
+
+        Facts are ranked by word overlap with ``query`` (when given), cut to
+        MEMORY_PACK_TOP_K, and emitted sorted by key, so the same memory
+        state always yields byte-identical text. The pack carries a short
+        content hash as its version, also kept in ``last_pack_version``.
+        """
         parts = []
 
-        episodes = await self.get_recent_episodes(3)
         if episodes:
             ep_lines = [
                 f"- [{e['timestamp']:.0f}] Goal: {e['goal'][:80]} -> "
@@ -143,12 +223,26 @@ class AgentMemoryStore:
             ]
             parts.append("RECENT TASK HISTORY:\n" + "\n".join(ep_lines))
 
-        facts = await self.get_all_facts()
         if facts:
-            fact_lines = [f"- {k}: {str(v)[:100]}" for k, v in list(facts.items())[:10]]
+            keys = sorted(facts)
+            if len(keys) > MEMORY_PACK_TOP_K:
+                if query:
+                    query_words = _words(query)
+                    keys.sort(
+                        key=lambda k: -len(query_words & _words(f"{k} {facts[k]}"))
+                    )
+                keys = sorted(keys[:MEMORY_PACK_TOP_K])
+            fact_lines = [f"- {k}: {str(facts[k])[:100]}" for k in keys]
             parts.append("KNOWN FACTS:\n" + "\n".join(fact_lines))
 
         if not parts:
+            self.last_pack_version = ""
             return ""
 
-        return "=== AGENT MEMORY ===\n" + "\n\n".join(parts) + "\n=== END MEMORY ===\n\n"
+        body = "\n\n".join(parts)
+        self.last_pack_version = hashlib.md5(body.encode()).hexdigest()[:8]
+        return (
+            f"=== AGENT MEMORY v{self.last_pack_version} ===\n"
+            + body
+            + "\n=== END MEMORY ===\n\n"
+        )
@@ -3,7 +3,10 @@ Global swarm state management.
 Tracks active sessions, agent registry, queue depths, and health.
 """
 
+import asyncio
+import hashlib
 import json
+import re
 import time
 import uuid
 from nanobot.state.connection import get_redis, NS
@@ -14,11 +17,33 @@ log = structlog.get_logger()
 SESSION_TTL = 60 * 60 * 24
 AGENT_TTL = 60 * 60 * 2
 HEARTBEAT_IV = 30
+RESULT_CACHE_TTL = 60 * 60
+SESSION_FLUSH_DELAY = 0.05  # seconds queued progress updates are held to coalesce
+
+# Tasks that ask about the present moment must not be answered from cache
+_VOLATILE_RE = re.compile(
+    r"\b(?:today|now|current(?:ly)?|latest|recent(?:ly)?|real[- ]?time|live|this (?:week|month|year))\b",
+    re.IGNORECASE,
+)
+
+
+def result_cache_key(role: str, content: str, *extra: str) -> str | None:
+    """Content-addressed key for a task result, or None if the task is time-sensitive."""
+    if _VOLATILE_RE.search(content):
+        return None
+    digest = hashlib.blake2b("\x00".join((role, content, *extra)).encode(), digest_size=20)
+    return f"{NS['result']}{digest.hexdigest()}"
 
 
 class SwarmStateManager:
     """Centralized swarm state — shared across all agents."""
 
+    def __init__(self):
+        # Progress updates merged per session and written in the background
+        self._pending_updates: dict[str, dict] = {}
+        self._flusher: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
     async def create_session(self, goal: str, metadata: dict | None = None) -> str:
         redis = await get_redis()
         session_id = str(uuid.uuid4())
@@ -53,18 +78,65 @@ class SwarmStateManager:
         session["updated_at"] = time.time()
         await redis.setex(key, SESSION_TTL, json.dumps(session))
 
+    def queue_session_update(self, session_id: str, updates: dict) -> None:
+        """
+        Non-blocking session update for progress counters on the hot path.
+        Updates are merged per session (later values win) and written by a
+        background flush shortly after; complete_session applies any still pending.
+        """
+        self._pending_updates.setdefault(session_id, {}).update(updates)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        # Updates queued while a flush is writing find this task still
+        # running and start no flusher of their own, so keep going until
+        # nothing is left.
+        while self._pending_updates:
+            await asyncio.sleep(SESSION_FLUSH_DELAY)
+            try:
+                await self.flush_session_updates()
+            except Exception as e:
+                log.warning("session_flush_failed", error=str(e)[:100])
+                return
+
+    async def flush_session_updates(self) -> None:
+        """Write all queued session updates: one MGET plus one pipelined SETEX batch."""
+        async with self._flush_lock:
+            pending, self._pending_updates = self._pending_updates, {}
+            if not pending:
+                return
+            redis = await get_redis()
+            keys = [f"{NS['session']}{sid}" for sid in pending]
+            raws = await redis.mget(keys)
+            now = time.time()
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, raw, updates in zip(keys, raws, pending.values()):
+                    if not raw:
+                        continue
+                    session = json.loads(raw)
+                    session.update(updates)
+                    session["updated_at"] = now
+                    pipe.setex(key, SESSION_TTL, json.dumps(session))
+                await pipe.execute()
+
     async def complete_session(
         self,
         session_id: str,
         final_answer: str,
         success: bool,
     ) -> None:
-        await self.update_session(session_id, {
-            "status": "complete" if success else "failed",
-            "final_answer": final_answer,
-            "completed_at": time.time(),
-            "success": success,
-        })
+        # Hold the flush lock so a background flush can't write an older
+        # snapshot over the final status.
+        async with self._flush_lock:
+            updates = self._pending_updates.pop(session_id, {})
+            updates.update({
+                "status": "complete" if success else "failed",
+                "final_answer": final_answer,
+                "completed_at": time.time(),
+                "success": success,
+            })
+            await self.update_session(session_id, updates)
 
     async def get_session(self, session_id: str) -> dict | None:
         redis = await get_redis()
@@ -163,6 +235,23 @@ class SwarmStateManager:
             "agents": agents,
         }
 
+    async def get_cached_result(self, key: str) -> dict | None:
+        """Best-effort cache read: a Redis failure is a miss, not an error."""
+        try:
+            redis = await get_redis()
+            raw = await redis.get(key)
+        except Exception as e:
+            log.warning("result_cache_read_failed", error=str(e)[:100])
+            return None
+        return json.loads(raw) if raw else None
+
+    async def put_cached_result(self, key: str, result: dict, ttl: int = RESULT_CACHE_TTL) -> None:
+        try:
+            redis = await get_redis()
+            await redis.setex(key, ttl, json.dumps(result))
+        except Exception as e:
+            log.warning("result_cache_write_failed", error=str(e)[:100])
+
     async def acquire_lock(self, resource: str, ttl: int = 30) -> str | None:
         redis = await get_redis()
         lock_key = f"{NS['swarm_state']}lock:{resource}"
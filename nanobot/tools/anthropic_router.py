@@ -61,7 +61,7 @@ class AnthropicRouter:
     async def _call_claude(
         self,
         model: str,
-        system: str,
+        system: str | list[dict],
         messages: list[dict],
         max_tokens: int,
         temperature: float,
@@ -140,8 +140,8 @@ class AnthropicRouter:
         model: str = "",
         max_tokens: int = 4096,
         temperature: float = 0.1,
-        system: str = "",
-    ) -> tuple[str, list[dict], int]:
+        system: str | list[dict] = "",
+    ) -> tuple[str, list[dict], int, list[str]]:
         """
         Run the full agentic loop with Claude:
         1. Call Claude with tools
@@ -153,13 +153,16 @@ class AnthropicRouter:
         - {"role": "assistant", "content": [...blocks...]}
         - {"role": "user", "content": [{"type": "tool_result", ...}]}
 
-        The system prompt is passed separately (not in messages).
+        The system prompt is passed separately (not in messages), either as
+        a string or as a list of text blocks (e.g. with cache_control).
 
-        Returns: (final_text, updated_messages, total_tokens_used)
+        Returns: (final_text, updated_messages, total_tokens_used, tool_calls)
+        where tool_calls lists the names of the tools dispatched, in order.
         """
         model = model or ANTHROPIC_MODEL
         tools = self.registry.as_anthropic_tools()
         total_tokens = 0
+        tool_calls_made: list[str] = []
         iteration = 0
 
         # Extract system prompt from messages if present
@@ -168,7 +171,10 @@ class AnthropicRouter:
         extracted_system = system
         for msg in messages:
             if msg["role"] == "system":
-                extracted_system = (extracted_system + "\n\n" + msg["content"]).strip()
+                if isinstance(extracted_system, list):
+                    extracted_system = extracted_system + [{"type": "text", "text": msg["content"]}]
+                else:
+                    extracted_system = (extracted_system + "\n\n" + msg["content"]).strip()
             else:
                 anthropic_messages.append(msg)
 
@@ -214,7 +220,7 @@ class AnthropicRouter:
                     iterations=iteration,
                     total_tokens=total_tokens,
                 )
-                return final_text, current_messages, total_tokens
+                return final_text, current_messages, total_tokens, tool_calls_made
 
             # Dispatch all tool calls and build tool_result blocks
             tool_result_blocks = []
@@ -231,6 +237,7 @@ class AnthropicRouter:
                 )
 
                 result = await self._dispatch_tool(tool_name, tool_input)
+                tool_calls_made.append(tool_name)
 
                 log.info(
                     "claude_tool_result",
@@ -266,4 +273,4 @@ class AnthropicRouter:
             ),
             "Max tool iterations reached without final response.",
         )
-        return last_text, current_messages, total_tokens
+        return last_text, current_messages, total_tokens, tool_calls_made
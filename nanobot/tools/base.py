@@ -62,6 +62,12 @@ class ToolRegistry:
         log.info("tool_registered", name=tool.name)
         return self
 
+    def copy(self) -> "ToolRegistry":
+        """New registry sharing the same tool instances (no re-registration)."""
+        clone = ToolRegistry()
+        clone._tools = dict(self._tools)
+        return clone
+
     def get(self, name: str) -> BaseTool | None:
         return self._tools.get(name)
 
@@ -235,19 +235,21 @@ class ToolRouter:
         max_tokens: int = 2048,
         temperature: float = 0.1,
         top_p: float = 0.95,
-    ) -> tuple[str, list[dict], int]:
+    ) -> tuple[str, list[dict], int, list[str]]:
         """
         Run the full agentic loop:
         1. Call LLM (streaming + retry)
         2. If tool call -> dispatch -> inject result -> loop
         3. If text response -> done
 
-        Returns: (final_text, updated_messages, total_tokens_used)
+        Returns: (final_text, updated_messages, total_tokens_used, tool_calls)
+        where tool_calls lists the names of the tools dispatched, in order.
         """
         model = model or SWARM_MODEL
         tools = self.registry.as_openai_functions()
         current_messages = list(messages)
         total_tokens = 0
+        tool_calls_made: list[str] = []
         iteration = 0
 
         while iteration < MAX_TOOL_ITERATIONS:
@@ -293,7 +295,7 @@ class ToolRouter:
                     iterations=iteration,
                     total_tokens=total_tokens,
                 )
-                return final_text, current_messages, total_tokens
+                return final_text, current_messages, total_tokens, tool_calls_made
 
             tool_results_messages = []
             for tool_call in message.tool_calls:
@@ -309,6 +311,7 @@ class ToolRouter:
                 )
 
                 result = await self._dispatch_tool(fn_name, fn_args)
+                tool_calls_made.append(fn_name)
 
                 log.info(
                     "tool_call_result",
@@ -337,4 +340,4 @@ class ToolRouter:
             ),
             "Max tool iterations reached without final response.",
         )
-        return last_content, current_messages, total_tokens
+        return last_content, current_messages, total_tokens, tool_calls_made
@@ -24,6 +24,8 @@ uvicorn nanobot.api.gateway:app \
     --host 0.0.0.0 \
     --port 8100 \
     --workers 1 \
+    --loop uvloop \
+    --http httptools \
     --log-level info \
     --timeout-keep-alive 600 \
     2>&1 | tee ~/nanobot_gateway.log
@@ -53,6 +53,7 @@ python -m vllm.entrypoints.openai.api_server \
     --max-num-batched-tokens 16384 \
     --tensor-parallel-size 1 \
     --enable-chunked-prefill \
+    --enable-prefix-caching \
     --disable-log-requests \
     --served-model-name "nanobot-reasoner" \
     --trust-remote-code \
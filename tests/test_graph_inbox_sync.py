@@ -0,0 +1,173 @@
+"""MicrosoftGraphClient's inbox delta buffer, against a mocked Graph."""
+
+import json
+
+import httpx
+import pytest
+
+from nanobot.integrations import microsoft_graph as mg
+
+DELTA_URL = "https://graph.microsoft.com/v1.0/me/mailFolders/inbox/messages/delta"
+
+
+def _msg(n: int, read: bool = False) -> dict:
+    return {
+        "id": f"m{n}",
+        "subject": f"subject {n}",
+        "receivedDateTime": f"2026-01-{n:02d}T00:00:00Z",
+        "isRead": read,
+    }
+
+
+class FakeGraph:
+    """Routes /messages, the first delta round and saved links to canned responses."""
+
+    def __init__(self, seed: list[dict]):
+        self.seed = seed
+        self.first_round: dict = {"value": [], "@odata.deltaLink": f"{DELTA_URL}?$deltatoken=r1"}
+        self.links: dict[str, httpx.Response] = {}
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        url = str(request.url)
+        if url in self.links:
+            return self.links[url]
+        if request.url.path.endswith("/delta"):
+            return httpx.Response(200, json=self.first_round)
+        return httpx.Response(200, json={"value": self.seed})
+
+    def delta_requests(self) -> list[httpx.Request]:
+        return [r for r in self.requests if r.url.path.endswith("/delta")]
+
+    def first_rounds(self) -> list[httpx.Request]:
+        return [r for r in self.delta_requests() if "token" not in str(r.url)]
+
+
+@pytest.fixture
+def delta_file(tmp_path, monkeypatch):
+    path = tmp_path / "delta.json"
+    monkeypatch.setattr(mg, "DELTA_FILE", path)
+    return path
+
+
+def _client(graph: FakeGraph) -> mg.MicrosoftGraphClient:
+    client = mg.MicrosoftGraphClient()
+    client.creds._set_access_token("token", 3600)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(graph))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_seed_and_first_round_bounded_by_oldest_message(delta_file):
+    graph = FakeGraph(seed=[_msg(3), _msg(2)])
+    graph.first_round = {"value": [_msg(4)], "@odata.deltaLink": f"{DELTA_URL}?$deltatoken=r1"}
+    client = _client(graph)
+
+    rows = await client.get_recent_emails(3)
+
+    assert [r["id"] for r in rows] == ["m4", "m3", "m2"]
+    seed_request = graph.requests[0]
+    assert seed_request.url.params["$top"] == str(mg.INBOX_BUFFER_SIZE)
+    (first,) = graph.first_rounds()
+    assert first.url.params["$filter"] == "receivedDateTime ge 2026-01-02T00:00:00Z"
+    assert first.headers["Prefer"] == "odata.maxpagesize=50"
+    assert json.loads(delta_file.read_text()) == {"inbox": f"{DELTA_URL}?$deltatoken=r1"}
+
+
+@pytest.mark.asyncio
+async def test_persisted_link_is_replayed_with_removals(delta_file):
+    link = f"{DELTA_URL}?$deltatoken=saved"
+    delta_file.write_text(json.dumps({"inbox": link}))
+    graph = FakeGraph(seed=[_msg(3), _msg(2), _msg(1)])
+    graph.links[link] = httpx.Response(200, json={
+        "value": [{"id": "m2", "@removed": {"reason": "deleted"}}, _msg(3, read=True)],
+        "@odata.deltaLink": f"{DELTA_URL}?$deltatoken=next",
+    })
+    client = _client(graph)
+
+    rows = await client.get_recent_emails(2)
+
+    assert [(r["id"], r["is_read"]) for r in rows] == [("m3", True), ("m1", False)]
+    assert graph.first_rounds() == []
+    assert json.loads(delta_file.read_text()) == {"inbox": f"{DELTA_URL}?$deltatoken=next"}
+
+
+@pytest.mark.asyncio
+async def test_pages_per_sync_are_capped(delta_file, monkeypatch):
+    monkeypatch.setattr(mg, "DELTA_MAX_PAGES", 2)
+    graph = FakeGraph(seed=[_msg(1)])
+    graph.first_round = {"value": [_msg(2)], "@odata.nextLink": f"{DELTA_URL}?$skiptoken=p2"}
+    graph.links[f"{DELTA_URL}?$skiptoken=p2"] = httpx.Response(
+        200, json={"value": [_msg(3)], "@odata.nextLink": f"{DELTA_URL}?$skiptoken=p3"},
+    )
+    graph.links[f"{DELTA_URL}?$skiptoken=p3"] = httpx.Response(
+        200, json={"value": [_msg(4)], "@odata.deltaLink": f"{DELTA_URL}?$deltatoken=done"},
+    )
+    client = _client(graph)
+
+    assert await client._sync_inbox()
+
+    assert len(graph.delta_requests()) == 2
+    assert set(client._inbox) == {"m1", "m2", "m3"}
+    # The next sync resumes where this one stopped
+    assert client._delta_link["inbox"] == f"{DELTA_URL}?$skiptoken=p3"
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_trimmed_to_newest(delta_file, monkeypatch):
+    monkeypatch.setattr(mg, "INBOX_BUFFER_SIZE", 3)
+    graph = FakeGraph(seed=[_msg(3), _msg(2), _msg(1)])
+    graph.first_round = {"value": [_msg(5), _msg(4)], "@odata.deltaLink": f"{DELTA_URL}?$deltatoken=r1"}
+    client = _client(graph)
+
+    assert await client._sync_inbox()
+
+    assert set(client._inbox) == {"m5", "m4", "m3"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expired", [
+    httpx.Response(410, json={"error": {"code": "syncStateNotFound"}}),
+    httpx.Response(400, json={"error": {"code": "resyncRequired"}}),
+])
+async def test_expired_link_starts_a_new_round(delta_file, expired):
+    link = f"{DELTA_URL}?$deltatoken=old"
+    delta_file.write_text(json.dumps({"inbox": link}))
+    graph = FakeGraph(seed=[_msg(1)])
+    graph.links[link] = expired
+    client = _client(graph)
+
+    assert await client._sync_inbox()
+
+    assert len(graph.first_rounds()) == 1
+    assert client._delta_link["inbox"] == f"{DELTA_URL}?$deltatoken=r1"
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_keeps_the_link(delta_file):
+    link = f"{DELTA_URL}?$deltatoken=keep"
+    delta_file.write_text(json.dumps({"inbox": link}))
+    graph = FakeGraph(seed=[_msg(2), _msg(1)])
+    graph.links[link] = httpx.Response(503)
+    client = _client(graph)
+
+    rows = await client.get_recent_emails(2)
+
+    assert [r["id"] for r in rows] == ["m2", "m1"]
+    assert graph.first_rounds() == []
+    assert client._delta_link["inbox"] == link
+
+
+@pytest.mark.asyncio
+async def test_short_buffer_falls_back_to_messages_query(delta_file):
+    graph = FakeGraph(seed=[_msg(2, read=True), _msg(1)])
+    client = _client(graph)
+
+    rows = await client.get_recent_emails(2, unread_only=True)
+
+    # Only one unread row is buffered, so the server-side filter answers
+    last = graph.requests[-1]
+    assert not last.url.path.endswith("/delta")
+    assert "isRead eq false" in last.url.params["$filter"]
+    assert [r["id"] for r in rows] == ["m2", "m1"]
@@ -0,0 +1,165 @@
+"""HierarchicalSwarm's L1 scheduler: tasks start as their own deps finish."""
+
+import asyncio
+import json
+
+import pytest
+
+from nanobot.core import hierarchical_swarm as hs
+from nanobot.core.agent import AgentResult
+from nanobot.tools.base import ToolRegistry
+
+
+class FakeAgent:
+    """Stands in for the queen (returns the plan) and the synthesizer."""
+
+    plan: dict = {}
+
+    def __init__(self, config, **kwargs):
+        self.config = config
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def execute(self, task):
+        output = json.dumps(self.plan) if self.config.name == "queen" else "final"
+        return AgentResult(
+            task_id=task.id, agent_id="q", agent_role=self.config.role,
+            output=output, success=True,
+        )
+
+
+class FakeJournal:
+    def __init__(self, session_id):
+        pass
+
+    async def get_full_context_for_orchestrator(self):
+        return ""
+
+    async def get_session_summary(self):
+        return {}
+
+
+@pytest.fixture
+def swarm(monkeypatch):
+    async def create_session(goal, metadata=None):
+        return "sess"
+
+    async def complete_session(session_id, final_answer, success):
+        pass
+
+    monkeypatch.setattr(hs, "NanobotV3", FakeAgent)
+    monkeypatch.setattr(hs, "TaskJournal", FakeJournal)
+    monkeypatch.setattr(hs.swarm_state, "create_session", create_session)
+    monkeypatch.setattr(hs.swarm_state, "complete_session", complete_session)
+    monkeypatch.setattr(hs.swarm_state, "queue_session_update", lambda *a: None)
+
+    def make(tasks, max_concurrent_l1=3):
+        FakeAgent.plan = {"plan_summary": "test", "l1_tasks": tasks}
+        return hs.HierarchicalSwarm(
+            tool_registry=ToolRegistry(), max_concurrent_l1=max_concurrent_l1,
+        )
+
+    return make
+
+
+def _task(tid, deps=(), role="analyst"):
+    return {"id": tid, "l1_role": role, "instruction": f"do {tid}", "depends_on": list(deps)}
+
+
+def _recording_runner(monkeypatch, delays=None, fail=()):
+    """Patch _run_l1_task to log start/end events and track concurrency."""
+    events: list[tuple[str, str, list[str]]] = []
+    running = {"now": 0, "peak": 0}
+
+    async def run_l1_task(self, task_def, session_id, dep_outputs):
+        events.append(("start", task_def.id, sorted(dep_outputs)))
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        try:
+            await asyncio.sleep((delays or {}).get(task_def.id, 0.01))
+            if task_def.id in fail:
+                raise RuntimeError("boom")
+            return task_def.id, AgentResult(
+                task_id=task_def.id, agent_id="a", agent_role=None,
+                output=f"out-{task_def.id}", success=True,
+            )
+        finally:
+            running["now"] -= 1
+            events.append(("end", task_def.id, []))
+
+    monkeypatch.setattr(hs.HierarchicalSwarm, "_run_l1_task", run_l1_task)
+    return events, running
+
+
+def _index(events, kind, tid):
+    return next(i for i, e in enumerate(events) if e[0] == kind and e[1] == tid)
+
+
+@pytest.mark.asyncio
+async def test_diamond_runs_join_after_both_branches(swarm, monkeypatch):
+    events, _ = _recording_runner(monkeypatch, delays={"b": 0.1, "c": 0.01})
+    result = await swarm([
+        _task("a"),
+        _task("b", ["a"], "coder"),
+        _task("c", ["a"], "researcher"),
+        _task("d", ["b", "c"], "validator"),
+    ]).run("goal")
+
+    assert result["success"]
+    assert [r["task_id"] for r in result["l1_results"]] == ["a", "b", "c", "d"]
+    # b and c overlap; d waits for both and sees both outputs
+    assert _index(events, "start", "c") < _index(events, "end", "b")
+    assert _index(events, "start", "d") > _index(events, "end", "b")
+    assert _index(events, "start", "d") > _index(events, "end", "c")
+    assert events[_index(events, "start", "d")][2] == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_no_level_barrier(swarm, monkeypatch):
+    # c depends only on fast a, so it starts while slow b (same level as a) runs
+    events, _ = _recording_runner(monkeypatch, delays={"a": 0.01, "b": 0.2})
+    await swarm([_task("a"), _task("b", role="coder"), _task("c", ["a"], "researcher")]).run("goal")
+
+    assert _index(events, "start", "c") < _index(events, "end", "b")
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_still_releases_dependents(swarm, monkeypatch):
+    events, _ = _recording_runner(monkeypatch, fail={"a"})
+    result = await swarm([_task("a"), _task("b", ["a"], "coder")]).run("goal")
+
+    by_id = {r["task_id"]: r for r in result["l1_results"]}
+    assert not by_id["a"]["success"]
+    assert by_id["a"]["output"] == "FAILED: boom"
+    assert by_id["b"]["success"]
+    assert events[_index(events, "start", "b")][2] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_worker_count_caps_concurrency(swarm, monkeypatch):
+    _, running = _recording_runner(monkeypatch, delays={t: 0.05 for t in "abcde"})
+    roles = ["analyst", "coder", "researcher", "validator", "executor"]
+    result = await swarm(
+        [_task(t, role=r) for t, r in zip("abcde", roles)], max_concurrent_l1=2,
+    ).run("goal")
+
+    assert len(result["l1_results"]) == 5
+    assert running["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bookkeeping_error_does_not_hang_the_run(swarm, monkeypatch):
+    _recording_runner(monkeypatch)
+
+    def broken(text, limit):
+        raise RuntimeError("tokenizer down")
+
+    monkeypatch.setattr(hs, "_truncate_tokens", broken)
+    result = await asyncio.wait_for(
+        swarm([_task("a"), _task("b", role="coder")]).run("goal"), timeout=5,
+    )
+    assert result["success"]